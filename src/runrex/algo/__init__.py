@@ -2,3 +2,5 @@ from .match import Match
 from .matchcask import MatchCask
 from .negation import Negation
 from .pattern import Pattern
+from .patternset import PatternSet
+from .termset import TermSet
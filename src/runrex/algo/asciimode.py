@@ -0,0 +1,84 @@
+"""
+Search ASCII-only text with `re.ASCII` regexes.
+
+Unicode-aware `\\w`, `\\W`, `\\b`, and case-insensitive matching are noticeably slower than their
+    ASCII equivalents, and most text is ASCII-only. On such text, a regex compiled with `re.ASCII`
+    finds exactly the same matches, provided that the regex itself is limited to ASCII (see
+    `ascii_equivalent`). Whether a text is ASCII-only (`str.isascii`) is known without scanning it,
+    so `Pattern` chooses between the two regexes for each text it searches.
+"""
+import re
+from functools import lru_cache
+
+try:
+    from re import _parser as sre_parse  # python 3.11+
+except ImportError:
+    import sre_parse
+
+# unicode `\s` also matches ASCII characters \x1c-\x1f, which `re.ASCII` does not
+_UNSAFE_CATEGORIES = {sre_parse.CATEGORY_SPACE, sre_parse.CATEGORY_NOT_SPACE}
+_REPEATS = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, getattr(sre_parse, 'POSSESSIVE_REPEAT', None)}
+
+
+def _set_is_ascii(items) -> bool:
+    for op, av in items:
+        if op in (sre_parse.LITERAL, sre_parse.NOT_LITERAL):
+            if av > 127:
+                return False
+        elif op is sre_parse.RANGE:
+            if av[1] > 127:
+                return False
+        elif op is sre_parse.CATEGORY:
+            if av in _UNSAFE_CATEGORIES:
+                return False
+    return True
+
+
+def _is_ascii(items) -> bool:
+    for op, av in items:
+        if op in (sre_parse.LITERAL, sre_parse.NOT_LITERAL):
+            if av > 127:  # e.g., the Kelvin sign matches 'k' when ignoring case
+                return False
+        elif op is sre_parse.IN:
+            if not _set_is_ascii(av):
+                return False
+        elif op is sre_parse.SUBPATTERN:
+            if not _is_ascii(av[3]):
+                return False
+        elif op is sre_parse.BRANCH:
+            if not all(_is_ascii(branch) for branch in av[1]):
+                return False
+        elif op in _REPEATS:
+            if not _is_ascii(av[2]):
+                return False
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            if not _is_ascii(av[1]):
+                return False
+        elif op is sre_parse.GROUPREF_EXISTS:
+            if not all(_is_ascii(branch) for branch in av[1:] if branch):
+                return False
+        elif op is getattr(sre_parse, 'ATOMIC_GROUP', None):
+            if not _is_ascii(av):
+                return False
+    return True
+
+
+@lru_cache(maxsize=None)
+def ascii_equivalent(pattern: str, flags=0) -> bool:
+    """Does the regex find the same matches in any ASCII-only text when compiled with `re.ASCII`?
+
+    This requires that the regex only refers to ASCII characters (including through escapes,
+        e.g., `\\u212a`), and does not use `\\s`/`\\S` (which differ for ASCII control characters).
+
+    :param pattern: regular expression (uncompiled string)
+    :param flags: as passed to `re.compile`
+    """
+    if flags & (re.ASCII | re.LOCALE):
+        return False
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, TypeError):
+        return False
+    if parsed.state.flags & (re.ASCII | re.LOCALE):  # inline flags
+        return False
+    return _is_ascii(list(parsed))
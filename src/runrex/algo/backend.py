@@ -0,0 +1,125 @@
+"""
+Regular expression engines which can be used by `Pattern` (see `runrex.algo.registry.set_default_backend`).
+
+* re: python's standard library (default)
+* regex: third-party `regex` module (`pip install regex`); supports timeouts
+* re2: linear-time engine (`pip install google-re2`); does not support lookarounds or backreferences
+    (these regexes fall back to `re`), and `\\w`/`\\b` only consider ASCII characters
+"""
+import re
+
+try:
+    import regex as regex_module
+except ImportError:
+    regex_module = None
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+
+class RegexBackend:
+    name = None
+    supports_timeout = False
+    errors = (re.error,)
+
+    def is_available(self) -> bool:
+        return True
+
+    def compile(self, pattern: str, flags=0, timeout=None):
+        """Compile pattern, returning an object with the same interface as `re.Pattern`
+
+        :param timeout: maximum number of seconds for any one search (if supported)
+        """
+        raise NotImplementedError
+
+
+class ReBackend(RegexBackend):
+    name = 're'
+
+    def compile(self, pattern: str, flags=0, timeout=None):
+        return re.compile(pattern, flags)
+
+
+class TimeoutRegex:
+    __slots__ = ('compiled', 'timeout')
+
+    def __init__(self, compiled, timeout):
+        """Compiled `regex` pattern which applies a timeout to every search (raising `TimeoutError`)"""
+        self.compiled = compiled
+        self.timeout = timeout
+
+    def search(self, string, pos=None, endpos=None):
+        return self.compiled.search(string, pos, endpos, timeout=self.timeout)
+
+    def match(self, string, pos=None, endpos=None):
+        return self.compiled.match(string, pos, endpos, timeout=self.timeout)
+
+    def fullmatch(self, string, pos=None, endpos=None):
+        return self.compiled.fullmatch(string, pos, endpos, timeout=self.timeout)
+
+    def finditer(self, string, pos=None, endpos=None):
+        return self.compiled.finditer(string, pos, endpos, timeout=self.timeout)
+
+    def findall(self, string, pos=None, endpos=None):
+        return self.compiled.findall(string, pos, endpos, timeout=self.timeout)
+
+    def sub(self, repl, string, count=0):
+        return self.compiled.sub(repl, string, count, timeout=self.timeout)
+
+    def split(self, string, maxsplit=0):
+        return self.compiled.split(string, maxsplit, timeout=self.timeout)
+
+    def __getattr__(self, item):
+        return getattr(self.compiled, item)
+
+
+class RegexModuleBackend(RegexBackend):
+    name = 'regex'
+    supports_timeout = True
+    errors = (regex_module.error,) if regex_module else ()
+
+    def is_available(self) -> bool:
+        return regex_module is not None
+
+    def compile(self, pattern: str, flags=0, timeout=None):
+        # flag values are shared with `re` (except ASCII); V0 retains `re`-compatible behaviour
+        if flags & re.ASCII:
+            flags = (flags & ~re.ASCII) | regex_module.ASCII
+        compiled = regex_module.compile(pattern, int(flags) | regex_module.V0)
+        if timeout:
+            return TimeoutRegex(compiled, timeout)
+        return compiled
+
+
+class Re2Backend(RegexBackend):
+    name = 're2'
+    errors = (re2.error, re.error) if re2 else ()
+    INLINE_FLAGS = [(re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's')]
+
+    def is_available(self) -> bool:
+        return re2 is not None
+
+    def compile(self, pattern: str, flags=0, timeout=None):
+        if flags & (re.VERBOSE | re.LOCALE):
+            raise re.error(f'Flags not supported by re2: {flags!r}')
+        inline = ''.join(letter for flag, letter in self.INLINE_FLAGS if flags & flag)
+        return re2.compile(f'(?{inline}){pattern}' if inline else pattern)
+
+
+BACKENDS = {backend.name: backend for backend in (ReBackend(), RegexModuleBackend(), Re2Backend())}
+
+
+def get_backend(name='re') -> RegexBackend:
+    try:
+        backend = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f'Unrecognized regex backend: {name}; expected one of {list(BACKENDS)}')
+    if not backend.is_available():
+        raise ValueError(f'Regex backend {name} is not installed.')
+    return backend
+
+
+def available_backends():
+    return [name for name, backend in BACKENDS.items() if backend.is_available()]
@@ -0,0 +1,87 @@
+"""
+Opt-in, bounded (least-recently-used) cache of `Pattern.matches`/`Pattern.finditer` results.
+
+Templated sentences (e.g., disclaimers, medication instructions) often repeat verbatim across
+    documents. Results are keyed by pattern, text, and search options, stored relative to the
+    start of the text, and shifted to the requested `offset` when returned.
+
+Enable with `PATTERN_CACHE.enable(maxsize)` (or the `cache` option in `runrex.main.process`).
+"""
+from collections import OrderedDict
+
+from runrex.algo.match import Match
+
+DEFAULT_MAXSIZE = 100_000
+
+
+class PatternCache:
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.enabled = False
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()  # (pattern, method, text, options) -> result(s) at offset 0
+
+    def enable(self, maxsize=None, reset=True):
+        """
+        :param maxsize: maximum number of results to retain
+        :param reset: forget existing results and hit/miss counts
+        """
+        if maxsize is not None:
+            self.maxsize = maxsize
+        if reset:
+            self.clear()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        self._results.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'maxsize': self.maxsize, 'size': len(self._results)}
+
+    def __len__(self):
+        return len(self._results)
+
+    def _get(self, pat, key, compute):
+        try:
+            result = self._results[key]
+        except KeyError:
+            self.misses += 1
+            result = compute()
+            self._results[key] = result
+            if len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        else:
+            self.hits += 1
+            self._results.move_to_end(key)
+            pat.match_count += sum(isinstance(m, Match) for m in (result if isinstance(result, tuple) else [result]))
+        return result
+
+    @staticmethod
+    def _key(pat, method, text, kwargs):
+        # context is derived from the text, so does not affect the result
+        return pat, method, text, tuple(sorted((k, v) for k, v in kwargs.items() if k != 'context'))
+
+    def matches(self, pat, text, *, offset=0, **kwargs):
+        """Cached `Pattern.matches`"""
+        result = self._get(pat, self._key(pat, 'matches', text, kwargs),
+                           lambda: pat._uncached_matches(text, offset=0, **kwargs))
+        if result:
+            return result.shifted(offset)
+        return result
+
+    def finditer(self, pat, text, *, offset=0, **kwargs):
+        """Cached `Pattern.finditer`"""
+        results = self._get(pat, self._key(pat, 'finditer', text, kwargs),
+                            lambda: tuple(pat._uncached_finditer(text, offset=0, **kwargs)))
+        for result in results:
+            yield result.shifted(offset)
+
+
+PATTERN_CACHE = PatternCache()
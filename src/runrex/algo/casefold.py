@@ -0,0 +1,248 @@
+"""
+Search case-folded text with case-sensitive regexes instead of using `re.IGNORECASE`.
+
+Case-insensitive matching is comparatively slow in the regex engine. Text is instead case-folded
+    once (see `fold_text`; the folded text has the same length as the original, so offsets are
+    unchanged), and shared by all patterns searching it (see `ContextSpans.folded`). Each regex is
+    rewritten to match the folded text without `re.IGNORECASE` (see `fold_regex`), and its matches
+    are reported against the original text.
+"""
+import re
+from functools import lru_cache
+from typing import Optional
+
+from runrex.algo.literals import fold_text
+from runrex.algo.match import SpanMatch
+
+MAX_RANGE_SIZE = 5000  # larger character ranges (e.g., `[Ā-￿]`) are not rewritten
+_CLASS_ESCAPES = set('wWdDsS')
+_SPECIAL_IN_CLASS = set('\\]^-[')
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _class_char(char):
+    return '\\' + char if char in _SPECIAL_IN_CLASS else char
+
+
+def _emit_chars(codes) -> str:
+    """Contents of a character class matching exactly these code points"""
+    result = []
+    codes = sorted(codes)
+    i = 0
+    while i < len(codes):
+        j = i
+        while j + 1 < len(codes) and codes[j + 1] == codes[j] + 1:
+            j += 1
+        if j - i >= 2:
+            result.append(f'{_class_char(chr(codes[i]))}-{_class_char(chr(codes[j]))}')
+        else:
+            result.extend(_class_char(chr(code)) for code in codes[i:j + 1])
+        i = j + 1
+    return ''.join(result)
+
+
+class _Folder:
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.i = 0
+
+    def fold(self) -> str:
+        result = []
+        pattern = self.pattern
+        while self.i < len(pattern):
+            char = pattern[self.i]
+            if char == '\\':
+                result.append(self._escape())
+            elif char == '[':
+                result.append(self._class())
+            elif pattern.startswith('(?', self.i):
+                result.append(self._group_opening())
+            else:
+                result.append(fold_text(char))
+                self.i += 1
+        return ''.join(result)
+
+    def _escape(self) -> str:
+        pattern, i = self.pattern, self.i
+        if i + 1 >= len(pattern):
+            raise _Unsupported('trailing backslash')
+        escaped = pattern[i + 1]
+        if escaped in 'xuUN0':  # character codes may be cased characters
+            raise _Unsupported('character code escape')
+        if escaped.isdigit():  # backreference (compares folded text, as IGNORECASE would)
+            end = i + 2
+            while end < len(pattern) and pattern[end].isdigit():
+                end += 1
+            if end - i > 3:
+                raise _Unsupported('octal escape')
+            self.i = end
+            return pattern[i:end]
+        self.i = i + 2
+        if escaped.isascii() and escaped.isalnum():  # classes, anchors, control characters
+            return pattern[i:i + 2]
+        return '\\' + fold_text(escaped)
+
+    def _group_opening(self) -> str:
+        pattern, i = self.pattern, self.i
+        if pattern.startswith(('(?P<', '(?P=', '(?#'), i):  # names and comments must not be folded
+            end = pattern.index('>' if pattern[i + 3] == '<' else ')', i)
+            self.i = end + 1
+            return pattern[i:end + 1]
+        for opening in ('(?:', '(?=', '(?!', '(?>', '(?<=', '(?<!'):
+            if pattern.startswith(opening, i):
+                self.i = i + len(opening)
+                return opening
+        raise _Unsupported('inline flags or conditional')
+
+    def _class_items(self):
+        """Yield ('char', character) or ('raw', class escape) up to the closing bracket"""
+        pattern = self.pattern
+        first = True
+        while True:
+            if self.i >= len(pattern):
+                raise _Unsupported('unterminated character set')
+            char = pattern[self.i]
+            if char == ']' and not first:
+                self.i += 1
+                return
+            first = False
+            if char == '\\':
+                if self.i + 1 >= len(pattern):
+                    raise _Unsupported('trailing backslash')
+                escaped = pattern[self.i + 1]
+                self.i += 2
+                if escaped in _CLASS_ESCAPES:
+                    yield 'raw', '\\' + escaped
+                elif escaped.isascii() and escaped.isalnum():
+                    if escaped in 'xuUN' or escaped.isdigit():
+                        raise _Unsupported('character code escape')
+                    yield 'raw', '\\' + escaped  # e.g., \n, \t, \b (backspace): not cased
+                else:
+                    yield 'char', escaped
+            elif char == '[' and pattern.startswith(('[:', '[=', '[.'), self.i):
+                raise _Unsupported('possible set operation')
+            else:
+                self.i += 1
+                yield 'char', char
+
+    def _class(self) -> str:
+        self.i += 1
+        negated = self.pattern.startswith('^', self.i)
+        if negated:
+            self.i += 1
+        items = list(self._class_items())
+        raw = []
+        codes = set()
+        k = 0
+        while k < len(items):
+            kind, value = items[k]
+            if k + 2 < len(items) and items[k + 1] == ('char', '-'):
+                end_kind, end_value = items[k + 2]
+                if kind == 'raw' or end_kind == 'raw':
+                    raise _Unsupported('range with class escape')
+                if ord(end_value) - ord(value) > MAX_RANGE_SIZE:
+                    raise _Unsupported('large range')
+                codes.update(ord(fold_text(chr(code))) for code in range(ord(value), ord(end_value) + 1))
+                k += 3
+                continue
+            if kind == 'raw':
+                raw.append(value)
+            else:
+                codes.add(ord(fold_text(value)))
+            k += 1
+        return f'[{"^" if negated else ""}{"".join(raw)}{_emit_chars(codes)}]'
+
+
+@lru_cache(maxsize=4096)
+def fold_regex(pattern: str, flags=re.IGNORECASE) -> Optional[str]:
+    """Rewrite a case-insensitive regex to match case-folded text (see `fold_text`) without `re.IGNORECASE`
+
+    :param pattern: regular expression (uncompiled string)
+    :param flags: as passed to `re.compile`
+    :return: rewritten regex (to compile with `flags & ~re.IGNORECASE`), or None if the regex
+        is not case-insensitive or cannot be rewritten (e.g., it uses inline flags)
+    """
+    if not flags & re.IGNORECASE or flags & (re.ASCII | re.LOCALE):
+        return None
+    try:
+        folded = _Folder(pattern).fold()
+        original, rewritten = re.compile(pattern, flags), re.compile(folded, flags & ~re.IGNORECASE)
+    except (_Unsupported, ValueError, re.error):
+        return None
+    if original.groups != rewritten.groups or original.groupindex != rewritten.groupindex:
+        return None
+    return folded
+
+
+class FoldedRegex:
+    casefolded = True  # search/finditer accept the case-folded text (`folded`) if already available
+
+    def __init__(self, regex, original):
+        """
+        Case-insensitive regex which searches case-folded text; behaves like `re.Pattern`
+            over the original text.
+
+        :param regex: `LazyRegex` for the rewritten regex (see `fold_regex`)
+        :param original: `LazyRegex` for the original (case-insensitive) regex
+        """
+        self.regex = regex
+        self.original = original
+
+    @property
+    def pattern(self):
+        return self.regex.pattern
+
+    @property
+    def flags(self):
+        return self.regex.flags
+
+    @property
+    def groups(self):
+        return self.regex.groups
+
+    @property
+    def groupindex(self):
+        return self.regex.groupindex
+
+    def compile(self):
+        self.regex.compile()
+        return self
+
+    @property
+    def is_compiled(self):
+        return self.regex.is_compiled
+
+    def get_literal_filter(self):
+        """Required literals of the original regex (these are tested against the original text)"""
+        return self.original.get_literal_filter()
+
+    def _unfold(self, m, string) -> SpanMatch:
+        """Report a match in the folded text against the original text (offsets are the same)"""
+        groups = [None if m.start(i) < 0 else m.span(i) for i in range(1, self.regex.groups + 1)]
+        return SpanMatch(string, m.start(), m.end(), groups, self.regex.groupindex, pos=m.pos, endpos=m.endpos)
+
+    def search(self, string, pos=0, endpos=None, *, folded=None):
+        if folded is None:
+            folded = fold_text(string)
+        m = self.regex.search(folded, pos) if endpos is None else self.regex.search(folded, pos, endpos)
+        return self._unfold(m, string) if m else None
+
+    def finditer(self, string, pos=0, endpos=None, *, folded=None):
+        if folded is None:
+            folded = fold_text(string)
+        matches = self.regex.finditer(folded, pos) if endpos is None else self.regex.finditer(folded, pos, endpos)
+        for m in matches:
+            yield self._unfold(m, string)
+
+    def findall(self, string, pos=0, endpos=None):
+        return self.original.findall(string, pos) if endpos is None else self.original.findall(string, pos, endpos)
+
+    def sub(self, repl, string, count=0):
+        return self.original.sub(repl, string, count=count)
+
+    def __repr__(self):
+        return f'FoldedRegex({self.regex.pattern!r})'
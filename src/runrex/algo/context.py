@@ -0,0 +1,116 @@
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from runrex.algo.literals import fold_text
+from runrex.algo.match import SpanMatch
+
+
+@lru_cache(maxsize=4096)
+def edge_anchors(pattern) -> Tuple[bool, bool]:
+    """Does the regex depend on the start (`^`, `\\A`) or end (`$`, `\\Z`, lookahead) of the text searched?
+
+    Matches of such a regex from a pass over the whole text cannot stand for those of a region
+        of it. Conservative: an unrecognised pattern (e.g., not a string) depends on both.
+    """
+    if not isinstance(pattern, str):
+        return True, True
+    at_start = at_end = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            escaped = pattern[i + 1:i + 2]
+            at_start = at_start or escaped == 'A'
+            at_end = at_end or escaped == 'Z'
+            i += 2
+            continue
+        if char == '[':  # character set: skip to its end
+            i += 1
+            if pattern[i:i + 1] == '^':
+                i += 1
+            if pattern[i:i + 1] == ']':
+                i += 1
+            while i < len(pattern) and pattern[i] != ']':
+                i += 2 if pattern[i] == '\\' else 1
+        elif char == '^':
+            at_start = True
+        elif char == '$' or pattern.startswith(('(?=', '(?!'), i):
+            at_end = True
+        i += 1
+    return at_start, at_end
+
+
+class ContextSpans:
+
+    def __init__(self, text):
+        """
+        Matches of context regexes (e.g., `Pattern.negates` or `Pattern.requires`) over a single text.
+
+        Each regex is run over the text only once; the (non-overlapping) matches are kept
+            sorted so that looking for a context match near a candidate match is a binary search.
+            The same instance can be shared by all patterns searching the same text.
+
+        :param text: the text being searched
+        """
+        self.text = text
+        self._folded = None
+        self._spans = {}  # regex -> (list of start offsets, list of re.Match)
+
+    @property
+    def folded(self) -> str:
+        """Case-folded copy of the text (see `fold_text`), with the same offsets"""
+        if self._folded is None:
+            self._folded = fold_text(self.text)
+        return self._folded
+
+    def _get_spans(self, regex):
+        if (spans := self._spans.get(regex)) is None:
+            matches = list(regex.finditer(self.text))
+            spans = ([m.start() for m in matches], matches)
+            self._spans[regex] = spans
+        return spans
+
+    def first_within(self, regex, pos=0, endpos=None) -> Optional['re.Match']:
+        """First match of regex within text[pos:endpos]
+
+        The match from the single pass over the text is used when it lies within the region;
+            the region is searched on its own when a match from the pass crosses its bounds
+            (e.g., a greedy `denies.*` running past `endpos`, or a match starting before `pos`
+            which may hide a later one), or when the regex depends on where the searched text
+            starts or ends (see `edge_anchors`): `^` matches at `pos`, and `$` and lookaheads
+            stop at `endpos`, as when searching text[pos:endpos]. Lookbehinds and `\\b` can
+            see the characters before `pos`.
+        """
+        if endpos is None:
+            endpos = len(self.text)
+        at_start, at_end = edge_anchors(getattr(regex, 'pattern', None))
+        if at_start and pos > 0:  # e.g., `^`: search the region as a string of its own
+            return self._search_slice(regex, pos, endpos)
+        if at_end and endpos < len(self.text):  # e.g., `$` or a lookahead: the region ends at endpos
+            return regex.search(self.text, pos, endpos)
+        starts, matches = self._get_spans(regex)
+        idx = bisect_left(starts, pos)
+        if idx and matches[idx - 1].end() > pos:  # overlaps the start of the region
+            return regex.search(self.text, pos, endpos)
+        if idx < len(matches) and matches[idx].start() < endpos:
+            if matches[idx].end() <= endpos:
+                return matches[idx]
+            return regex.search(self.text, pos, endpos)  # crosses the end of the region
+        return None
+
+    def _search_slice(self, regex, pos, endpos) -> Optional[SpanMatch]:
+        """First match of regex in text[pos:endpos] (a copy), with positions in the text"""
+        m = regex.search(self.text[pos:endpos])
+        if m is None:
+            return None
+        groups = [None if m.start(i) < 0 else (m.start(i) + pos, m.end(i) + pos) for i in range(1, len(m.groups()) + 1)]
+        return SpanMatch(self.text, m.start() + pos, m.end() + pos, groups=groups,
+                         groupindex=getattr(m.re, 'groupindex', None))
+
+    def found(self, regex) -> bool:
+        """Does the regex match anywhere in the text?"""
+        return len(self._get_spans(regex)[1]) > 0
+
+    def __len__(self):
+        return len(self._spans)
@@ -0,0 +1,233 @@
+"""
+Extract the literal strings which must appear in any match of a regular expression, and
+    scan text for many such literals at once.
+
+Unless a regular expression is case-sensitive, literals are case-folded and must be compared
+    against case-folded text (see `fold_text`). Case-folded literals are a necessary condition
+    for a match even for case-sensitive regular expressions.
+"""
+import re
+from typing import FrozenSet, Iterable, Optional
+
+try:
+    from re import _parser as sre_parse  # python 3.11+
+except ImportError:
+    import sre_parse
+
+try:
+    from re._casefix import _EXTRA_CASES  # python 3.11+
+except ImportError:
+    try:
+        from sre_compile import _ignorecase_fixes as _EXTRA_CASES
+    except ImportError:
+        _EXTRA_CASES = {}
+
+MIN_LITERAL_LENGTH = 2  # shorter literals are not worth checking
+MAX_EXPANSIONS = 64  # limit on number of alternative literals to build from a single regex
+MAX_SUBSTRING_CHECKS = 8  # with more literals, use a single regular expression instead of `in`
+INLINE_IGNORECASE = re.compile(r'\(\?[aLmsux]*i')
+
+# `str.lower` lowercases 'İ' to two characters; the regex engine only uses the first
+_PRE_FOLD = {0x130: 'i'}
+# characters which the regex engine treats as equal when ignoring case, but `str.lower` does not
+_EXTRA_FOLD = {}
+for _code, _others in _EXTRA_CASES.items():
+    _EXTRA_FOLD[_code] = chr(min(ord(chr(c).lower()) for c in (_code,) + tuple(_others)))
+
+
+def fold_text(text: str) -> str:
+    """Case-fold text in the same way as the regex engine does with `re.IGNORECASE`
+
+    Each character is folded to a single character, so offsets into the result are offsets into text.
+    """
+    if text.isascii():
+        return text.lower()
+    return text.translate(_PRE_FOLD).lower().translate(_EXTRA_FOLD)
+
+
+def _exact(items, limit=MAX_EXPANSIONS) -> Optional[FrozenSet[str]]:
+    """All strings which this parsed sequence matches exactly (or None if unknown/too many)"""
+    results = {''}
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            options = {chr(av)}
+        elif op is sre_parse.IN and all(sop is sre_parse.LITERAL for sop, _ in av):
+            options = {chr(sav) for _, sav in av}
+        elif op is sre_parse.SUBPATTERN and not av[1] and not av[2]:
+            options = _exact(av[3], limit)
+        elif op is sre_parse.BRANCH:
+            options = set()
+            for branch in av[1]:
+                if (branch_options := _exact(branch, limit)) is None:
+                    return None
+                options |= branch_options
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[1] <= 3:
+            if (inner := _exact(av[2], limit)) is None:
+                return None
+            options = set()
+            for n in range(av[0], av[1] + 1):
+                reps = {''}
+                for _ in range(n):
+                    reps = {r + i for r in reps for i in inner}
+                options |= reps
+        else:
+            return None
+        if options is None or len(results) * len(options) > limit:
+            return None
+        results = {r + o for r in results for o in options}
+    return frozenset(results)
+
+
+def _best(candidates):
+    best = None
+    for cand in candidates:
+        if not cand:
+            continue
+        score = (min(len(c) for c in cand), -len(cand))
+        if best is None or score > best[0]:
+            best = (score, cand)
+    return best[1] if best else None
+
+
+def _required(items) -> Optional[FrozenSet[str]]:
+    """Set of strings of which at least one appears in any match of this parsed sequence"""
+    candidates = []
+    run = frozenset({''})
+    for op, av in items:
+        options = _exact([(op, av)])
+        if options is not None and len(run) * len(options) <= MAX_EXPANSIONS:
+            run = frozenset(r + o for r in run for o in options)
+            continue
+        candidates.append(run)
+        run = frozenset({''})
+        if options is not None:
+            candidates.append(options)
+        elif op is sre_parse.SUBPATTERN:
+            candidates.append(_required(av[3]))
+        elif op is sre_parse.BRANCH:
+            branches = [_required(branch) for branch in av[1]]
+            if all(branches):
+                candidates.append(frozenset().union(*branches))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+            candidates.append(_required(av[2]))
+    candidates.append(run)
+    return _best(candidates)
+
+
+def required_literals(pattern: str, flags=0, *, fold=True) -> Optional[FrozenSet[str]]:
+    """Extract literals of which at least one must appear in any match
+
+    :param pattern: regular expression (uncompiled string)
+    :param flags:
+    :param fold: if True, literals are case-folded to be compared against `fold_text`;
+        otherwise, literals are case-sensitive (only possible if the pattern is)
+    :return: frozenset of literals, or None if no useful literals could be found
+    """
+    if not fold and (flags & re.IGNORECASE or INLINE_IGNORECASE.search(pattern)):
+        return None
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, TypeError):
+        return None
+    literals = _required(list(parsed))
+    if not literals or min(len(lit) for lit in literals) < MIN_LITERAL_LENGTH:
+        return None
+    if fold:
+        return frozenset(fold_text(lit) for lit in literals)
+    return literals
+
+
+def _trie_regex(trie) -> str:
+    branches = [re.escape(char) + _trie_regex(child) for char, child in sorted(trie.items()) if char]
+    if not branches:
+        return ''
+    rx = branches[0] if len(branches) == 1 else f'(?:{"|".join(branches)})'
+    if '' in trie:  # a literal ends here: prefer longer literals (greedy)
+        rx = f'(?:{rx})?'
+    return rx
+
+
+def literal_trie_regex(literals: Iterable[str]) -> str:
+    """Build a regular expression which matches any of the literals, sharing common prefixes"""
+    trie = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    return _trie_regex(trie)
+
+
+class LiteralScanner:
+
+    def __init__(self, literals: Iterable[str]):
+        """
+        Find which of many literals occur in a text with a single regular expression.
+
+        :param literals: literals (case-folded, if they will be compared against `fold_text`)
+        """
+        self.literals = frozenset(literals)
+        self.regex = re.compile(literal_trie_regex(self.literals)) if self.literals else None
+        # each hit also implies all literals which are substrings of it
+        self._implied = {
+            lit: frozenset(other for other in self.literals if other in lit)
+            for lit in self.literals
+        }
+
+    def contains_any(self, text) -> bool:
+        """Does the (already case-folded, if required) text contain any of the literals?"""
+        return self.regex is not None and self.regex.search(text) is not None
+
+    def scan(self, text, *, folded=False) -> FrozenSet[str]:
+        """Return all literals found in text (overlapping occurrences are included)
+
+        :param text:
+        :param folded: text has already been passed through `fold_text`
+        """
+        if self.regex is None:
+            return frozenset()
+        if not folded:
+            text = fold_text(text)
+        found = set()
+        m = self.regex.search(text)
+        while m:
+            found |= self._implied[m.group()]
+            m = self.regex.search(text, m.start() + 1)
+        return frozenset(found)
+
+
+class LiteralFilter:
+
+    def __init__(self, literals: FrozenSet[str], ignorecase=True):
+        """
+        Cheap test for whether a regular expression could possibly match a text.
+
+        :param literals: at least one of these must be present for a match
+        :param ignorecase: literals have been case-folded and must be compared
+            against case-folded text
+        """
+        self.literals = literals
+        self.ignorecase = ignorecase
+        self._scanner = LiteralScanner(literals) if len(literals) > MAX_SUBSTRING_CHECKS else None
+
+    @classmethod
+    def from_pattern(cls, pattern: str, flags=0):
+        """Build a filter for the regular expression, or return None if it has no required literals"""
+        if literals := required_literals(pattern, flags, fold=False):
+            return cls(literals, ignorecase=False)
+        if literals := required_literals(pattern, flags):
+            return cls(literals, ignorecase=True)
+        return None
+
+    def may_match(self, text, folded=None) -> bool:
+        """
+        :param folded: case-folded text, if already available
+        """
+        if self.ignorecase:
+            text = fold_text(text) if folded is None else folded
+        if self._scanner:
+            return self._scanner.contains_any(text)
+        for literal in self.literals:
+            if literal in text:
+                return True
+        return False
@@ -1,7 +1,13 @@
-import re
+from typing import NamedTuple
+
+try:
+    from re import _parser as sre_parse  # python 3.11+
+except ImportError:
+    import sre_parse
 
 
 class Match:
+    __slots__ = ('_match', '_groups', '_offset')
 
     def __init__(self, match, groups=None, offset=0):
         self._match = match
@@ -12,9 +18,13 @@ class Match:
     def matchobj(self):
         return self._match
 
+    def shifted(self, offset):
+        """Copy of this match with `offset` added to all positions"""
+        return Match(self._match, groups=self._groups, offset=self._offset + offset)
+
     @property
     def match(self):
-        if isinstance(self._match, re.Match):
+        if hasattr(self._match, 'group'):  # re.Match or equivalent from another regex backend
             return self._match.group()
         return str(self._match)
 
@@ -44,3 +54,98 @@ class Match:
 
     def __bool__(self):
         return bool(self._match)
+
+
+class SpanMatch:
+    __slots__ = ('string', 'pos', 'endpos', 're', '_spans', '_groupindex', '_lastindex', '_base')
+
+    def __init__(self, string, start, end, groups=(), groupindex=None, pos=0, endpos=None, *,
+                 regex=None, lastindex=None, base=0):
+        """
+        Minimal equivalent of `re.Match` for matchers which are not regular expressions (and for
+            matches rebuilt from a `MatchCask`).
+
+        :param string: the searched text (or, with `base`, the part of it starting at `base`)
+        :param start: start of the match in the searched text
+        :param end: end of the match in the searched text
+        :param groups: (start, end) span, or None, for each group
+        :param groupindex: group name -> group number; default: that of `regex`
+        :param regex: compiled regex which found the match, if any (`re`)
+        :param lastindex: number of the last group to close; default: the last group matched
+        :param base: position of `string` in the searched text
+        """
+        self.string = string
+        self.pos = pos
+        self.endpos = base + len(string) if endpos is None else endpos
+        self.re = regex
+        self._spans = ((start, end),) + tuple(groups)
+        self._groupindex = groupindex or getattr(regex, 'groupindex', None) or {}
+        self._lastindex = lastindex
+        self._base = base
+
+    def _index(self, group):
+        return self._groupindex[group] if isinstance(group, str) else group
+
+    def span(self, group=0):
+        return self._spans[self._index(group)] or (-1, -1)
+
+    def start(self, group=0):
+        return self.span(group)[0]
+
+    def end(self, group=0):
+        return self.span(group)[1]
+
+    def _text(self, span):
+        return self.string[span[0] - self._base:span[1] - self._base]
+
+    def _group(self, group):
+        if (span := self._spans[self._index(group)]) is None:
+            return None
+        return self._text(span)
+
+    def group(self, *index):
+        if len(index) <= 1:
+            return self._group(index[0] if index else 0)
+        return tuple(self._group(idx) for idx in index)
+
+    def groups(self, default=None):
+        return tuple(default if span is None else self._text(span) for span in self._spans[1:])
+
+    def groupdict(self, default=None):
+        return {name: self._group(idx) if self._spans[idx] else default for name, idx in self._groupindex.items()}
+
+    def __getitem__(self, group):
+        return self._group(group)
+
+    @property
+    def lastindex(self):
+        if self._lastindex is not None:
+            return self._lastindex
+        return max((i for i, span in enumerate(self._spans) if span and i), default=None)
+
+    @property
+    def lastgroup(self):
+        lastindex = self.lastindex
+        return next((name for name, idx in self._groupindex.items() if idx == lastindex), None)
+
+    def expand(self, template):
+        """Template with backslash escapes and group references replaced (as `re.Match.expand`)"""
+        pattern = self.re
+        if pattern is None:  # only the group names and number are needed to parse the template
+            pattern = _Groups(self._groupindex, len(self._spans) - 1)
+        parsed = sre_parse.parse_template(template, pattern)
+        if hasattr(sre_parse, 'expand_template'):  # python < 3.12
+            return sre_parse.expand_template(parsed, self)
+        return ''.join(self._group(item) or '' if isinstance(item, int) else item or '' for item in parsed)
+
+    def __bool__(self):
+        return True
+
+    def __repr__(self):
+        return f'<SpanMatch object; span={self.span()}, match={self.group()!r}>'
+
+
+class _Groups(NamedTuple):
+    """Group names and number of a `SpanMatch` without a regex (for parsing a template)"""
+    groupindex: dict
+    groups: int
@@ -1,24 +1,70 @@
-from copy import copy
+from array import array
+from typing import NamedTuple, Optional
 
-from runrex.algo import Match
+from runrex.algo.match import Match, SpanMatch
+from runrex.algo.negation import Negation
+
+# kinds of record
+_MATCH = 0
+_NEGATION = 1
+_OTHER = 2  # kept as is (e.g., a `Match` of a plain string)
+
+
+def _bounds(spans) -> tuple:
+    """(start of the first, end of the last) of the flattened spans of a match and its groups"""
+    starts = [spans[i] for i in range(0, len(spans), 2) if spans[i] >= 0]
+    return min(starts), max(spans[i] for i in range(1, len(spans), 2))
+
+
+class _Term(NamedTuple):
+    """Record of the negation term (`re.Match`) of a `Negation`"""
+    source: int  # index into `MatchCask._strings`
+    pattern: int  # index into `MatchCask._regexes`
+    spans: tuple  # (start, end) of the term and each group; -1 if unmatched
+    lastindex: int  # -1 if None
 
 
 class MatchCask:
+    __slots__ = ('_starts', '_ends', '_offsets', '_kinds', '_sources', '_patterns', '_span_index', '_spans',
+                 '_lastindex', '_extras', '_strings', '_string_ids', '_regexes', '_regex_ids', '_start', '_end')
 
     def __init__(self):
-        self.matches = []
+        """
+        Matches (`Match`/`Negation`) found in a text, e.g., shared by all sentences of a `Document`.
+
+        Each match is kept as a compact record in arrays: its span and offset, the spans of its
+            groups, and indices to the regex which found it and to the text of the match (from the
+            start of its first group to the end of its last; each distinct text is kept once), so
+            that the cask keeps neither `re.Match` objects nor the searched text (e.g., a sentence,
+            a document, or the buffer of a `DocumentBatch`) alive; the negation term of a
+            `Negation` is kept in the same way. `Match` objects (with a `SpanMatch` in place of
+            each `re.Match`) are only built when the matches are read (including `last`).
+            `start`/`end` are kept up to date as matches are added.
+        """
+        self._starts = array('q')  # start of each match (including its offset)
+        self._ends = array('q')
+        self._offsets = array('q')  # offset added to positions in the searched string
+        self._kinds = array('b')
+        self._sources = array('i')  # index into self._strings
+        self._patterns = array('i')  # index into self._regexes
+        self._span_index = array('q', [0])  # spans of record i: self._spans[2 * span_index[i]:2 * span_index[i + 1]]
+        self._spans = array('q')  # (start, end) of the match and each group in the searched string; -1 if unmatched
+        self._lastindex = array('i')  # `lastindex` of each match; -1 if None
+        self._extras = {}  # record -> compressed groups of a `Match`, negation term (`_Term`) of a `Negation`, or other object
+        self._strings = []  # text of each match (see `_raw_record`)
+        self._string_ids = {}  # text -> index into self._strings
+        self._regexes = []  # compiled regex (or, for a `SpanMatch`, its dict of group name -> number)
+        self._regex_ids = {}
+        self._start = None
+        self._end = None
 
     @property
     def start(self):
-        if self.matches:
-            return min(m.start() for m in self.matches)
-        return None
+        return self._start
 
     @property
     def end(self):
-        if self.matches:
-            return max(m.end() for m in self.matches)
-        return None
+        return self._end
 
     @property
     def last_start(self):
@@ -33,29 +79,158 @@ class MatchCask:
         return self.last.group()
 
     @property
-    def last(self) -> Match:
-        if self.matches:
-            return self.matches[-1]
+    def last(self) -> Optional[Match]:
+        """Most recently added match"""
+        if not self._starts:
+            return None
+        return self._materialize(len(self._starts) - 1)
+
+    @property
+    def matches(self) -> list:
+        """All matches, in the order added"""
+        return [self._materialize(i) for i in range(len(self._starts))]
+
+    @staticmethod
+    def _intern(value, values: list, ids: dict, key=None) -> int:
+        key = id(value) if key is None else key
+        try:
+            return ids[key]
+        except KeyError:
+            ids[key] = len(values)
+            values.append(value)
+            return len(values) - 1
 
     def add(self, m: Match):
-        self.matches.append(m)
+        start, end = m.start(), m.end()
+        idx = len(self._starts)
+        self._starts.append(start)
+        self._ends.append(end)
+        self._start = start if self._start is None else min(self._start, start)
+        self._end = end if self._end is None else max(self._end, end)
+        raw = m.matchobj if isinstance(m, (Match, Negation)) else None
+        if not hasattr(raw, 'span') or not hasattr(raw, 'string'):
+            self._offsets.append(0)
+            self._kinds.append(_OTHER)
+            self._sources.append(-1)
+            self._patterns.append(-1)
+            self._span_index.append(self._span_index[-1])
+            self._lastindex.append(-1)
+            self._extras[idx] = m
+            return
+        if isinstance(m, Negation):
+            self._kinds.append(_NEGATION)
+            self._extras[idx] = self._term_record(m.negationobj)
+        else:
+            self._kinds.append(_MATCH)
+            if m._groups is not None:
+                self._extras[idx] = m._groups
+        self._offsets.append(start - raw.start())
+        source, pattern, spans, lastindex = self._raw_record(raw)
+        self._sources.append(source)
+        self._patterns.append(pattern)
+        self._spans.extend(spans)
+        self._span_index.append(self._span_index[-1] + len(spans) // 2)
+        self._lastindex.append(lastindex)
+
+    def _raw_record(self, raw):
+        """(text index, regex index, flattened spans of the match and each group, lastindex) of an `re.Match`
+
+        Only the text from the start of the first group (or the match) to the end of the last is kept.
+        """
+        regex = getattr(raw, 're', None)
+        pattern = self._intern(regex if regex is not None else getattr(raw, '_groupindex', {}),
+                               self._regexes, self._regex_ids)
+        n_groups = regex.groups if regex is not None else len(raw.groups())
+        spans = []
+        for i in range(n_groups + 1):
+            spans.extend(raw.span(i))
+        low, high = _bounds(spans)
+        base = getattr(raw, '_base', 0)  # a `SpanMatch` may hold only part of the searched string
+        text = raw.string[low - base:high - base]
+        source = self._intern(text, self._strings, self._string_ids, key=text)
+        lastindex = getattr(raw, 'lastindex', None)
+        return source, pattern, spans, -1 if lastindex is None else lastindex
+
+    def _term_record(self, term):
+        """Negation term as a `_Term` (or as is, if not a match, e.g., a plain string)"""
+        if not hasattr(term, 'span') or not hasattr(term, 'string'):
+            return term
+        return _Term(*self._raw_record(term))
+
+    def _span_match(self, source, pattern, spans, lastindex) -> SpanMatch:
+        base = _bounds(spans)[0]
+        spans = [None if spans[i] < 0 else (spans[i], spans[i + 1]) for i in range(0, len(spans), 2)]
+        regex = self._regexes[pattern]
+        if isinstance(regex, dict):  # `SpanMatch` without a regex: its group names
+            groupindex, regex = regex, None
+        else:
+            groupindex = regex.groupindex
+        return SpanMatch(self._strings[source], *spans[0], groups=spans[1:], groupindex=groupindex, pos=base,
+                         regex=regex, lastindex=None if lastindex < 0 else lastindex, base=base)
+
+    def _materialize(self, idx):
+        """`Match`/`Negation` for record idx"""
+        kind = self._kinds[idx]
+        if kind == _OTHER:
+            return self._extras[idx]
+        raw = self._span_match(self._sources[idx], self._patterns[idx],
+                               self._spans[2 * self._span_index[idx]:2 * self._span_index[idx + 1]],
+                               self._lastindex[idx])
+        if kind == _NEGATION:
+            term = self._extras[idx]
+            if isinstance(term, _Term):
+                term = self._span_match(*term)
+            return Negation(term, raw, offset=self._offsets[idx])
+        return Match(raw, groups=self._extras.get(idx), offset=self._offsets[idx])
 
     def add_all(self, matches):
-        self.matches += matches
+        """
+        :param matches: `MatchCask` or iterable of `Match`
+        """
+        if isinstance(matches, MatchCask):
+            self._extend(matches)
+        else:
+            for m in matches:
+                self.add(m)
+        return self
+
+    def _extend(self, other: 'MatchCask'):
+        """Add the records of another cask"""
+        base = len(self._starts)
+        if not len(other._starts):
+            return
+        self._starts.extend(other._starts)
+        self._ends.extend(other._ends)
+        self._offsets.extend(other._offsets)
+        self._kinds.extend(other._kinds)
+        strings = [self._intern(s, self._strings, self._string_ids, key=s) for s in other._strings]
+        self._sources.extend(array('i', (-1 if i < 0 else strings[i] for i in other._sources)))
+        regexes = [self._intern(r, self._regexes, self._regex_ids) for r in other._regexes]
+        self._patterns.extend(array('i', (-1 if i < 0 else regexes[i] for i in other._patterns)))
+        span_base = self._span_index[-1]
+        self._span_index.extend(array('q', (span_base + i for i in other._span_index[1:])))
+        self._spans.extend(other._spans)
+        self._lastindex.extend(other._lastindex)
+        for i, extra in other._extras.items():
+            if isinstance(extra, _Term):  # indices into this cask's strings and regexes
+                extra = _Term(strings[extra.source], regexes[extra.pattern], extra.spans, extra.lastindex)
+            self._extras[base + i] = extra
+        self._start = other._start if self._start is None else min(self._start, other._start)
+        self._end = other._end if self._end is None else max(self._end, other._end)
 
     def copy(self):
-        mc = MatchCask()
-        mc.matches = copy(self.matches)
-        return mc
+        return MatchCask().add_all(self)
 
     def __repr__(self):
-        return repr(set(m.group() for m in self.matches))
+        return repr(set(m.group() for m in self))
 
     def __str__(self):
-        return str(set(m.group() for m in self.matches))
+        return str(set(m.group() for m in self))
 
     def __iter__(self):
-        return iter(self.matches)
+        return (self._materialize(i) for i in range(len(self._starts)))
 
     def __getitem__(self, item):
-        return self.matches[item]
+        if isinstance(item, slice):
+            return [self._materialize(i) for i in range(len(self._starts))[item]]
+        return self._materialize(range(len(self._starts))[item])
@@ -4,6 +4,8 @@ from runrex.algo import Match
 
 
 class Negation:
+    __slots__ = ('_term', '_match', '_match_offset')
+
     def __init__(self, term, match, offset=0):
         self._term = term  # negation term
         self._match: Match = match
@@ -17,6 +19,10 @@ class Negation:
     def negationobj(self):
         return self._term
 
+    def shifted(self, offset):
+        """Copy of this match with `offset` added to all positions (but not those of the negation term)"""
+        return Negation(self._term, self._match, offset=self._match_offset + offset)
+
     def neg_group(self, *index):
         return self._term.group(*index)
 
@@ -37,7 +43,7 @@ class Negation:
 
     @property
     def match(self):
-        if isinstance(self._match, re.Match):
+        if hasattr(self._match, 'group'):  # re.Match or equivalent from another regex backend
             return self._match.group()
         return str(self._match)
 
@@ -0,0 +1,340 @@
+"""
+Rewrite regular expressions with large alternations into an equivalent, faster form.
+
+* duplicate branches are removed (e.g., `(pamphlet|warning|pamphlet)`)
+* branches starting with the same literal character are merged into a trie, e.g.,
+    `(possible|possibly|potential)` becomes `(po(?:ssib(?:le|ly)|tential))`
+* literal characters and anchors shared by the start of every branch, and anchors (e.g., `\\b`) shared by the end of every
+    branch, are hoisted out of the alternation
+
+Results are identical to the original regex: the order in which branches are tried is kept
+    wherever it could matter (branches are only reordered relative to branches which must
+    start with a different character), capture groups keep their numbering and span, and
+    regexes with inline flags, conditionals, or the VERBOSE flag are left unchanged.
+"""
+import re
+from functools import lru_cache
+
+_QUANTIFIER = re.compile(r'(?:[*+?]|\{\d*(?:,\d*)?\})[?+]?')
+_ATOM_ESCAPES = set('AZbBdDsSwW0123456789xuUNnrtfvag')
+_ANCHORS = {'^', '$', r'\b', r'\B', r'\A', r'\Z'}
+
+
+class _Literal:
+    captures = 0
+
+    def __init__(self, source, char):
+        self.source = source
+        self.char = char
+
+    def key(self, ignorecase):
+        return 'L', self.char.lower() if ignorecase and self.char.isascii() else self.char
+
+    def __str__(self):
+        return self.source
+
+
+class _Atom:
+    captures = 0
+
+    def __init__(self, source):
+        self.source = source
+
+    def key(self, ignorecase):
+        return 'A', self.source
+
+    def __str__(self):
+        return self.source
+
+
+class _Repeat:
+
+    def __init__(self, item, quantifier):
+        self.item = item
+        self.quantifier = quantifier
+        self.captures = item.captures
+
+    def key(self, ignorecase):
+        return 'R', self.item.key(ignorecase), self.quantifier
+
+    def __str__(self):
+        return f'{self.item}{self.quantifier}'
+
+
+class _Group:
+
+    def __init__(self, opening, alternatives, capturing, optimizable=True):
+        """
+        :param opening: e.g., '(', '(?:', '(?P<name>', '(?='
+        :param alternatives: list of branches (each a list of items)
+        """
+        self.opening = opening
+        self.alternatives = alternatives
+        self.capturing = capturing
+        self.optimizable = optimizable
+        self.captures = int(capturing) + sum(item.captures for branch in alternatives for item in branch)
+
+    def key(self, ignorecase):
+        return 'G', str(self)
+
+    def __str__(self):
+        return f'{self.opening}{"|".join(_join(branch) for branch in self.alternatives)})'
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _join(items):
+    return ''.join(str(item) for item in items)
+
+
+class _Parser:
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.i = 0
+
+    def parse(self):
+        alternatives = self._alternatives()
+        if self.i != len(self.pattern):
+            raise _Unsupported('unbalanced parenthesis')
+        return alternatives
+
+    def _alternatives(self):
+        alternatives = [[]]
+        while self.i < len(self.pattern):
+            char = self.pattern[self.i]
+            if char == ')':
+                break
+            elif char == '|':
+                self.i += 1
+                alternatives.append([])
+                continue
+            if _QUANTIFIER.match(self.pattern, self.i):  # e.g., directly after `|` or `(`
+                raise _Unsupported('nothing to repeat')
+            item = self._item()
+            if m := _QUANTIFIER.match(self.pattern, self.i):
+                item = _Repeat(item, m.group())
+                self.i = m.end()
+            alternatives[-1].append(item)
+        return alternatives
+
+    def _item(self):
+        pattern, i = self.pattern, self.i
+        char = pattern[i]
+        if char == '\\':
+            if i + 1 >= len(pattern):
+                raise _Unsupported('trailing backslash')
+            escaped = pattern[i + 1]
+            if escaped in _ATOM_ESCAPES:  # classes, anchors, backreferences, character codes
+                if escaped in 'xuUN':
+                    raise _Unsupported('character code escape')
+                end = i + 2
+                while escaped.isdigit() and end < len(pattern) and pattern[end].isdigit():
+                    end += 1
+                self.i = end
+                return _Atom(pattern[i:end])
+            self.i = i + 2
+            return _Literal(pattern[i:i + 2], escaped)
+        elif char == '[':
+            end = i + 1
+            if end < len(pattern) and pattern[end] == '^':
+                end += 1
+            if end < len(pattern) and pattern[end] == ']':
+                end += 1
+            while end < len(pattern) and pattern[end] != ']':
+                end += 2 if pattern[end] == '\\' else 1
+            if end >= len(pattern):
+                raise _Unsupported('unterminated character set')
+            self.i = end + 1
+            return _Atom(pattern[i:end + 1])
+        elif char == '(':
+            return self._group()
+        elif char in '.^$':
+            self.i = i + 1
+            return _Atom(char)
+        elif char == '{':  # escape, so it cannot become part of a quantifier once branches are merged
+            self.i = i + 1
+            return _Literal('\\{', char)
+        self.i = i + 1
+        return _Literal(char, char)
+
+    def _group(self):
+        pattern, i = self.pattern, self.i
+        if pattern.startswith('(?P<', i):
+            end = pattern.index('>', i) + 1
+            opening, capturing, optimizable = pattern[i:end], True, True
+        elif pattern.startswith('(?P=', i) or pattern.startswith('(?#', i):
+            end = pattern.index(')', i) + 1
+            self.i = end
+            return _Atom(pattern[i:end])
+        elif pattern.startswith(('(?:', '(?=', '(?!', '(?>'), i):
+            opening, capturing, optimizable = pattern[i:i + 3], False, True
+        elif pattern.startswith(('(?<=', '(?<!'), i):  # look-behinds require fixed width
+            opening, capturing, optimizable = pattern[i:i + 4], False, False
+        elif pattern.startswith('(?', i):  # inline flags, conditionals
+            raise _Unsupported('inline flags or conditional')
+        else:
+            opening, capturing, optimizable = '(', True, True
+        self.i = i + len(opening)
+        alternatives = self._alternatives()
+        if self.i >= len(pattern) or pattern[self.i] != ')':
+            raise _Unsupported('unbalanced parenthesis')
+        self.i += 1
+        return _Group(opening, alternatives, capturing, optimizable)
+
+
+class _Optimizer:
+
+    def __init__(self, ignorecase):
+        self.ignorecase = ignorecase
+
+    def alternatives(self, alternatives) -> list:
+        """Optimize an alternation, returning the new list of branches (as strings)"""
+        branches = [self.branch(branch) for branch in alternatives]
+        branches = self._dedupe(branches)
+        if len(branches) == 1:
+            return [_join(branches[0])]
+        return self._factor(branches)
+
+    def branch(self, items) -> list:
+        """Optimize groups within the branch"""
+        result = []
+        for item in items:
+            if isinstance(item, _Repeat) and isinstance(item.item, _Group):
+                item = _Repeat(self.group(item.item), item.quantifier)
+            elif isinstance(item, _Group):
+                item = self.group(item)
+            result.append(item)
+        return result
+
+    def group(self, group: _Group) -> _Group:
+        if not group.optimizable:
+            return group
+        rewritten = _Group(group.opening, [], group.capturing)
+        rewritten.alternatives = [[_Atom(src)] for src in self.alternatives(group.alternatives)]
+        rewritten.captures = group.captures
+        return rewritten
+
+    def _key(self, items):
+        return tuple(item.key(self.ignorecase) for item in items)
+
+    def _dedupe(self, branches):
+        """Drop repeated branches: a later identical branch can only fail where the first did"""
+        seen = set()
+        result = []
+        for branch in branches:
+            key = self._key(branch)
+            if key in seen and not any(item.captures for item in branch):
+                continue
+            seen.add(key)
+            result.append(branch)
+        return result
+
+    def _factor(self, branches) -> list:
+        # hoist items shared by the start/end of every branch (order of branches is unchanged);
+        #   only literal characters and anchors, which match in exactly one way: hoisting a
+        #   repeat or class would let backtracking into it try the remaining branches in a new order
+        prefix = []
+        while all(branch and self._is_fixed(branch[0]) for branch in branches) \
+                and len({branch[0].key(self.ignorecase) for branch in branches}) == 1:
+            prefix.append(branches[0][0])
+            branches = [branch[1:] for branch in branches]
+        suffix = []
+        while all(branch and str(branch[-1]) in _ANCHORS for branch in branches) \
+                and len({str(branch[-1]) for branch in branches}) == 1:
+            suffix.insert(0, branches[0][-1])
+            branches = [branch[:-1] for branch in branches]
+        if prefix or suffix:
+            inner = self.alternatives(branches)
+            return [_join(prefix) + _wrap(inner) + _join(suffix)]
+        return self._trie(branches)
+
+    @staticmethod
+    def _is_fixed(item) -> bool:
+        """Does the item match exactly one way (a literal character or an anchor)?"""
+        return isinstance(item, _Literal) or str(item) in _ANCHORS
+
+    def _trie(self, branches) -> list:
+        """Merge branches starting with the same literal character
+
+        Branches starting with different literal characters (ignoring word boundaries) are mutually
+            exclusive, so only their relative order can change; any other branch (e.g., starting
+            with a character class) keeps its position relative to all others.
+        """
+        order = []  # groups of branch indices, in their new order
+        run = {}  # literal key -> indices of branches within a run of literal-initial branches
+        for idx, branch in enumerate(branches + [None]):
+            if branch is not None and (key := self._initial_literal(branch)):
+                run.setdefault(key, []).append(idx)
+                continue
+            order.extend(run.values())
+            run = {}
+            if branch is not None:
+                order.append([idx])
+        # reordering must not change the numbering of capture groups
+        capturing = [idx for group in order for idx in group if any(item.captures for item in branches[idx])]
+        if capturing != sorted(capturing):
+            return [_join(branch) for branch in branches]
+        return [self._merge([branches[idx] for idx in group]) for group in order]
+
+    def _initial_literal(self, branch):
+        """Key of the first character any match of the branch must start with (or None)"""
+        for item in branch:
+            if isinstance(item, _Literal):
+                return item.key(self.ignorecase)
+            elif str(item) not in (r'\b', r'\B'):
+                return None
+        return None
+
+    def _merge(self, group) -> str:
+        if len(group) == 1:
+            return _join(group[0])
+        if len({branch[0].key(self.ignorecase) for branch in group}) > 1:  # e.g., `\bsign|schedul`
+            return '|'.join(_join(branch) for branch in group)
+        return str(group[0][0]) + _wrap(self.alternatives([branch[1:] for branch in group]))
+
+
+def _wrap(alternatives) -> str:
+    if len(alternatives) == 1:
+        rx = alternatives[0]
+        return rx if _is_single(rx) else f'(?:{rx})'
+    if alternatives[-1] == '' and all(alternatives[:-1]):
+        return f'(?:{"|".join(alternatives[:-1])})?'
+    return f'(?:{"|".join(alternatives)})'
+
+
+def _is_single(rx) -> bool:
+    """Can rx be concatenated with other items without changing its meaning (i.e., no top-level `|`)?"""
+    if '|' not in rx:
+        return True
+    try:
+        return len(_Parser(rx).parse()) == 1
+    except _Unsupported:
+        return False
+
+
+@lru_cache(maxsize=4096)
+def optimize_regex(pattern: str, flags=0) -> str:
+    """Return an equivalent (but faster) form of the regex, or the regex unchanged if it cannot be optimized
+
+    :param pattern: regular expression (uncompiled string)
+    :param flags: as passed to `re.compile`
+    """
+    if flags & re.VERBOSE:
+        return pattern
+    try:
+        alternatives = _Parser(pattern).parse()
+    except (_Unsupported, ValueError):
+        return pattern
+    optimized = '|'.join(_Optimizer(bool(flags & re.IGNORECASE)).alternatives(alternatives))
+    if optimized == pattern:
+        return pattern
+    try:  # should not happen, but never make things worse
+        original, rewritten = re.compile(pattern, flags), re.compile(optimized, flags)
+    except re.error:
+        return pattern
+    if original.groups != rewritten.groups or original.groupindex != rewritten.groupindex:
+        return pattern
+    return optimized
@@ -1,9 +1,22 @@
 import re
+from time import perf_counter
 from typing import Iterable
 
+from loguru import logger
+
+from runrex.algo.asciimode import ascii_equivalent
+from runrex.algo.cache import PATTERN_CACHE
+from runrex.algo.casefold import FoldedRegex, fold_regex
+from runrex.algo.context import ContextSpans
 from runrex.algo.direction import DirectionFlag
 from runrex.algo.match import Match
 from runrex.algo.negation import Negation
+from runrex.algo.optimize import optimize_regex
+from runrex.algo.registry import LazyRegex, compile_regex
+from runrex.algo.stats import STATS
+
+WINDOW_UNITS = ('char', 'token')
+NAMED_GROUP = re.compile(r'\?P<(\w+)>')
 
 
 class Pattern:
@@ -16,13 +29,22 @@ class Pattern:
                  requires_pre: Iterable[str] = None,
                  requires_post: Iterable[str] = None,
                  requires_all: Iterable[str] = None,
+                 negates_window: int = None,
+                 requires_window: int = None,
+                 window_unit='char',
                  replace_whitespace=r'\W?',
                  capture_length=None, retain_groups=None,
-                 flags=re.IGNORECASE):
+                 flags=re.IGNORECASE, backend=None, timeout=None, optimize=False,
+                 casefold=False, ascii_mode=True):
         """
 
         :param pattern: regular expressions (uncompiled string)
         :param negates: regular expressions (uncompiled string)
+        :param negates_window: only look for `negates` (and `negates_pre`/`negates_post`) within
+            this many units before/after the match; None: the entire text
+        :param requires_window: only look for `requires` (and `requires_pre`/`requires_post`) within
+            this many units before/after the match; None: the entire text
+        :param window_unit: 'char' or 'token' (i.e., whitespace-separated)
         :param replace_whitespace: replace whitespace with this value; if using
             a custom tokenizer that leaves multiple spaces, this should be set to, e.g.,
             \\W*. This allow more readable regexes
@@ -31,27 +53,96 @@ class Pattern:
             has capture_length = 1
             None: i.e., capture_length == max
         :param flags:
+        :param backend: regex engine to use (e.g., 're', 'regex', 're2'); None: use the
+            default (see `runrex.algo.registry.set_default_backend`)
+        :param timeout: number of seconds after which a search is abandoned (and logged),
+            treating the text as not matching; requires a backend which supports timeouts
+        :param optimize: rewrite regular expressions into an equivalent, faster form (e.g., merging
+            branches of large alternations; see `runrex.algo.optimize`); the rewritten form of the
+            main regular expression is available as `compiled_text`
+        :param casefold: compile the main regular expression without `re.IGNORECASE` and search
+            the case-folded copy of the text (shared by all patterns searching the same
+            `Sentence`/`Document`; see `runrex.algo.casefold`); results are unchanged. Ignored if
+            `flags` does not include `re.IGNORECASE` or the regex cannot be rewritten
+        :param ascii_mode: search ASCII-only text with the main regular expression compiled with
+            `re.ASCII` (faster `\\w`, `\\b`, and case-insensitive matching), provided that this
+            cannot change the results (see `runrex.algo.asciimode`); other text is searched with
+            the unicode regex
+
+        Regular expressions are shared between all patterns (see `runrex.algo.registry`), and are
+            not compiled until first used. Use `precompile` to compile them ahead of time.
         """
         self.match_count = 0
-        if replace_whitespace:
-            pattern = replace_whitespace.join(pattern.split(' '))
-        if retain_groups:
-            for m in re.finditer(r'\?P<(\w+)>', pattern):
-                term = m.group(1)
-                if term in retain_groups:
-                    continue
-                pattern = re.sub(rf'\?P<{term}>', r'\?:', pattern)
-        self.pattern = re.compile(pattern, flags)
+        self._backend = {'backend': backend, 'timeout': timeout}
+        self._optimize = optimize
+        self._casefold = casefold
+        self.text, self.pattern = self._build_pattern(pattern, flags, replace_whitespace, retain_groups)
+        self._casefolded = getattr(self.pattern, 'casefolded', False)  # accepts case-folded text
+        self._ascii_mode = ascii_mode
+        self._ascii_pattern = False  # regex for ASCII-only text; False: not yet built, None: not applicable
         self.negates = list(self._compile_patterns(negates, negates_pre, negates_post, replace_whitespace, flags))
         self.requires = list(self._compile_patterns(requires, requires_pre, requires_post, replace_whitespace, flags))
         self.requires_all = list(self._compile_pattern(requires_all, replace_whitespace, flags))
+        if window_unit not in WINDOW_UNITS:
+            raise ValueError(f'Unrecognized window unit: {window_unit}; expected one of {WINDOW_UNITS}')
+        self.negates_window = negates_window
+        self.requires_window = requires_window
+        self.window_unit = window_unit
 
         self.capture_length = capture_length
-        self.text = self.pattern.pattern
+
+    def _build_pattern(self, pattern, flags, replace_whitespace, retain_groups):
+        """Build the main matcher
+
+        :return: (text describing the pattern, matcher with the interface of `re.Pattern`)
+        """
+        if replace_whitespace:
+            pattern = replace_whitespace.join(pattern.split(' '))
+        if retain_groups:
+            pattern = NAMED_GROUP.sub(lambda m: m.group() if m.group(1) in retain_groups else '?:', pattern)
+        return pattern, self._compile_regex(pattern, flags, fold=self._casefold)
 
     def __str__(self):
         return self.text
 
+    @property
+    def compiled_text(self):
+        """Regular expression actually searched (differs from `text` if optimized or case-folded)"""
+        return self.pattern.pattern
+
+    @property
+    def literals(self):
+        """Literals of which at least one must appear in the text for the pattern to match"""
+        if literal_filter := self.pattern.get_literal_filter():
+            return literal_filter.literals
+
+    def may_match(self, text, context: ContextSpans = None):
+        """Cheap test for whether the pattern can match the text (if False, it certainly cannot)
+
+        :param context: for the shared case-folded copy of text
+        """
+        literal_filter = self.pattern.get_literal_filter()
+        if literal_filter is None:
+            return True
+        if literal_filter.ignorecase and context is not None and context.text is text:
+            return literal_filter.may_match(text, context.folded)
+        return literal_filter.may_match(text)
+
+    def precompile(self):
+        """Compile all regular expressions now rather than on first use"""
+        for regex in self._iter_regexes():
+            regex.compile()
+            regex.get_literal_filter()
+        return self
+
+    def _iter_regexes(self):
+        yield self.pattern
+        if self._ascii_mode and (ascii_regex := self._get_ascii_pattern()) is not None:
+            yield ascii_regex
+        for regex, _ in self.negates + self.requires:
+            yield regex
+        yield from self.requires_all
+
     def _compile_patterns(self, both, pre, post, replace_whitespace, flags):
         for group, flag in [(both, DirectionFlag.BOTH), (pre, DirectionFlag.PRE),
                             (post, DirectionFlag.POST)]:
@@ -62,57 +153,193 @@ class Pattern:
             if replace_whitespace:
                 rx = replace_whitespace.join(rx.split(' '))
             if flag:
-                yield re.compile(rx, flags), flag
+                yield self._compile_regex(rx, flags), flag
             else:
-                yield re.compile(rx, flags)
+                yield self._compile_regex(rx, flags)
 
-    def _get_text_for_direction(self, text, direction, match_start, match_end):
-        if direction == DirectionFlag.BOTH:
-            return text
-        elif direction == DirectionFlag.PRE:
-            return text[:match_start]
+    def _compile_regex(self, rx, flags, fold=False):
+        if self._optimize:
+            rx = optimize_regex(rx, flags)
+        if fold and (folded := fold_regex(rx, flags)) is not None:
+            return FoldedRegex(compile_regex(folded, flags & ~re.IGNORECASE, **self._backend),
+                               compile_regex(rx, flags, **self._backend))
+        return compile_regex(rx, flags, **self._backend)
+
+    def _get_ascii_pattern(self):
+        """Equivalent of the main regex compiled with `re.ASCII` (for ASCII-only text), or None"""
+        if self._ascii_pattern is False:
+            self._ascii_pattern = None
+            regex = self.pattern
+            source = regex.original if isinstance(regex, FoldedRegex) else regex
+            if isinstance(source, LazyRegex) and ascii_equivalent(source.pattern, source.flags):
+                ascii_regex = compile_regex(source.pattern, source.flags | re.ASCII, **self._backend)
+                if isinstance(regex, FoldedRegex):
+                    ascii_regex = FoldedRegex(
+                        compile_regex(regex.regex.pattern, regex.regex.flags | re.ASCII, **self._backend),
+                        ascii_regex,
+                    )
+                self._ascii_pattern = ascii_regex
+        return self._ascii_pattern
+
+    def _search_regex(self, method, text, context=None):
+        """Call `self.pattern.search`/`finditer` on text
+
+        ASCII-only text is searched with the `re.ASCII` equivalent of the regex (if any), and the
+            case-folded copy of text in context is shared (if the regex uses it).
+        """
+        regex = self.pattern
+        if self._ascii_mode and text.isascii() and (ascii_regex := self._get_ascii_pattern()) is not None:
+            regex = ascii_regex
+        if self._casefolded:
+            folded = context.folded if context is not None and context.text is text else None
+            return getattr(regex, method)(text, folded=folded)
+        return getattr(regex, method)(text)
+
+    def _window_start(self, text, match_start, window):
+        if self.window_unit == 'char':
+            return max(0, match_start - window)
+        i = match_start
+        for _ in range(window):
+            while i > 0 and text[i - 1].isspace():
+                i -= 1
+            while i > 0 and not text[i - 1].isspace():
+                i -= 1
+        return i
+
+    def _window_end(self, text, match_end, window):
+        if self.window_unit == 'char':
+            return min(len(text), match_end + window)
+        i = match_end
+        for _ in range(window):
+            while i < len(text) and text[i].isspace():
+                i += 1
+            while i < len(text) and not text[i].isspace():
+                i += 1
+        return i
+
+    def _get_bounds_for_direction(self, text, direction, match_start, match_end, window=None):
+        """Region of text (pos, endpos) in which to look for context around a match"""
+        pos, endpos = 0, len(text)
+        if direction == DirectionFlag.PRE:
+            endpos = match_start
         elif direction == DirectionFlag.POST:
-            return text[match_end:]
+            pos = match_end
+        if window is not None:
+            if direction != DirectionFlag.POST:
+                pos = max(pos, self._window_start(text, match_start, window))
+            if direction != DirectionFlag.PRE:
+                endpos = min(endpos, self._window_end(text, match_end, window))
+        return pos, endpos
 
     def _confirm_match(self, text, match_start, match_end, return_negation=False,
                        ignore_negation=False,
-                       ignore_requires=False, ignore_requires_all=False):
+                       ignore_requires=False, ignore_requires_all=False, context: ContextSpans = None):
+        """Check context (negation/requires) for a match at text[match_start:match_end]
+
+        Each context regex is run only once over the text (see `ContextSpans`); the region for its
+            direction/window is only searched on its own if a match from that pass crosses it.
+
+        :param context: matches of context regexes over this text; can be shared by multiple
+            candidate matches and patterns
+        """
+        if context is None or context.text is not text:
+            context = ContextSpans(text)
         if not ignore_negation:
             for negate, direction in self.negates:
-                if neg_match := negate.search(self._get_text_for_direction(text, direction, match_start, match_end)):
+                pos, endpos = self._get_bounds_for_direction(text, direction, match_start, match_end,
+                                                             self.negates_window)
+                if neg_match := context.first_within(negate, pos, endpos):
+                    if STATS.enabled:
+                        STATS.get(self).rejected_negation += 1
                     return neg_match if return_negation else False
         if not ignore_requires and self.requires:
             found = False
             for require, direction in self.requires:
-                if require.search(self._get_text_for_direction(text, direction, match_start, match_end)):
+                pos, endpos = self._get_bounds_for_direction(text, direction, match_start, match_end,
+                                                             self.requires_window)
+                if context.first_within(require, pos, endpos):
                     found = True
                     break
             if not found:
+                if STATS.enabled:
+                    STATS.get(self).rejected_requires += 1
                 return False
         if not ignore_requires_all:
             for require in self.requires_all:
-                if not require.search(text):
+                if not context.found(require):
+                    if STATS.enabled:
+                        STATS.get(self).rejected_requires += 1
                     return False
         return True
 
     def finditer(self, text, *, offset=0, return_negation=False, **kwargs):
         """Look for all matches
 
-        TODO: allow configuring window, etc.
-
         :param offset:
         :param text:
         :param kwargs:
         :return:
         """
-        for m in self.pattern.finditer(text):
-            cm = self._confirm_match(text, m.start() + offset, m.end() + offset,
-                                     return_negation=return_negation, **kwargs)
+        if PATTERN_CACHE.enabled:
+            yield from PATTERN_CACHE.finditer(self, text, offset=offset, return_negation=return_negation, **kwargs)
+        else:
+            yield from self._uncached_finditer(text, offset=offset, return_negation=return_negation, **kwargs)
+
+    def _uncached_finditer(self, text, *, offset=0, **kwargs):
+        if self.may_match(text, kwargs.get('context')):
+            yield from self._finditer(text, offset=offset, **kwargs)
+        elif STATS.enabled:
+            STATS.get(self).skipped += 1
+
+    def _finditer(self, text, **kwargs):
+        """`finditer` without checking for required literals"""
+        if STATS.enabled:
+            yield from self._finditer_with_stats(text, **kwargs)
+            return
+        try:
+            yield from self._iter_results(text, self._search_regex('finditer', text, kwargs.get('context')), **kwargs)
+        except TimeoutError:
+            self._log_timeout(text)
+
+    def _finditer_with_stats(self, text, **kwargs):
+        """`_finditer`, timing only the search itself (not the caller's handling of each result)"""
+        elapsed = 0.0
+        start = perf_counter()
+        try:
+            candidates = self._search_regex('finditer', text, kwargs.get('context'))
+            for result in self._iter_results(text, candidates, **kwargs):
+                elapsed += perf_counter() - start
+                yield result
+                start = perf_counter()
+            elapsed += perf_counter() - start
+        except TimeoutError:
+            elapsed += perf_counter() - start
+            self._log_timeout(text)
+        finally:
+            STATS.get(self).add_call(text, elapsed)
+
+    def _log_timeout(self, text):
+        logger.warning(f'Pattern timed out on text of length {len(text)}, skipping: {self.text}')
+
+    def _iter_results(self, text, candidates, *, offset=0, return_negation=False, context=None, base=0, **kwargs):
+        """Confirm each candidate `re.Match` (as yielded by `self.pattern.finditer`)
+
+        :param base: candidates were found in a larger string, in which `text` starts at this index
+        """
+        if context is None or context.text is not text:
+            context = ContextSpans(text)  # share context across all candidates
+        for m in candidates:
+            if STATS.enabled:
+                STATS.get(self).candidates += 1
+            cm = self._confirm_match(text, m.start() - base, m.end() - base, return_negation=return_negation,
+                                     context=context, **kwargs)
             if not isinstance(cm, bool):
-                yield Negation(cm, m, offset=offset)
+                yield Negation(cm, m, offset=offset - base)
             elif cm:
                 self.match_count += 1
-                yield Match(m, groups=self._compress_groups(m), offset=offset)
+                if STATS.enabled:
+                    STATS.get(self).matches += 1
+                yield Match(m, groups=self._compress_groups(m), offset=offset - base)
 
     def matches(self, text, *, offset=0, return_negation=False, **kwargs):
         """Look for the first match -- this evaluation is at the sentence level.
@@ -123,16 +350,53 @@ class Pattern:
         :param kwargs:
         :return:
         """
-        m = self.pattern.search(text)
+        if PATTERN_CACHE.enabled:
+            return PATTERN_CACHE.matches(self, text, offset=offset, return_negation=return_negation, **kwargs)
+        return self._uncached_matches(text, offset=offset, return_negation=return_negation, **kwargs)
+
+    def _uncached_matches(self, text, *, offset=0, **kwargs):
+        if not self.may_match(text, kwargs.get('context')):
+            if STATS.enabled:
+                STATS.get(self).skipped += 1
+            return False
+        return self._matches(text, offset=offset, **kwargs)
+
+    def _matches(self, text, **kwargs):
+        """`matches` without checking for required literals"""
+        if STATS.enabled:
+            start = perf_counter()
+            try:
+                return self._search(text, **kwargs)
+            finally:
+                STATS.get(self).add_call(text, perf_counter() - start)
+        return self._search(text, **kwargs)
+
+    def _search(self, text, **kwargs):
+        try:
+            return self._first_result(text, self._search_regex('search', text, kwargs.get('context')), **kwargs)
+        except TimeoutError:
+            self._log_timeout(text)
+            return False
+
+    def _first_result(self, text, m, *, offset=0, return_negation=False, base=0, **kwargs):
+        """Confirm the first candidate `re.Match` (as returned by `self.pattern.search`)
+
+        :param base: candidate was found in a larger string, in which `text` starts at this index
+        """
         if m:
-            cm = self._confirm_match(text, m.start(), m.end(), return_negation=return_negation, **kwargs)
+            if STATS.enabled:
+                STATS.get(self).candidates += 1
+            cm = self._confirm_match(text, m.start() - base, m.end() - base, return_negation=return_negation,
+                                     **kwargs)
             if cm is False:
                 return False
             elif cm is True:
                 self.match_count += 1
-                return Match(m, groups=self._compress_groups(m), offset=offset)
+                if STATS.enabled:
+                    STATS.get(self).matches += 1
+                return Match(m, groups=self._compress_groups(m), offset=offset - base)
             else:  # Negation requested
-                return Negation(cm, m)
+                return Negation(cm, m, offset=offset - base)
         return False
 
     def _compress_groups(self, m):
@@ -152,10 +416,20 @@ class Pattern:
         return m
 
     def sub(self, repl, text):
-        return self.pattern.sub(repl, text)
+        """Replace matches of the regex (text is returned unchanged if the search times out)"""
+        try:
+            return self.pattern.sub(repl, text)
+        except TimeoutError:
+            self._log_timeout(text)
+            return text
 
     def next(self, text, **kwargs):
-        m = self.pattern.search(text, **kwargs)
+        """Text after the first match of the regex (or all of text if none, or if the search times out)"""
+        try:
+            m = self.pattern.search(text, **kwargs)
+        except TimeoutError:
+            self._log_timeout(text)
+            return text
         if m:
             self.match_count += 1
             return text[m.end():]
@@ -0,0 +1,113 @@
+from typing import Iterable, List
+
+from runrex.algo.context import ContextSpans
+from runrex.algo.literals import LiteralScanner, fold_text
+from runrex.algo.pattern import Pattern
+from runrex.algo.stats import STATS
+
+
+def flatten_patterns(pats):
+    """Expand any `PatternSet` into its constituent patterns"""
+    for pat in pats:
+        if isinstance(pat, PatternSet):
+            yield from pat.patterns
+        else:
+            yield pat
+
+
+def iter_matches(pats, text, **kwargs):
+    """Lazily yield (pattern, result of `Pattern.matches`) for each pattern in turn
+
+    Each `PatternSet` is scanned only once, when its first pattern is required.
+    """
+    for pat in pats:
+        if isinstance(pat, PatternSet):
+            yield from zip(pat.patterns, pat.matches(text, **kwargs))
+        else:
+            yield pat, pat.matches(text, **kwargs)
+
+
+def iter_all_matches(pats, text, **kwargs):
+    """Lazily yield (pattern, result of `Pattern.finditer`) for each pattern in turn"""
+    for pat in pats:
+        if isinstance(pat, PatternSet):
+            yield from pat.finditer(text, **kwargs)
+        else:
+            for m in pat.finditer(text, **kwargs):
+                yield pat, m
+
+
+class PatternSet:
+
+    def __init__(self, *patterns: Pattern):
+        """
+        Scan text once for many patterns and return the results that each `Pattern`
+            would return on its own.
+
+        The literals required by each pattern (see `Pattern.literals`) are combined into a
+            single scanner, so that one pass over the text determines which patterns could match.
+            Only these (and patterns without any required literals) are then searched.
+
+        :param patterns: `Pattern` instances (order is retained in all results)
+        """
+        self.patterns = list(flatten_patterns(patterns))
+        self._literals = None  # for each pattern, frozenset of required literals (or None)
+        self._scanner = None
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def __iter__(self):
+        return iter(self.patterns)
+
+    def __getitem__(self, item):
+        return self.patterns[item]
+
+    def __str__(self):
+        return f'PatternSet({len(self.patterns)} patterns)'
+
+    def _build_scanner(self):
+        self._literals = [
+            frozenset(fold_text(lit) for lit in pat.literals) if pat.literals else None
+            for pat in self.patterns
+        ]
+        self._scanner = LiteralScanner(lit for lits in self._literals if lits for lit in lits)
+
+    def scan(self, text, context: ContextSpans = None) -> List[bool]:
+        """Walk the text once to determine which patterns might match
+
+        :param text:
+        :param context: for the shared case-folded copy of text
+        :return: list (one entry per pattern); False if the pattern cannot match
+        """
+        if self._scanner is None:
+            self._build_scanner()
+        folded = context.folded if context is not None and context.text is text else fold_text(text)
+        found = self._scanner.scan(folded, folded=True)
+        possible = [lits is None or not lits.isdisjoint(found) for lits in self._literals]
+        if STATS.enabled:
+            for pat, is_possible in zip(self.patterns, possible):
+                if not is_possible:
+                    STATS.get(pat).skipped += 1
+        return possible
+
+    def matches(self, text, *, offset=0, return_negation=False, **kwargs) -> list:
+        """Equivalent to calling `Pattern.matches` on each pattern
+
+        :return: list (one entry per pattern) of results (`Match`, `Negation`, or False)
+        """
+        return [
+            pat._matches(text, offset=offset, return_negation=return_negation, **kwargs) if possible else False
+            for pat, possible in zip(self.patterns, self.scan(text, kwargs.get('context')))
+        ]
+
+    def finditer(self, text, *, offset=0, return_negation=False, **kwargs) -> Iterable:
+        """Equivalent to calling `Pattern.finditer` on each pattern in turn
+
+        :return: iterator of (pattern, result) tuples
+        """
+        for pat, possible in zip(self.patterns, self.scan(text, kwargs.get('context'))):
+            if not possible:
+                continue
+            for m in pat._finditer(text, offset=offset, return_negation=return_negation, **kwargs):
+                yield pat, m
@@ -0,0 +1,163 @@
+"""
+Process-wide registry of regular expressions used by `Pattern`.
+
+Identical (regex, flags) pairs are shared by all patterns, and are only compiled when first used.
+    Call `precompile_all` to compile everything up front (e.g., before forking worker processes).
+"""
+import re
+
+from loguru import logger
+
+from runrex.algo.backend import get_backend
+from runrex.algo.literals import LiteralFilter
+
+_REGISTRY = {}  # (pattern, flags, backend, timeout) -> LazyRegex
+_DEFAULTS = {'backend': 're', 'timeout': None}
+_WARNED_NO_TIMEOUT = set()  # backends for which a warning has already been logged
+
+
+class LazyRegex:
+    __slots__ = ('pattern', 'flags', 'backend', 'timeout', '_compiled', '_literal_filter')
+    casefolded = False  # searches the original text (see `runrex.algo.casefold.FoldedRegex`)
+
+    def __init__(self, pattern: str, flags=0, backend=None, timeout=None):
+        """
+        Regular expression which is compiled when first used; otherwise behaves like `re.Pattern`.
+
+        Use `compile_regex` rather than creating directly to share instances.
+
+        :param pattern: regular expression (uncompiled string)
+        :param flags: flags as passed to `re.compile`
+        :param backend: name of regex engine (see `runrex.algo.backend`); None: use the default
+        :param timeout: seconds after which a search raises `TimeoutError`; None: use the default
+        """
+        self.pattern = pattern
+        self.flags = flags
+        self.backend = backend
+        self.timeout = timeout
+        self._compiled = None
+        self._literal_filter = False  # False: not yet extracted; None: no literals
+
+    def compile(self):
+        if self._compiled is None:
+            backend = get_backend(self.backend or _DEFAULTS['backend'])
+            timeout = _DEFAULTS['timeout'] if self.timeout is None else self.timeout
+            if timeout and not backend.supports_timeout and backend.name not in _WARNED_NO_TIMEOUT:
+                logger.warning(f'Regex backend {backend.name} does not support timeouts: ignoring timeout.')
+                _WARNED_NO_TIMEOUT.add(backend.name)
+            try:
+                self._compiled = backend.compile(self.pattern, self.flags, timeout=timeout)
+            except backend.errors as e:
+                if backend.name == 're':
+                    raise
+                logger.debug(f'Unable to compile {self.pattern!r} with {backend.name}, using re instead: {e}')
+                self._compiled = re.compile(self.pattern, self.flags)
+        return self._compiled
+
+    def reset(self):
+        """Compile again on next use (e.g., after changing the default backend)"""
+        self._compiled = None
+
+    @property
+    def compiled(self):
+        return self._compiled or self.compile()
+
+    @property
+    def is_compiled(self):
+        return self._compiled is not None
+
+    def get_literal_filter(self) -> LiteralFilter:
+        """Required literals of this regex (extracted when first needed), or None"""
+        if self._literal_filter is False:
+            self._literal_filter = LiteralFilter.from_pattern(self.pattern, self.flags)
+        return self._literal_filter
+
+    @property
+    def groups(self):
+        return self.compiled.groups
+
+    @property
+    def groupindex(self):
+        return self.compiled.groupindex
+
+    def search(self, *args, **kwargs):
+        return self.compiled.search(*args, **kwargs)
+
+    def match(self, *args, **kwargs):
+        return self.compiled.match(*args, **kwargs)
+
+    def fullmatch(self, *args, **kwargs):
+        return self.compiled.fullmatch(*args, **kwargs)
+
+    def finditer(self, *args, **kwargs):
+        return self.compiled.finditer(*args, **kwargs)
+
+    def findall(self, *args, **kwargs):
+        return self.compiled.findall(*args, **kwargs)
+
+    def sub(self, *args, **kwargs):
+        return self.compiled.sub(*args, **kwargs)
+
+    def split(self, *args, **kwargs):
+        return self.compiled.split(*args, **kwargs)
+
+    def __getattr__(self, item):
+        return getattr(self.compiled, item)
+
+    def __repr__(self):
+        return f'LazyRegex({self.pattern!r}, {self.flags!r})'
+
+
+def compile_regex(pattern: str, flags=0, *, backend=None, timeout=None) -> LazyRegex:
+    """Get the shared (and not yet compiled) regex for this pattern and flags
+
+    :param backend: name of regex engine (see `runrex.algo.backend`); None: use the default
+    :param timeout: seconds after which a search raises `TimeoutError`; None: use the default
+    """
+    key = (pattern, int(flags), backend, timeout)
+    if (regex := _REGISTRY.get(key)) is None:
+        regex = LazyRegex(pattern, flags, backend=backend, timeout=timeout)
+        _REGISTRY[key] = regex
+    return regex
+
+
+def set_default_backend(backend='re', timeout=None):
+    """Set the regex engine and search timeout for all regexes which do not specify their own
+
+    Regexes using the default which have already been compiled will be recompiled on next use.
+
+    :param backend: name of regex engine (see `runrex.algo.backend`)
+    :param timeout: seconds after which a search is abandoned; requires a backend which
+        supports timeouts (e.g., 'regex')
+    """
+    get_backend(backend)  # ensure available
+    _DEFAULTS['backend'] = backend
+    _DEFAULTS['timeout'] = timeout
+    for regex in _REGISTRY.values():
+        if regex.backend is None or regex.timeout is None:
+            regex.reset()
+
+
+def precompile_all(*, literals=True) -> int:
+    """Compile all registered regexes now rather than when first used
+
+    :param literals: also extract required literals
+    :return: number of regexes newly compiled
+    """
+    count = 0
+    for regex in list(_REGISTRY.values()):
+        if not regex.is_compiled:
+            regex.compile()
+            count += 1
+        if literals:
+            regex.get_literal_filter()
+    return count
+
+
+def registry_size() -> int:
+    return len(_REGISTRY)
+
+
+def clear_registry():
+    """Forget all registered regexes (existing patterns keep their own references)"""
+    _REGISTRY.clear()
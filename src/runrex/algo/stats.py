@@ -0,0 +1,92 @@
+"""
+Opt-in collection of execution statistics for each `Pattern` (keyed by `Pattern.text`).
+
+Enable with `STATS.enable()` (or the `stats` option in `runrex.main.process`); when
+    disabled, patterns only check `STATS.enabled`.
+"""
+import csv
+import json
+
+FIELDS = ['pattern', 'calls', 'skipped', 'total_time', 'max_time', 'chars_scanned',
+          'candidates', 'matches', 'rejected_negation', 'rejected_requires']
+
+
+class PatternStats:
+    __slots__ = FIELDS
+
+    def __init__(self, pattern):
+        """
+        Statistics for a single pattern.
+
+        :param pattern: text of the pattern
+        """
+        self.pattern = pattern
+        self.calls = 0  # number of searches
+        self.skipped = 0  # searches avoided because required literals were absent
+        self.total_time = 0.0  # seconds
+        self.max_time = 0.0  # seconds for longest single search
+        self.chars_scanned = 0  # number of characters in searched texts
+        self.candidates = 0  # matches of the main regex
+        self.matches = 0  # candidates confirmed after checking negation/requires
+        self.rejected_negation = 0
+        self.rejected_requires = 0  # includes requires_all
+
+    def add_call(self, text, elapsed):
+        self.calls += 1
+        self.chars_scanned += len(text)
+        self.total_time += elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in FIELDS}
+
+
+class StatsCollector:
+
+    def __init__(self):
+        self.enabled = False
+        self.stats = {}  # pattern text -> PatternStats
+
+    def enable(self, reset=True):
+        if reset:
+            self.reset()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self.stats = {}
+
+    def get(self, pattern) -> PatternStats:
+        key = str(pattern)
+        if (stats := self.stats.get(key)) is None:
+            stats = PatternStats(key)
+            self.stats[key] = stats
+        return stats
+
+    def to_rows(self):
+        """Statistics for each pattern, slowest first"""
+        return [stats.to_dict() for stats in sorted(self.stats.values(), key=lambda x: -x.total_time)]
+
+    def write(self, path, kind=None, encoding='utf8'):
+        """Write report
+
+        :param path: output file
+        :param kind: 'json' or 'csv'; default: guess from path
+        :param encoding:
+        """
+        kind = kind or ('csv' if str(path).endswith('csv') else 'json')
+        with open(path, 'w', encoding=encoding, newline='') as out:
+            if kind == 'csv':
+                writer = csv.DictWriter(out, fieldnames=FIELDS)
+                writer.writeheader()
+                writer.writerows(self.to_rows())
+            elif kind == 'json':
+                json.dump(self.to_rows(), out, indent=2)
+            else:
+                raise ValueError(f'Unrecognized stats report kind: {kind}; expected "json" or "csv"')
+
+
+STATS = StatsCollector()
@@ -0,0 +1,129 @@
+import re
+from typing import Iterable
+
+from runrex.algo.literals import fold_text
+from runrex.algo.match import SpanMatch
+from runrex.algo.pattern import Pattern
+
+WORD = re.compile(r'\w+')
+_END = ''  # key marking the end of a term in the trie (tokens are never empty)
+
+
+class TermMatcher:
+    packable = True  # can be run over many texts packed together (see `runrex.text.batch`)
+    groups = 0
+    groupindex = {}
+
+    def __init__(self, terms: Iterable[str], *, ignorecase=True, max_gap=1):
+        """
+        Find exact terms (sequences of words) in text with a trie of word tokens; search time
+            depends on the length of the text and of the longest term, but not on the number of terms.
+
+        Matches are the leftmost and, from there, the longest term; like `re.finditer`,
+            matches do not overlap.
+
+        :param terms: terms, each split into words (`\\w+`) which must appear in the text
+            in the same order
+        :param ignorecase: case-insensitive matching
+        :param max_gap: maximum number of (non-word) characters between words of a term
+        """
+        self.ignorecase = ignorecase
+        self.casefolded = ignorecase  # search/finditer accept the case-folded text (`folded`)
+        self.max_gap = max_gap
+        self.flags = re.IGNORECASE if ignorecase else 0
+        self.trie = {}
+        self.size = 0
+        for term in terms:
+            tokens = WORD.findall(fold_text(term) if ignorecase else term)
+            if not tokens:
+                raise ValueError(f'Term does not contain any words: {term!r}')
+            node = self.trie
+            for token in tokens:
+                node = node.setdefault(token, {})
+            if _END not in node:
+                node[_END] = term
+                self.size += 1
+        self.pattern = f'TermSet({self.size} terms)'
+
+    def finditer(self, string, pos=0, endpos=None, *, folded=None):
+        endpos = len(string) if endpos is None else endpos
+        if not self.ignorecase:
+            folded = string
+        elif folded is None:
+            folded = fold_text(string)  # same length as string
+        tokens = [m.span() for m in WORD.finditer(folded, pos, endpos)]
+        i = 0
+        while i < len(tokens):
+            node = self.trie
+            longest = None
+            j = i
+            while j < len(tokens):
+                start, end = tokens[j]
+                if j > i and start - tokens[j - 1][1] > self.max_gap:
+                    break
+                if (node := node.get(folded[start:end])) is None:
+                    break
+                j += 1
+                if _END in node:
+                    longest = j
+            if longest:
+                yield SpanMatch(string, tokens[i][0], tokens[longest - 1][1], pos=pos, endpos=endpos)
+                i = longest
+            else:
+                i += 1
+
+    def search(self, string, pos=0, endpos=None, *, folded=None):
+        return next(self.finditer(string, pos, endpos, folded=folded), None)
+
+    def findall(self, string, pos=0, endpos=None):
+        return [m.group() for m in self.finditer(string, pos, endpos)]
+
+    def sub(self, repl, string, count=0):
+        result = []
+        prev = 0
+        for i, m in enumerate(self.finditer(string)):
+            if count and i >= count:
+                break
+            result.append(string[prev:m.start()])
+            result.append(repl(m) if callable(repl) else repl)
+            prev = m.end()
+        result.append(string[prev:])
+        return ''.join(result)
+
+    def compile(self):
+        return self
+
+    is_compiled = True
+
+    def get_literal_filter(self):
+        return None
+
+    def __len__(self):
+        return self.size
+
+
+class TermSet(Pattern):
+
+    def __init__(self, terms: Iterable[str], *, max_gap=1, **kwargs):
+        """
+        Look for any of a (large) vocabulary of exact terms, e.g., drug names or concept synonyms.
+
+        Behaves like `Pattern` (including negates/requires and `Match`/`Negation` results), and can be
+            used wherever a `Pattern` is accepted, but is backed by a trie of words rather than a regular
+            expression alternation, so that compile and search time do not grow with the number of terms.
+
+        Terms match on word boundaries. Words in the text may be separated by up to `max_gap`
+            non-word characters (e.g., 'side effect' matches 'side-effect'); all whitespace is
+            treated alike.
+
+        :param terms: e.g., ['aspirin', 'acetylsalicylic acid']
+        :param max_gap: maximum number of characters between words of a term
+        :param kwargs: as for `Pattern` (e.g., negates, requires, flags); IGNORECASE in `flags`
+            determines whether terms are case-sensitive
+        """
+        self._max_gap = max_gap
+        super().__init__(list(terms), **kwargs)
+
+    def _build_pattern(self, terms, flags, replace_whitespace, retain_groups):
+        matcher = TermMatcher(terms, ignorecase=bool(flags & re.IGNORECASE), max_gap=self._max_gap)
+        return matcher.pattern, matcher
@@ -0,0 +1,335 @@
+"""
+Find regular expressions which are prone to catastrophic backtracking, and time them
+    against generated adversarial strings.
+
+Risky constructs (found by walking the parsed regex):
+
+* nested quantifiers: an unbounded repeat containing another variable-length repeat which is
+    not separated from the next iteration by a distinct delimiter, e.g., `(\\w+\\W?)+` (exponential)
+* overlapping alternation under a repeat: branches which can start with the same character,
+    e.g., `(\\w+|\\d+)*` (exponential)
+* adjacent overlapping quantifiers: repeats separated only by optional items which can consume
+    the same characters, e.g., `\\w*\\W?\\w*` (as produced by `replace_whitespace` joins);
+    polynomial, with degree equal to the number of stacked repeats
+"""
+import math
+import re
+import string
+import time
+from typing import List, Optional
+
+try:
+    from re import _parser as sre_parse  # python 3.11+
+except ImportError:
+    import sre_parse
+
+NESTED = 'nested quantifiers'
+ALTERNATION = 'overlapping alternation under repeat'
+ADJACENT = 'adjacent overlapping quantifiers'
+
+# characters used to approximate which characters each part of a regex can match
+ALPHABET = string.ascii_letters + string.digits + string.punctuation + ' \t\n'
+MAX_BOUNDED_REPEAT = 10  # repeats with a larger upper bound are treated as unbounded
+SUFFIXES = ['!', '\x00', ' ', '1', 'a', '\n']  # tried to make the adversarial string fail
+_ZERO_WIDTH = {sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT}
+_REPEATS = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT}  # may backtrack
+_ATOMIC_GROUP = getattr(sre_parse, 'ATOMIC_GROUP', None)  # python 3.11+
+_ALL_REPEATS = _REPEATS | {getattr(sre_parse, 'POSSESSIVE_REPEAT', None)} - {None}
+_CATEGORIES = {
+    sre_parse.CATEGORY_DIGIT: str.isdecimal,
+    sre_parse.CATEGORY_NOT_DIGIT: lambda c: not c.isdecimal(),
+    sre_parse.CATEGORY_SPACE: str.isspace,
+    sre_parse.CATEGORY_NOT_SPACE: lambda c: not c.isspace(),
+    sre_parse.CATEGORY_WORD: lambda c: c.isalnum() or c == '_',
+    sre_parse.CATEGORY_NOT_WORD: lambda c: not (c.isalnum() or c == '_'),
+}
+
+
+class Finding:
+
+    def __init__(self, kind, prefix, pump, degree=None):
+        """
+        A risky construct within a regex.
+
+        :param kind: NESTED, ALTERNATION, or ADJACENT
+        :param prefix: string which leads the regex up to the risky part
+        :param pump: string which, repeated, makes the risky part backtrack
+        :param degree: for ADJACENT, number of stacked repeats (i.e., expected polynomial degree)
+        """
+        self.kind = kind
+        self.prefix = prefix
+        self.pump = pump
+        self.degree = degree
+
+    @property
+    def is_exponential(self):
+        return self.kind != ADJACENT
+
+    def __str__(self):
+        degree = f' (degree {self.degree})' if self.degree else ''
+        return f'{self.kind}{degree}: {self.prefix!r} + {self.pump!r} * n'
+
+    def __repr__(self):
+        return f'Finding({self})'
+
+
+class RegexAnalyzer:
+
+    def __init__(self, pattern: str, flags=0):
+        """
+        Statically analyze a regex for constructs prone to catastrophic backtracking.
+
+        :param pattern: regular expression (uncompiled string)
+        :param flags:
+        """
+        self.pattern = pattern
+        self.flags = int(flags)
+        self.ignorecase = bool(self.flags & re.IGNORECASE)
+        self.findings = []
+        self._covered = set()  # (id of sequence, index) of repeats already reported as ADJACENT
+        self._walk(list(sre_parse.parse(pattern, flags)), '')
+
+    def _single(self, op, av) -> Optional[frozenset]:
+        """Characters (from ALPHABET) matched by a single-character item, else None"""
+        if op is sre_parse.LITERAL:
+            chars = {chr(av)}
+        elif op is sre_parse.NOT_LITERAL:
+            chars = set(ALPHABET) - {chr(av)}
+        elif op is sre_parse.ANY:
+            chars = set(ALPHABET) if self.flags & re.DOTALL else set(ALPHABET) - {'\n'}
+        elif op is sre_parse.IN:
+            negate = False
+            chars = set()
+            for sop, sav in av:
+                if sop is sre_parse.NEGATE:
+                    negate = True
+                elif sop is sre_parse.LITERAL:
+                    chars.add(chr(sav))
+                elif sop is sre_parse.RANGE:
+                    chars |= {c for c in ALPHABET if sav[0] <= ord(c) <= sav[1]}
+                elif sop is sre_parse.CATEGORY:
+                    chars |= {c for c in ALPHABET if _CATEGORIES.get(sav, lambda c: True)(c)}
+            if negate:
+                chars = set(ALPHABET) - chars
+        else:
+            return None
+        if self.ignorecase:
+            chars |= {c.swapcase() for c in chars if len(c.swapcase()) == 1}
+        return frozenset(chars)
+
+    def _chars(self, items) -> frozenset:
+        """All characters which may be consumed anywhere in the sequence"""
+        chars = set()
+        for op, av in items:
+            if (single := self._single(op, av)) is not None:
+                chars |= single
+            elif op is sre_parse.SUBPATTERN:
+                chars |= self._chars(av[3])
+            elif op is sre_parse.BRANCH:
+                for branch in av[1]:
+                    chars |= self._chars(branch)
+            elif op in _ALL_REPEATS:
+                chars |= self._chars(av[2])
+            elif op is _ATOMIC_GROUP:
+                chars |= self._chars(av)
+            elif op not in _ZERO_WIDTH:  # e.g., backreference: unknown
+                chars |= set(ALPHABET)
+        return frozenset(chars)
+
+    def _first(self, items) -> frozenset:
+        """Characters with which a match of the sequence may start"""
+        chars = set()
+        for op, av in items:
+            if (single := self._single(op, av)) is not None:
+                return frozenset(chars | single)
+            if op is sre_parse.SUBPATTERN:
+                chars |= self._first(av[3])
+            elif op is sre_parse.BRANCH:
+                for branch in av[1]:
+                    chars |= self._first(branch)
+            elif op in _ALL_REPEATS:
+                chars |= self._first(av[2])
+            elif op is _ATOMIC_GROUP:
+                chars |= self._first(av)
+            elif op not in _ZERO_WIDTH:
+                chars |= set(ALPHABET)
+            if not self._nullable([(op, av)]):
+                break
+        return frozenset(chars)
+
+    def _nullable(self, items) -> bool:
+        """Can the sequence match the empty string?"""
+        for op, av in items:
+            if op in _ZERO_WIDTH:
+                continue
+            if op is sre_parse.SUBPATTERN:
+                if not self._nullable(av[3]):
+                    return False
+            elif op is sre_parse.BRANCH:
+                if not any(self._nullable(branch) for branch in av[1]):
+                    return False
+            elif op in _ALL_REPEATS:
+                if av[0] > 0 and not self._nullable(av[2]):
+                    return False
+            elif op is _ATOMIC_GROUP:
+                if not self._nullable(av):
+                    return False
+            elif op is not sre_parse.GROUPREF:
+                return False
+        return True
+
+    def _example(self, items) -> str:
+        """A short string matching the sequence (lookarounds/anchors are ignored)"""
+        result = []
+        for op, av in items:
+            if (single := self._single(op, av)) is not None:
+                result.append(_pick(single))
+            elif op is sre_parse.SUBPATTERN:
+                result.append(self._example(av[3]))
+            elif op is sre_parse.BRANCH:
+                result.append(self._example(av[1][0]))
+            elif op in _ALL_REPEATS:
+                result.append(self._example(av[2]) * av[0])
+            elif op is _ATOMIC_GROUP:
+                result.append(self._example(av))
+        return ''.join(result)
+
+    def _is_variable_repeat(self, op, av):
+        """A backtracking repeat which can consume a variable number (more than one) of iterations"""
+        return op in _REPEATS and av[0] != av[1] and av[1] > 1 and not self._nullable(av[2])
+
+    def _walk(self, items, prefix):
+        """Look for risky constructs; `prefix` is a string leading the regex up to these items
+
+        Atomic groups and possessive repeats never backtrack into themselves, so are skipped.
+        """
+        for i, (op, av) in enumerate(items):
+            if op in _REPEATS:
+                body = list(av[2])
+                if av[1] > MAX_BOUNDED_REPEAT:
+                    self._check_nested(body, prefix)
+                    self._check_alternation(body, prefix)
+                self._walk(body, prefix)
+            elif op is sre_parse.SUBPATTERN:
+                self._walk(list(av[3]), prefix)
+            elif op is sre_parse.BRANCH:
+                for branch in av[1]:
+                    self._walk(list(branch), prefix)
+            elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+                self._walk(list(av[1]), prefix)
+            if self._is_variable_repeat(op, av):
+                self._check_adjacent(items, i, prefix)
+            prefix += self._example([(op, av)])
+
+    def _inline(self, items):
+        """Flatten non-capturing/capturing groups so that their items can be compared with neighbours"""
+        result = []
+        for op, av in items:
+            if op is sre_parse.SUBPATTERN:
+                result.extend(self._inline(av[3]))
+            else:
+                result.append((op, av))
+        return result
+
+    def _check_nested(self, body, prefix):
+        body = self._inline(body)
+        for k, (op, av) in enumerate(body):
+            if not self._is_variable_repeat(op, av):
+                continue
+            inner_chars = self._chars(av[2])
+            follow = body[k + 1:]
+            if not self._nullable(follow) and not (self._first(follow) & inner_chars):
+                continue  # delimited: each iteration must end with something the inner repeat cannot consume
+            overlap = inner_chars & (self._first(follow) | self._first(body))
+            if overlap:
+                self.findings.append(Finding(NESTED, prefix, _pick(overlap)))
+                return
+
+    def _check_alternation(self, body, prefix):
+        body = self._inline(body)
+        for op, av in body:
+            if op is not sre_parse.BRANCH:
+                continue
+            firsts = [self._first(branch) for branch in av[1]]
+            for i in range(len(firsts)):
+                for j in range(i + 1, len(firsts)):
+                    if overlap := firsts[i] & firsts[j]:
+                        # repeating a character both branches accept
+                        self.findings.append(Finding(ALTERNATION, prefix, _pick(overlap)))
+                        return
+
+    def _check_adjacent(self, items, i, prefix):
+        """Count repeats following items[i], separated only by optional items, sharing characters"""
+        if (id(items), i) in self._covered:
+            return
+        shared = self._chars(items[i][1][2])
+        chain = [i]
+        for j in range(i + 1, len(items)):
+            op, av = items[j]
+            if self._is_variable_repeat(op, av):
+                if not (overlap := shared & self._chars(av[2])):
+                    break
+                shared = overlap
+                chain.append(j)
+            elif not self._nullable([items[j]]):
+                break
+        if len(chain) > 1:
+            self._covered |= {(id(items), j) for j in chain}
+            self.findings.append(Finding(ADJACENT, prefix, _pick(shared), degree=len(chain)))
+
+
+def _pick(chars) -> str:
+    """Choose a representative character, preferring letters"""
+    for group in (string.ascii_lowercase, string.ascii_uppercase, string.digits, ALPHABET):
+        for c in group:
+            if c in chars:
+                return c
+    return next(iter(chars), 'a')
+
+
+def analyze_regex(pattern: str, flags=0) -> List[Finding]:
+    """Return risky constructs in the regex (empty if none found)"""
+    try:
+        return RegexAnalyzer(pattern, flags).findings
+    except (re.error, TypeError, RecursionError):
+        return []
+
+
+def time_search(regex, text) -> float:
+    start = time.perf_counter()
+    regex.search(text)
+    return time.perf_counter() - start
+
+
+def growth_curve(pattern: str, flags, finding: Finding, *, max_seconds=1.0, max_steps=12):
+    """Time the regex against adversarial strings of increasing length
+
+    Sizes increase linearly for exponential findings and geometrically for polynomial findings,
+        stopping once a single search takes longer than `max_seconds`.
+
+    :return: (suffix, list of (size, seconds))
+    """
+    regex = re.compile(pattern, flags)
+    probe = 12 if finding.is_exponential else 256
+    suffix = max(SUFFIXES, key=lambda s: time_search(regex, finding.prefix + finding.pump * probe + s))
+    curve = []
+    size = 4 if finding.is_exponential else 128
+    for _ in range(max_steps):
+        elapsed = time_search(regex, finding.prefix + finding.pump * size + suffix)
+        curve.append((size, elapsed))
+        if elapsed > max_seconds:
+            break
+        size = size + 4 if finding.is_exponential else size * 2
+    return suffix, curve
+
+
+def estimate_growth(curve) -> str:
+    """Describe the growth of search time over the last points of the curve"""
+    points = [(n, t) for n, t in curve if t > 1e-4]
+    if len(points) < 2:
+        return 'negligible'
+    (n1, t1), (n2, t2) = points[-2], points[-1]
+    slope = math.log(t2 / t1) / math.log(n2 / n1)
+    if slope > 4:
+        return f'exponential (x{t2 / t1:.1f} from n={n1} to n={n2})'
+    return f'polynomial (degree ~{slope:.1f})'
@@ -0,0 +1,119 @@
+"""
+Find `Pattern`s (in the specified modules) prone to catastrophic backtracking, and time each
+    risky regex against adversarial strings of increasing length.
+
+Example: `python -m runrex.cli.analyze_backtracking -m myproject.patterns -o backtracking.md`
+"""
+import argparse
+import importlib
+from collections import defaultdict
+
+from runrex.algo.pattern import Pattern
+from runrex.algo.patternset import PatternSet
+from runrex.anlz.backtracking import analyze_regex, growth_curve, estimate_growth
+from runrex.io.utils import open_all
+
+
+def iter_patterns(obj, label, seen=None):
+    """Find all `Pattern`s in obj, including inside containers (lists, dicts, `PatternSet`s, etc.)
+
+    :return: iterator of (label, Pattern)
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return
+    seen.add(id(obj))
+    if isinstance(obj, Pattern):
+        yield label, obj
+    elif isinstance(obj, PatternSet):
+        for i, pat in enumerate(obj):
+            yield from iter_patterns(pat, f'{label}[{i}]', seen)
+    elif isinstance(obj, dict):
+        for key, value in obj.items():
+            yield from iter_patterns(value, f'{label}[{key!r}]', seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for i, value in enumerate(obj):
+            yield from iter_patterns(value, f'{label}[{i}]', seen)
+
+
+def iter_regexes(pattern: Pattern):
+    """All regexes used by the pattern: main regex and negation/requires context
+
+    :return: iterator of (role, LazyRegex)
+    """
+    yield 'pattern', pattern.pattern
+    for regex, direction in pattern.negates:
+        yield f'negates ({direction.name.lower()})', regex
+    for regex, direction in pattern.requires:
+        yield f'requires ({direction.name.lower()})', regex
+    for regex in pattern.requires_all:
+        yield 'requires_all', regex
+
+
+def collect_regexes(modules):
+    """Collect the distinct regexes used by all `Pattern`s defined in the modules
+
+    :param modules: names of modules to import
+    :return: dict of (regex, flags) -> list of labels describing where it was used
+    """
+    regexes = defaultdict(list)
+    for module_name in modules:
+        module = importlib.import_module(module_name)
+        seen = set()
+        for name, value in vars(module).items():
+            for label, pattern in iter_patterns(value, f'{module_name}.{name}', seen):
+                for role, regex in iter_regexes(pattern):
+                    regexes[(regex.pattern, regex.flags)].append(f'{label} {role}')
+    return regexes
+
+
+def analyze_backtracking(modules, outpath=None, *, max_seconds=1.0, benchmark=True, encoding='utf8'):
+    """Write markdown report of regexes prone to catastrophic backtracking
+
+    :param modules: names of modules containing `Pattern`s
+    :param outpath: output markdown file; default to stdout
+    :param max_seconds: stop lengthening adversarial strings once a search takes this long
+    :param benchmark: time regexes against adversarial strings (otherwise only static analysis)
+    :return: list of (regex, flags, labels, findings) for each flagged regex
+    """
+    flagged = []
+    for (regex, flags), labels in collect_regexes(modules).items():
+        if findings := analyze_regex(regex, flags):
+            flagged.append((regex, flags, labels, findings))
+    with open_all(outpath, 'w', encoding=encoding) as out:
+        out.write(f'# Backtracking Risk\n\n{len(flagged)} regexes flagged\n')
+        for regex, flags, labels, findings in flagged:
+            out.write(f'\n## `{regex}`\n\n')
+            for label in labels:
+                out.write(f'* {label}\n')
+            for finding in findings:
+                out.write(f'\n### {finding}\n\n')
+                if not benchmark:
+                    continue
+                suffix, curve = growth_curve(regex, flags, finding, max_seconds=max_seconds)
+                out.write(f'Adversarial suffix: {suffix!r}; growth: {estimate_growth(curve)}\n\n')
+                out.write('| n | seconds |\n|---|---|\n')
+                for size, elapsed in curve:
+                    out.write(f'| {size} | {elapsed:.6f} |\n')
+    return flagged
+
+
+def analyze_backtracking_cli():
+    parser = argparse.ArgumentParser(fromfile_prefix_chars='@')
+    parser.add_argument('-m', '--modules', nargs='+', required=True,
+                        help='Importable modules containing Patterns (e.g., myproject.patterns)')
+    parser.add_argument('-o', '--outpath', default=None,
+                        help='Output markdown file to write to; default to stdout')
+    parser.add_argument('--max-seconds', default=1.0, type=float, dest='max_seconds',
+                        help='Stop lengthening adversarial strings once a single search takes this long')
+    parser.add_argument('--no-benchmark', action='store_false', dest='benchmark',
+                        help='Only report risky constructs, without timing them')
+    parser.add_argument('--encoding', default='utf8',
+                        help='Encoding of output markdown file')
+    args = parser.parse_args()
+    analyze_backtracking(args.modules, args.outpath, max_seconds=args.max_seconds,
+                         benchmark=args.benchmark, encoding=args.encoding)
+
+
+if __name__ == '__main__':
+    analyze_backtracking_cli()
@@ -0,0 +1,145 @@
+"""
+Compare sentence splitters: throughput, and agreement of sentence boundaries with a reference splitter.
+
+Splitters differ in how they treat whitespace (e.g., `syntok_ssplit` re-joins tokens with single
+    spaces), so boundaries are compared as the number of non-whitespace characters preceding
+    each sentence.
+
+Example: `python -m runrex.cli.benchmark_ssplit -i notes/ -o ssplit.md`
+"""
+import argparse
+import pathlib
+import time
+
+from runrex.io.utils import open_all
+from runrex.text import ssplit as ssplit_module
+
+SPLITTERS = ['fast_ssplit', 'regex_ssplit', 'delim_ssplit', 'syntok_ssplit']
+SAMPLE_TEXT = (
+    'Pt is a 45 yo male seen by Dr. Smith on Jan. 5. He reports back pain, approx. three wks.\n'
+    'No chest pain. Takes ibuprofen 200 mg p.o. b.i.d. for pain!\n'
+    'Will follow up in 2 wks.\n\n'
+    'PLAN: rest and ice.\n'
+    '- Return if worse.\n'
+    '1. MRI of the lumbar spine.\n'
+)
+
+
+def get_splitters(names=None) -> dict:
+    """Available splitters by name (`syntok_ssplit` requires syntok)"""
+    splitters = {}
+    for name in names or SPLITTERS:
+        if name == 'syntok_ssplit' and not ssplit_module.syntok_segmenter:
+            continue
+        splitters[name] = getattr(ssplit_module, name)
+    return splitters
+
+
+def sentence_boundaries(sentences) -> set:
+    """Boundaries between sentences, as the number of non-whitespace characters preceding each sentence
+
+    :param sentences: sentence texts, in order
+    """
+    boundaries = set()
+    count = 0
+    for sentence in sentences:
+        if count:
+            boundaries.add(count)
+        count += len(''.join(sentence.split()))
+    boundaries.discard(count)  # trailing empty sentences
+    return boundaries
+
+
+def compare_boundaries(found: set, reference: set) -> dict:
+    matched = len(found & reference)
+    precision = matched / len(found) if found else 1.0
+    recall = matched / len(reference) if reference else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {'precision': precision, 'recall': recall, 'f1': f1}
+
+
+def iter_texts(paths, encoding='utf8'):
+    for path in paths:
+        path = pathlib.Path(path)
+        for file in sorted(path.rglob('*.txt')) if path.is_dir() else [path]:
+            with open(file, encoding=encoding) as fh:
+                yield fh.read()
+
+
+def benchmark_ssplit(texts, splitters: dict = None, reference=None, repeat=1) -> list:
+    """Time each splitter over the texts and compare its boundaries with the reference
+
+    :param texts: list of texts
+    :param splitters: name -> splitter; default: all available splitters
+    :param reference: name of reference splitter; default: syntok_ssplit (if available),
+        else the first splitter
+    :param repeat: number of times to split each text (for timing)
+    :return: list of dicts (one per splitter): name, seconds, chars_per_second, sentences,
+        precision, recall, f1
+    """
+    splitters = splitters or get_splitters()
+    if reference is None:
+        reference = 'syntok_ssplit' if 'syntok_ssplit' in splitters else next(iter(splitters))
+    n_chars = sum(len(text) for text in texts) * repeat
+    boundaries = {}
+    rows = []
+    for name, splitter in splitters.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            results = [[sentence for sentence, _, _ in splitter(text)] for text in texts]
+        elapsed = time.perf_counter() - start
+        boundaries[name] = [sentence_boundaries(sentences) for sentences in results]
+        rows.append({
+            'name': name,
+            'seconds': elapsed,
+            'chars_per_second': n_chars / elapsed if elapsed else float('inf'),
+            'sentences': sum(len(sentences) for sentences in results),
+        })
+    for row in rows:
+        found = set()
+        expected = set()
+        for i, (doc_found, doc_expected) in enumerate(zip(boundaries[row['name']], boundaries[reference])):
+            found |= {(i, b) for b in doc_found}
+            expected |= {(i, b) for b in doc_expected}
+        row.update(compare_boundaries(found, expected))
+    return rows
+
+
+def write_report(rows, reference, outpath=None, encoding='utf8'):
+    with open_all(outpath, 'w', encoding=encoding) as out:
+        out.write(f'# Sentence Splitters\n\nBoundary agreement with `{reference}`.\n\n')
+        out.write('| Splitter | Seconds | Chars/sec | Sentences | Precision | Recall | F1 |\n')
+        out.write('|---|---:|---:|---:|---:|---:|---:|\n')
+        for row in rows:
+            out.write(f'| {row["name"]} | {row["seconds"]:.3f} | {row["chars_per_second"]:,.0f} | {row["sentences"]}'
+                      f' | {row["precision"]:.3f} | {row["recall"]:.3f} | {row["f1"]:.3f} |\n')
+
+
+def benchmark_ssplit_cli():
+    parser = argparse.ArgumentParser(fromfile_prefix_chars='@')
+    parser.add_argument('-i', '--inputs', nargs='*', default=None,
+                        help='Text files, or directories of .txt files; default: a built-in sample')
+    parser.add_argument('-o', '--outpath', default=None,
+                        help='Output markdown file to write to; default to stdout')
+    parser.add_argument('-s', '--splitters', nargs='+', default=None, choices=SPLITTERS,
+                        help='Splitters to compare; default: all available')
+    parser.add_argument('-r', '--reference', default=None, choices=SPLITTERS,
+                        help='Splitter to compare boundaries against; default: syntok_ssplit if available')
+    parser.add_argument('--repeat', default=1, type=int,
+                        help='Number of times to split each text')
+    parser.add_argument('--encoding', default='utf8',
+                        help='Encoding of input text files and output markdown file')
+    args = parser.parse_args()
+    texts = list(iter_texts(args.inputs, args.encoding)) if args.inputs else [SAMPLE_TEXT] * 1000
+    splitters = get_splitters(args.splitters)
+    if args.reference and args.reference not in splitters:
+        splitters.update(get_splitters([args.reference]))
+    if missing := [name for name in [*(args.splitters or []), args.reference] if name and name not in splitters]:
+        parser.error(f'Unavailable splitter (install syntok for syntok_ssplit): {", ".join(missing)}')
+    reference = args.reference or ('syntok_ssplit' if 'syntok_ssplit' in splitters else next(iter(splitters)))
+    rows = benchmark_ssplit(texts, splitters, reference, repeat=args.repeat)
+    write_report(rows, reference, args.outpath, encoding=args.encoding)
+
+
+if __name__ == '__main__':
+    benchmark_ssplit_cli()
@@ -3,18 +3,21 @@ import itertools
 import os
 
 from runrex.io import sqlai
+from runrex.text.batch import iter_batches
 from runrex.text.document import Document
+from runrex.text.preprocess import Preprocessor
+from runrex.text.streaming import StreamingDocument
 
 
 def get_next_from_directory(directory, directories, version=None, filenames=None,
-                            encoding='utf8'):
+                            encoding='utf8', stream_size=None):
     if directory or directories:
         directories = directories or []
         if directory:
             directories.insert(0, directory)
         for directory in directories:
             if os.path.isdir(directory):
-                yield from _get_next_from_directory(directory, encoding, filenames, version)
+                yield from _get_next_from_directory(directory, encoding, filenames, version, stream_size)
             else:  # is file (e.g., CSV)
                 for doc_name, text in _get_next_from_file(directory, encoding):
                     yield doc_name, None, text
@@ -29,7 +32,8 @@ def _get_next_from_file(file, name_col='doc_id', text_col='text_col', encoding='
         raise ValueError(f'Unrecognized file type (expected CSV): {file}')
 
 
-def _get_next_from_directory(directory, encoding, filenames, version):
+def _get_next_from_directory(directory, encoding, filenames, version, stream_size=None):
+    """Yield (doc_name, path, text): path (rather than text) for files of at least `stream_size` bytes"""
     if version:
         corpus_dir = os.path.join(directory, version)
     else:
@@ -38,18 +42,24 @@ def _get_next_from_directory(directory, encoding, filenames, version):
         for file in filenames:
             fp = os.path.join(corpus_dir, file)
             try:
-                with open(fp, encoding=encoding) as fh:
-                    text = fh.read()
+                if stream_size and os.path.getsize(fp) >= stream_size:
+                    text = None
+                else:
+                    with open(fp, encoding=encoding) as fh:
+                        text = fh.read()
             except FileNotFoundError:
                 continue
             else:
-                yield '.'.join(file.split('.')[:-1]) or file, None, text
+                yield '.'.join(file.split('.')[:-1]) or file, None if text is not None else fp, text
     else:
         for entry in os.scandir(corpus_dir):
             if '.' in entry.name:
                 doc_name = '.'.join(entry.name.split('.')[:-1])
             else:
                 doc_name = entry.name
+            if stream_size and entry.stat().st_size >= stream_size:
+                yield doc_name, entry.path, None
+                continue
             with open(entry.path, encoding=encoding) as fh:
                 text = fh.read()
             if not text:
@@ -83,9 +93,22 @@ def get_next_from_sql(name=None, driver=None, server=None,
 
 def get_next_from_corpus(directory=None, directories=None, version=None,
                          connections=None, skipper=None, start=0, end=None,
-                         filenames=None, encoding='utf8', ssplit=None):
+                         filenames=None, encoding='utf8', ssplit=None, batch_size=None,
+                         scan_document=False, memo=False, preprocess=None, stream_size=None):
     """
 
+    :param batch_size: if set, documents are read in micro-batches of this many documents, and
+        each pattern is searched once per batch (see `runrex.text.batch.DocumentBatch`)
+    :param scan_document: search each pattern once over each document's text rather than once
+        per sentence (see `runrex.text.scan.DocumentScan`)
+    :param memo: each document remembers search results, so that algorithms repeating a search
+        (same `Pattern` and options) on the same sentence only record the result (see `Document`)
+    :param preprocess: dict of options for cleaning each document's text (see
+        `runrex.text.preprocess.Preprocessor`); default: remove history section and join headers
+    :param stream_size: files (in a directory) of at least this many bytes are read in chunks as
+        they are searched rather than all at once (see `runrex.text.streaming.StreamingDocument`,
+        which has the search methods of `Document` but always searches by sentence); these are
+        not batched, scanned, or memoised
     :param ssplit: sentence splitting function
     :param filenames:
     :param encoding:
@@ -98,9 +121,22 @@ def get_next_from_corpus(directory=None, directories=None, version=None,
     :param end:
     :return: iterator yielding documents
     """
+    documents = _get_next_from_corpus(directory, directories, version, connections, skipper,
+                                      start, end, filenames, encoding, ssplit, scan_document, memo,
+                                      Preprocessor(**preprocess) if preprocess else None, stream_size)
+    if batch_size:
+        for batch in iter_batches(documents, batch_size):
+            yield from batch
+    else:
+        yield from documents
+
+
+def _get_next_from_corpus(directory, directories, version, connections, skipper,
+                          start, end, filenames, encoding, ssplit, scan_document, memo, preprocessor,
+                          stream_size=None):
     i = -1
     for doc_name, path, text in itertools.chain(
-            get_next_from_directory(directory, directories, version, filenames, encoding),
+            get_next_from_directory(directory, directories, version, filenames, encoding, stream_size),
             get_next_from_connections(*connections or list())
     ):
         if skipper and doc_name in skipper:
@@ -112,7 +148,12 @@ def get_next_from_corpus(directory=None, directories=None, version=None,
             break
         if not text and not path:  # one of these required
             continue
-        yield Document(doc_name, file=path, text=text, ssplit=ssplit)
+        if stream_size and not text:
+            yield StreamingDocument(doc_name, file=path, encoding=encoding, ssplit=ssplit,
+                                    preprocessor=preprocessor)
+            continue
+        yield Document(doc_name, file=path, text=text, ssplit=ssplit, scan_document=scan_document,
+                       memo=memo, preprocessor=preprocessor)
 
 
 class Skipper:
@@ -1,11 +1,15 @@
 import logging
 from collections import defaultdict
 
+from runrex.algo.cache import PATTERN_CACHE
+from runrex.algo.registry import set_default_backend
+from runrex.algo.stats import STATS
 from runrex.io.corpus import get_next_from_corpus, Skipper
 from runrex.io.formatter import format_data_as_dict
 from runrex.io.out import get_file_wrapper, get_logging
 from runrex.io.report import Reporter
 from runrex.schema import validate_config
+from runrex.text.ssplit_cache import SSPLIT_CACHE
 from runrex.util import kw
 
 
@@ -27,7 +31,8 @@ def parse_annotation_files(*configs, data=None):
 
 
 def process(corpus=None, annotation=None, annotations=None, output=None, select=None,
-            algorithms=None, loginfo=None, skipinfo=None, logger=None, ssplit=None):
+            algorithms=None, loginfo=None, skipinfo=None, logger=None, ssplit=None, regex=None,
+            stats=None, cache=None, ssplit_cache=None):
     """
 
     :param corpus:
@@ -39,6 +44,13 @@ def process(corpus=None, annotation=None, annotations=None, output=None, select=
     :param loginfo:
     :param skipinfo:
     :param logger:
+    :param regex: dict with default regex `backend` (e.g., 're', 'regex', 're2') and search `timeout`
+    :param stats: dict with `file` (and optionally `kind`: 'json' or 'csv') to which a report
+        of per-pattern execution statistics is written once all documents have been processed
+    :param cache: dict with `maxsize` (number of results) to cache results of patterns on repeated
+        sentences (see `runrex.algo.cache`)
+    :param ssplit_cache: dict with `directory` (and optionally `max_mb`) in which to keep sentence
+        boundaries between runs (see `runrex.text.ssplit_cache`)
     :return:
     """
     if logger and not logger['verbose']:
@@ -49,6 +61,14 @@ def process(corpus=None, annotation=None, annotations=None, output=None, select=
     truth = parse_annotation_files(*annotations or list(), data=truth)
     if not algorithms:
         raise ValueError('No algorithms specified!')
+    if regex:
+        set_default_backend(**regex)
+    if stats:
+        STATS.enable()
+    if cache is not None:
+        PATTERN_CACHE.enable(**cache)
+    if ssplit_cache:
+        SSPLIT_CACHE.enable(ssplit_cache['directory'], max_bytes=int(ssplit_cache.get('max_mb', 512) * 1024 * 1024))
     results = {name: Reporter() for name in algorithms}
     number_id = 0
     with get_file_wrapper(**output) as out, \
@@ -75,7 +95,18 @@ def process(corpus=None, annotation=None, annotations=None, output=None, select=
                         results[alg_name].update(max_res)
                         if max_res.expected is not None:
                             logging.info(f'Validation for {doc.name}: {results}')
+            doc.clear_memo()  # done with this document
     logging.warning(f'Final results: {results}')
+    if cache is not None:
+        PATTERN_CACHE.disable()
+        logging.info(f'Pattern cache: {PATTERN_CACHE.info()}')
+    if ssplit_cache:
+        SSPLIT_CACHE.disable()
+        logging.info(f'Sentence cache: {SSPLIT_CACHE.info()}')
+    if stats:
+        STATS.disable()
+        STATS.write(stats['file'], kind=stats.get('kind'), encoding=stats.get('encoding', 'utf8'))
+        logging.info(f'Pattern statistics written to: {stats["file"]}')
 
 
 def main(config_file):
@@ -18,6 +18,19 @@ JSON_SCHEMA = {
                     'items': {'type': 'string'}
                 },
                 'version': {'type': 'string'},  # text or lemma
+                'batch_size': {'type': 'integer'},  # number of documents to search at once
+                'scan_document': {'type': 'boolean'},  # search each pattern once per document
+                'memo': {'type': 'boolean'},  # remember search results for all algorithms on a document
+                'stream_size': {'type': 'integer'},  # read files of at least this many bytes in chunks
+                'preprocess': {  # cleaning of each document's text before sentence splitting
+                    'type': 'object',
+                    'properties': {
+                        'remove_history': {'type': 'boolean'},
+                        'join_headers': {'type': 'boolean'},
+                        'history_header': {'type': 'string'},
+                        'max_history': {'type': 'integer'},
+                    }
+                },
                 'connections': {
                     'type': 'array',
                     'items': {
@@ -104,6 +117,34 @@ JSON_SCHEMA = {
             'properties': {
                 'verbose': {'type': 'boolean'}
             }
+        },
+        'regex': {
+            'type': 'object',
+            'properties': {
+                'backend': {'type': 'string'},  # re, regex, re2
+                'timeout': {'type': 'number'},  # seconds
+            }
+        },
+        'stats': {
+            'type': 'object',
+            'properties': {
+                'file': {'type': 'string'},
+                'kind': {'type': 'string'},  # json, csv
+                'encoding': {'type': 'string'},
+            }
+        },
+        'cache': {
+            'type': 'object',
+            'properties': {
+                'maxsize': {'type': 'integer'},  # number of results
+            }
+        },
+        'ssplit_cache': {
+            'type': 'object',
+            'properties': {
+                'directory': {'type': 'string'},
+                'max_mb': {'type': 'number'},
+            }
         }
     }
 }
@@ -17,11 +17,11 @@ safe_may = r'(?<!in|st|ce) may (?!\d)'
 # useful starting phrases for detecting negation, etc.
 boilerplate = r'\b(pamphlet|warning|information|review|side effect|counsel|\bsign|ensure' \
               r'|risk|\bif\b|after your visit|appt|appointment|due (to|for|at)|recommend' \
-              r'|pamphlet|schedul|doctor|contact|\bhow\b|\bcall|includ|failure|' \
+              r'|schedul|doctor|contact|\bhow\b|\bcall|includ|failure|' \
               r'associated|avoid|instruct|guideline)'
 possible = r'\b(unlikely|\bposs\b|possib(ly|le|ility)|improbable|potential|susp(ect|icious)|' \
            r'chance|may\b|afraid|concern|tentative|doubt|thought|think)'
-POSSIBLE_PAT = Pattern(possible)
+POSSIBLE_PAT = Pattern(possible, optimize=True)
 
 negation = r'(no evidence|without|r/o|rule out|normal|\bnot?\b|\bor\b|denies|negative for)'
 historical = r'(history|previous|\bhx\b|\bpast\b|\bprior\b|\bh/o\b)'
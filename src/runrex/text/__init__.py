@@ -3,3 +3,4 @@ from .sentences import Sentences
 from .section import Section
 from .sections import Sections
 from .document import Document
+from .streaming import StreamingDocument
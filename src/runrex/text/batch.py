@@ -0,0 +1,102 @@
+import re
+from typing import Iterable, Iterator, Tuple
+
+from runrex.algo import Pattern
+from runrex.text.document import Document
+from runrex.text.scan import PackedSearch, is_packable  # noqa: F401
+from runrex.text.sentence import Sentence
+from runrex.text.streaming import StreamingDocument
+from runrex.text.ssplit import default_ssplit
+
+
+class DocumentBatch(PackedSearch):
+
+    def __init__(self, documents: Iterable, *, ssplit=default_ssplit, separator='\n\n'):
+        """
+        Search the sentences of many (short) documents at once.
+
+        Sentences are packed into a single buffer so that each pattern's regex is run over the
+            buffer only once, and each hit is mapped back to its (document, sentence). Results
+            are identical to calling `Pattern.matches`/`Pattern.finditer` on each sentence:
+            candidates are confirmed (negation/requires) against their own sentence, and sentences
+            touched by a hit crossing a separator (or all sentences, for a regex with anchors or
+            lookarounds; see `is_packable`) are searched on their own.
+
+        Sentences use the batch for `Sentence.has_pattern`/`has_patterns`/`get_pattern`/`get_patterns`,
+            with each pattern searched across the batch when a sentence first requests it.
+
+        :param documents: `Document` instances, texts, or (name, text) tuples; a `StreamingDocument`
+            is kept in its place, but searches its own sentences as they are read
+        :param ssplit: sentence splitter for documents built from texts
+        :param separator: placed between sentences; must only contain non-word characters
+        """
+        if not separator or re.search(r'\w', separator):
+            raise ValueError(f'Separator must only contain non-word characters: {separator!r}')
+        self.documents = []
+        for i, doc in enumerate(documents):
+            if isinstance(doc, str):
+                doc = Document(str(i), text=doc, ssplit=ssplit)
+            elif not isinstance(doc, (Document, StreamingDocument)):
+                doc = Document(doc[0], text=doc[1], ssplit=ssplit)
+            self.documents.append(doc)
+        sentences = []  # flattened across documents
+        self._owners = []  # index into self.documents for each sentence
+        starts = []  # offset of each sentence in buffer
+        ends = []
+        texts = []
+        curr = 0
+        for i, doc in enumerate(self.documents):
+            if isinstance(doc, StreamingDocument):
+                continue
+            for sentence in doc.sentences:
+                sentences.append(sentence)
+                self._owners.append(i)
+                texts.append(sentence.text)
+                starts.append(curr)
+                curr += len(sentence.text)
+                ends.append(curr)
+                curr += len(separator)
+        self._attach(sentences, separator.join(texts), starts, ends)
+
+    def __len__(self):
+        return len(self.documents)
+
+    def __iter__(self) -> Iterator[Document]:
+        return iter(self.documents)
+
+    def __getitem__(self, item):
+        return self.documents[item]
+
+    def matches(self, pat: Pattern, **kwargs) -> Iterator[Tuple[Document, Sentence, object]]:
+        """Equivalent to `Pattern.matches` on each sentence
+
+        :param kwargs: passed to `Pattern.matches` (e.g., `return_negation`, `ignore_negation`)
+        :return: iterator of (document, sentence, result) for each sentence with a result;
+            offsets of the result (`Match` or `Negation`) are relative to the document
+        """
+        for idx, m in self._get_results(pat, kwargs).items():
+            yield self.documents[self._owners[idx]], self.sentences[idx], m
+
+    def finditer(self, pat: Pattern, **kwargs) -> Iterator[Tuple[Document, Sentence, object]]:
+        """Equivalent to `Pattern.finditer` on each sentence
+
+        :param kwargs: passed to `Pattern.finditer` (e.g., `return_negation`, `ignore_negation`)
+        :return: iterator of (document, sentence, result) for every result
+        """
+        hits, dirty = self._scan(pat)
+        for idx in sorted(hits.keys() | dirty):
+            sentence = self.sentences[idx]
+            for m in self.sentence_finditer(pat, sentence, **kwargs):
+                yield self.documents[self._owners[idx]], sentence, m
+
+
+def iter_batches(documents: Iterable, batch_size, **kwargs) -> Iterator[DocumentBatch]:
+    """Group documents into `DocumentBatch`es of (at most) `batch_size` documents"""
+    batch = []
+    for doc in documents:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            yield DocumentBatch(batch, **kwargs)
+            batch = []
+    if batch:
+        yield DocumentBatch(batch, **kwargs)
@@ -2,6 +2,11 @@ import re
 from typing import Iterable, List, Optional, Iterator
 
 from runrex.algo import MatchCask
+from runrex.algo.context import ContextSpans
+from runrex.algo.patternset import flatten_patterns, iter_matches
+from runrex.text.hitindex import SentenceHitIndex
+from runrex.text.preprocess import DEFAULT_PREPROCESSOR, Preprocessed, Preprocessor
+from runrex.text.scan import DocumentScan
 from runrex.text.section import Section
 from runrex.text.sections import Sections
 from runrex.text.sentence import Sentence
@@ -10,15 +15,26 @@ from runrex.text.ssplit import default_ssplit
 
 
 class Document:
-    HISTORY_REMOVAL = re.compile(r'HISTORY:.*?(?=[A-Z]+:)')
+    HISTORY_REMOVAL = re.compile(r'HISTORY:.*?(?=[A-Z]+:)')  # as removed by `DEFAULT_PREPROCESSOR` (in linear time)
 
-    def __init__(self, name, file=None, text=None, encoding='utf8', ssplit=default_ssplit):
+    def __init__(self, name, file=None, text=None, encoding='utf8', ssplit=default_ssplit, scan_document=False,
+                 memo=False, preprocessor: Preprocessor = None):
         """
 
         :param name:
         :param file:
         :param text:
         :param encoding:
+        :param ssplit: sentence splitter; sentences are only split when first used
+            (`sentences`, iteration, or a by-sentence search)
+        :param scan_document: by-sentence searches run each pattern once over `new_text` and
+            assign its hits to sentences (see `runrex.text.scan.DocumentScan`); results are unchanged
+        :param memo: sentences remember the result of each search (by pattern and options), so that
+            repeating a search (e.g., the same `Pattern` in several algorithms) only records the
+            result (`matches`, `last_found`) rather than searching again; see `clear_memo`
+        :param preprocessor: cleans the text (`new_text`) before it is split into sentences;
+            default: remove the history section and join headers to their content
+            (see `runrex.text.preprocess`)
         """
         self.name = name
         self.text = text
@@ -28,30 +44,83 @@ class Document:
                 self.text = fh.read()
         if not self.text:
             raise ValueError(f'Missing text for {name}, file: {file}')
-        # remove history section
-        self.new_text = self._clean_text(self.HISTORY_REMOVAL.sub('\n', self.text))
-        self.sentences = Sentences(self.new_text, self.matches, ssplit=ssplit or default_ssplit)
+        self._ssplit = ssplit or default_ssplit
+        self.scan_document = scan_document
+        self.memo = memo
+        self.preprocessor = preprocessor or DEFAULT_PREPROCESSOR
+        self._preprocessed = None
+        self._new_text = None
+        self._sentences = None
+        self._context = None
+        self._hit_index = None
+
+    @property
+    def new_text(self):
+        """Text cleaned by the preprocessor (e.g., history section removed), as split into sentences
+            (built when first used)"""
+        if self._new_text is None:
+            self._preprocessed = self.preprocessor.process(self.text)
+            self._new_text = self._preprocessed.text
+        return self._new_text
+
+    @new_text.setter
+    def new_text(self, value):
+        self._new_text = value
+        self._preprocessed = None
+
+    @property
+    def preprocessed(self) -> Optional[Preprocessed]:
+        """`new_text` and the changes made to the original text (None if `new_text` was replaced)"""
+        if self._new_text is None:
+            self.new_text
+        return self._preprocessed
+
+    @property
+    def sentences(self) -> Sentences:
+        """Sentences of `new_text` (split when first used)"""
+        if self._sentences is None:
+            self._sentences = Sentences(self.new_text, self.matches, ssplit=self._ssplit)
+            if self.scan_document:
+                DocumentScan(self.new_text, self._sentences.sentences)
+            if self.memo:
+                for sentence in self._sentences:
+                    sentence.memo = {}
+        return self._sentences
+
+    @sentences.setter
+    def sentences(self, value):
+        self._sentences = value
+
+    def clear_memo(self):
+        """Forget remembered search results (e.g., once all algorithms have run on this document)"""
+        if self._sentences is not None:
+            for sentence in self._sentences:
+                if sentence.memo:
+                    sentence.memo = {}
+
+    @property
+    def context(self) -> ContextSpans:
+        """Matches of negation/requires regexes in the whole text, shared by all patterns"""
+        if self._context is None or self._context.text is not self.text:
+            self._context = ContextSpans(self.text)
+        return self._context
+
+    @property
+    def folded(self) -> str:
+        """Case-folded copy of the whole text (same offsets), shared by all patterns"""
+        return self.context.folded
 
     @classmethod
-    def clean_text(cls, text, ssplit=default_ssplit):
-        return re.sub(r': *\n', r': ', Document.HISTORY_REMOVAL.sub('\n', text), flags=re.I)
-
-    def _clean_text(self, text):
-        """
-        These algorithms work on a sentence by sentence level, so occasionally need
-            to clean up where the sentence boundaries are.
-        :param text:
-        :return:
-        """
-        text = re.sub(r': *\n', r': ', text, flags=re.I)
-        return text
+    def clean_text(cls, text, ssplit=default_ssplit, preprocessor: Preprocessor = None):
+        """Text as cleaned for a `Document` (`new_text`)"""
+        return (preprocessor or DEFAULT_PREPROCESSOR)(text)
 
     def remove_patterns(self, *pats, ignore_negation=False):
         text = self.text
         for pat in pats:
             text = pat.sub('', text)
         if text:
-            return Document(self.name, text=text)
+            return Document(self.name, text=text, preprocessor=self.preprocessor)
         else:
             return None
 
@@ -66,13 +135,15 @@ class Document:
         if by_sentence:
             return self.sentences.has_pattern(pat, ignore_negation=ignore_negation)
         else:
-            m = pat.matches(self.text, ignore_negation=ignore_negation)
+            m = pat.matches(self.text, ignore_negation=ignore_negation, context=self.context)
             if m:
                 self.matches.add(m)
             return bool(m)
 
     def get_pattern(self, pat, index=0):
-        m = pat.matches(self.text)
+        return self._get_group(pat.matches(self.text, context=self.context), index=index)
+
+    def _get_group(self, m, index=0):
         if m:
             self.matches.add(m)
             if not isinstance(index, (list, tuple)):
@@ -83,14 +154,14 @@ class Document:
     def get_patterns(self, *pats, index=0, names=None):
         """
 
-        :param pats:
+        :param pats: `Pattern` or `PatternSet` (the latter scans the text only once)
         :param index:
         :param names: if included, return name of matched pattern
-            list same length as number of patterns
+            list same length as number of patterns (after expanding any `PatternSet`)
         :return:
         """
-        for i, pat in enumerate(pats):
-            res = self.get_pattern(pat, index=index)
+        for i, (_, m) in enumerate(iter_matches(pats, self.text, context=self.context)):
+            res = self._get_group(m, index=index)
             if res:
                 if names:
                     return res, names[i]
@@ -98,7 +169,7 @@ class Document:
         return None
 
     def has_patterns(self, *pats, has_all=False, ignore_negation=False, by_sentence=True):
-        for pat in pats:
+        for pat in flatten_patterns(pats):
             if has_all and not self.has_pattern(pat, ignore_negation, by_sentence=by_sentence):
                 return False
             elif not has_all and self.has_pattern(pat, ignore_negation, by_sentence=by_sentence):
@@ -110,49 +181,37 @@ class Document:
             if sentence.has_patterns(*pats, ignore_negation=ignore_negation, has_all=has_all):
                 yield sentence
 
-    def _select_sentence_idx_with_neighbors(self, sentence, i, *pats, negation=None, has_all=False,
-                                            neighboring_sentences=0) -> Iterable[int]:
-        if sentence.has_patterns(*pats, has_all=has_all):
-            if negation:
-                if sentence.has_patterns(*negation):
-                    return
-            yield i
-            for j in range(neighboring_sentences):
-                if i + j < len(self.sentences):
-                    yield i + j
-                if i - j >= 0:
-                    yield i - j
-
-    def _select_all_sentence_indices(self, sentence, i, *pats, negation=None, has_all=False,
-                                     neighboring_sentences=0) -> List[int]:
-        return sorted([idx for idx in
-                       self._select_sentence_idx_with_neighbors(sentence, i, *pats, negation=negation, has_all=has_all,
-                                                                neighboring_sentences=neighboring_sentences)])
+    @property
+    def hit_index(self) -> SentenceHitIndex:
+        """Which sentences each pattern matches, shared by all searches of this document's sentences"""
+        if self._hit_index is None or self._hit_index.sentences is not self.sentences:
+            self._hit_index = SentenceHitIndex(self.sentences)
+        return self._hit_index
+
+    def _is_selected(self, index: SentenceHitIndex, i, pats, negation=None, has_all=False) -> bool:
+        """Does sentence i have the patterns (and none of the negation patterns)? Records matches
+            on the sentence as `Sentence.has_patterns` does"""
+        if not index.record(i, pats, has_all=has_all):
+            return False
+        return not (negation and index.record(i, negation))
 
     def select_sentences_with_patterns(self, *pats, negation=None, has_all=False,
                                        neighboring_sentences=0) -> Iterable[Section]:
-        for i, sentence in enumerate(self.sentences):
-            sents = set()
-            if sentence.has_patterns(*pats, has_all=has_all):
-                if negation:
-                    if sentence.has_patterns(*negation):
-                        continue
-                sents.add(i)
-                for j in range(neighboring_sentences):
-                    if i + j < len(self.sentences):
-                        sents.add(i + j)
-                    if i - j >= 0:
-                        sents.add(i - j)
-            if sents:
-                yield Section([self.sentences[i] for i in sorted(list(sents))], self.matches)
+        index = self.hit_index
+        for i in range(len(self.sentences)):
+            if self._is_selected(index, i, pats, negation=negation, has_all=has_all):
+                sents = index.with_neighbors(1 << i, neighboring_sentences)
+                yield Section([self.sentences[j] for j in index.indices(sents)], self.matches)
 
     def select_all_sentences_with_patterns(self, *pats, negation=None, has_all=False, get_range=False,
                                            neighboring_sentences=0) -> Optional[Section]:
-        sents = []
-        for i, sentence in enumerate(self.sentences):
-            sents += self._select_all_sentence_indices(sentence, i, *pats, negation=negation, has_all=has_all,
-                                                       neighboring_sentences=neighboring_sentences)
-        if not sents:  # must be sorted
+        index = self.hit_index
+        selected = 0
+        for i in range(len(self.sentences)):
+            if self._is_selected(index, i, pats, negation=negation, has_all=has_all):
+                selected |= 1 << i
+        sents = index.indices(index.with_neighbors(selected, neighboring_sentences))
+        if not sents:
             return None
         elif len(sents) == 1:
             return Section([self.sentences[sents[0]]], self.matches)
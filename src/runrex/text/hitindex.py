@@ -0,0 +1,96 @@
+from typing import Iterable, List
+
+from runrex.algo.patternset import flatten_patterns
+
+
+class SentenceHitIndex:
+
+    def __init__(self, sentences):
+        """
+        Which sentences of a document each pattern matches, as a bitmap (bit i: sentence i).
+
+        Each pattern is searched in each sentence at most once, however many times (and in whatever
+            combination) it is requested, so that selecting sentences by any/all of several
+            patterns, excluding negated sentences, and adding neighbouring sentences are all
+            bitwise operations. Sentences are only searched when first needed.
+
+        :param sentences: `Sentences` (or list of `Sentence`) of a document
+        """
+        self.sentences = sentences
+        self.size = len(sentences)
+        self._results = {}  # pattern -> {sentence index: result of `Pattern.matches`} (searched so far)
+        self._bitmaps = {}  # pattern -> bitmap (once searched in every sentence)
+
+    def match(self, pat, index):
+        """Result of `Pattern.matches` for the sentence (searched only on first request)"""
+        results = self._results.setdefault(pat, {})
+        try:
+            return results[index]
+        except KeyError:
+            m = results[index] = self.sentences[index]._matches(pat)
+            return m
+
+    def hits(self, pat) -> int:
+        """Bitmap of sentences in which the pattern matches"""
+        if (bitmap := self._bitmaps.get(pat)) is None:
+            bitmap = 0
+            for i in range(self.size):
+                if self.match(pat, i):
+                    bitmap |= 1 << i
+            self._bitmaps[pat] = bitmap
+        return bitmap
+
+    def any_hits(self, *pats) -> int:
+        """Bitmap of sentences in which any of the patterns match"""
+        bitmap = 0
+        for pat in flatten_patterns(pats):
+            bitmap |= self.hits(pat)
+        return bitmap
+
+    def all_hits(self, *pats) -> int:
+        """Bitmap of sentences in which all of the patterns match"""
+        bitmap = (1 << self.size) - 1
+        for pat in flatten_patterns(pats):
+            bitmap &= self.hits(pat)
+            if not bitmap:
+                break
+        return bitmap
+
+    def select(self, *pats, has_all=False, negation=None) -> int:
+        """Bitmap of sentences selected as by `Sentence.has_patterns`, excluding those with any `negation` pattern"""
+        bitmap = self.all_hits(*pats) if has_all else self.any_hits(*pats)
+        if negation and bitmap:
+            bitmap &= ~self.any_hits(*negation)
+        return bitmap
+
+    def with_neighbors(self, bitmap, neighboring_sentences=0) -> int:
+        """Add the sentences within `neighboring_sentences - 1` of each selected sentence"""
+        result = bitmap
+        for offset in range(1, neighboring_sentences):
+            result |= (bitmap << offset) | (bitmap >> offset)
+        return result & ((1 << self.size) - 1)
+
+    @staticmethod
+    def indices(bitmap) -> List[int]:
+        """Sentence indices (ascending) in the bitmap"""
+        result = []
+        while bitmap:
+            low = bitmap & -bitmap
+            result.append(low.bit_length() - 1)
+            bitmap ^= low
+        return result
+
+    def record(self, index, pats: Iterable, has_all=False) -> bool:
+        """Equivalent of `Sentence.has_patterns` for sentence `index`, looking up (rather than
+            searching for) each pattern, and recording results on the sentence in the same way"""
+        sentence = self.sentences[index]
+        for pat in flatten_patterns(pats):
+            m = self.match(pat, index)
+            if has_all and not sentence._record_match(m):
+                sentence._update_last_search(False)
+                return False
+            elif not has_all and sentence._record_match(m):
+                sentence._update_last_search(True)
+                return True
+        sentence._update_last_search(has_all)
+        return has_all
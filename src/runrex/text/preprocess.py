@@ -0,0 +1,107 @@
+"""
+Clean a document's text before it is split into sentences, building the cleaned text once.
+
+The default rules are equivalent to the regexes previously applied in turn by `Document`:
+    remove the history section (`HISTORY:.*?(?=[A-Z]+:)`, replaced by a newline), then join
+    headers to their content (`: *\\n` replaced by `: `). The history section is matched in
+    linear time (the original regex is quadratic in the length of a run of capitals without a
+    colon). Each change is recorded (see `Preprocessed.edits`) so that later stages can map
+    positions back to the original text rather than redoing the work.
+"""
+import re
+from typing import List, NamedTuple, Optional
+
+# text up to the next header (`[A-Z]+:`) on the same line: runs of other characters, or of
+#   capitals not followed by a colon; (?=(...))(?P=...) emulates a possessive match so that
+#   no run is searched more than once
+HISTORY_BODY = (r'(?=(?P<body>(?:(?=(?P<other>[^A-Z\n]+))(?P=other)|(?=(?P<caps>[A-Z]+))(?P=caps)(?!:))*))'
+                r'(?P=body)(?=[A-Z])')
+HEADER_JOIN = re.compile(r': *\n')
+
+
+class Edit(NamedTuple):
+    start: int  # in the original text
+    end: int
+    replacement: str
+    rule: str  # 'history' or 'header'
+
+
+class Preprocessed(NamedTuple):
+    text: str
+    edits: List[Edit]  # in order of position in the original text (non-overlapping)
+
+    def original_offset(self, pos) -> int:
+        """Position in the original text of position `pos` in the cleaned text
+
+        A position within a replacement maps to the start of the replaced text.
+        """
+        shift = 0  # cleaned position - original position
+        for edit in self.edits:
+            start = edit.start + shift
+            if pos < start:
+                break
+            if pos < start + len(edit.replacement):
+                return edit.start
+            shift += len(edit.replacement) - (edit.end - edit.start)
+        return pos - shift
+
+
+class Preprocessor:
+
+    def __init__(self, *, remove_history=True, join_headers=True, history_header='HISTORY:',
+                 max_history: Optional[int] = None):
+        """
+        :param remove_history: replace the text from `history_header` to the next header on
+            the same line (e.g., `PLAN:`) with a newline
+        :param join_headers: replace a colon (and any spaces) at the end of a line with `: `
+        :param history_header: start of the history section
+        :param max_history: only remove a history section of at most this many characters
+            (after `history_header`); default: any length
+        """
+        self.remove_history = remove_history
+        self.join_headers = join_headers
+        self.history_header = history_header
+        self.max_history = max_history
+        self._history = re.compile(re.escape(history_header) + HISTORY_BODY)
+
+    def _iter_history(self, text):
+        """Yield (start, end) of each history section to remove"""
+        for m in self._history.finditer(text):
+            if self.max_history is None or len(m.group('body')) <= self.max_history:
+                yield m.span()
+
+    def process(self, text) -> Preprocessed:
+        """Apply all rules to the original text, building the cleaned text once"""
+        edits = []
+        if self.remove_history:
+            prev_end = 0
+            for start, end in self._iter_history(text):
+                colon = start
+                while colon > prev_end and text[colon - 1] == ' ':
+                    colon -= 1
+                if self.join_headers and colon > prev_end and text[colon - 1] == ':':
+                    # the newline replacing the history section ends a header (`: *\n`)
+                    edits.append(Edit(colon - 1, end, ': ', 'history'))
+                else:
+                    edits.append(Edit(start, end, '\n', 'history'))
+                prev_end = end
+        if self.join_headers:
+            # cannot overlap a history section (which does not contain a newline)
+            joins = [Edit(m.start(), m.end(), ': ', 'header') for m in HEADER_JOIN.finditer(text)]
+            edits = sorted(edits + joins) if edits else joins
+        if not edits:
+            return Preprocessed(text, edits)
+        pieces = []
+        pos = 0
+        for edit in edits:
+            pieces.append(text[pos:edit.start])
+            pieces.append(edit.replacement)
+            pos = edit.end
+        pieces.append(text[pos:])
+        return Preprocessed(''.join(pieces), edits)
+
+    def __call__(self, text) -> str:
+        return self.process(text).text
+
+
+DEFAULT_PREPROCESSOR = Preprocessor()
@@ -0,0 +1,211 @@
+import re
+from bisect import bisect_right
+from functools import lru_cache
+
+from runrex.algo import Pattern
+from runrex.algo.context import ContextSpans
+
+try:
+    from re import _parser as sre_parse  # python 3.11+
+except ImportError:
+    import sre_parse
+
+# zero-width items which only see the current position relative to the separator (a non-word character)
+_PACKABLE_AT = {sre_parse.AT_BOUNDARY, sre_parse.AT_NON_BOUNDARY}
+
+
+def _is_packable(items) -> bool:
+    for op, av in items:
+        if op is sre_parse.AT:
+            if av not in _PACKABLE_AT:
+                return False
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT, sre_parse.GROUPREF, sre_parse.GROUPREF_EXISTS):
+            return False
+        elif op is sre_parse.SUBPATTERN:
+            if not _is_packable(av[3]):
+                return False
+        elif op is sre_parse.BRANCH:
+            if not all(_is_packable(branch) for branch in av[1]):
+                return False
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) or op is getattr(sre_parse, 'POSSESSIVE_REPEAT', None):
+            if not _is_packable(av[2]):
+                return False
+        elif op is getattr(sre_parse, 'ATOMIC_GROUP', None):
+            if not _is_packable(av):
+                return False
+    return True
+
+
+@lru_cache(maxsize=None)
+def is_packable(pattern: str, flags=0) -> bool:
+    """Can the regex be run over many texts packed together with a non-word separator?
+
+    This requires that a match lying entirely within one text is the same as the match found
+        in that text on its own: i.e., no anchors (other than word boundaries), lookarounds, or
+        backreferences, and the regex cannot match the empty string.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, TypeError):
+        return False
+    return parsed.getwidth()[0] > 0 and _is_packable(list(parsed))
+
+
+WORD_CHAR = re.compile(r'\w')
+
+
+class PackedSearch:
+    """
+    Search the sentences laid out in one buffer with a single pass of each pattern's regex.
+
+    Each hit lying entirely within a sentence is mapped back to that sentence (by binary search
+        over the sentences' offsets) and confirmed (negation/requires) against that sentence's
+        text alone, so that results are identical to calling `Pattern.matches`/`Pattern.finditer`
+        on each sentence. Sentences touched by a hit crossing their bounds, sentences which are
+        not separated from their neighbours by non-word characters (see `isolated`), and all
+        sentences for a regex with anchors or lookarounds (see `is_packable`) are searched on
+        their own instead; if every sentence is isolated (e.g., for a splitter which normalises
+        whitespace, such as `syntok_ssplit`), the buffer is not searched at all.
+
+    Sentences are attached (`Sentence.batch`) so that `Sentence.has_pattern`/`has_patterns`/
+        `get_pattern`/`get_patterns` use the buffer, with each pattern searched across the buffer
+        when a sentence first requests it.
+    """
+
+    def _attach(self, sentences, buffer, starts, ends, isolated=()):
+        """
+        :param sentences: list of `Sentence`
+        :param buffer: text containing every sentence
+        :param starts: offset of each sentence in buffer (ascending)
+        :param ends: offset of the end of each sentence in buffer
+        :param isolated: indices of sentences which must always be searched on their own
+        """
+        self.sentences = sentences
+        self.buffer = buffer
+        self._starts = starts
+        self._ends = ends
+        self.isolated = set(isolated)
+        for i, sentence in enumerate(sentences):
+            sentence.batch = self
+            sentence.batch_index = i
+        self._context = ContextSpans(buffer)  # shares the case-folded buffer between patterns
+        self._scans = {}  # pattern -> result of `_scan`
+        self._results = {}  # (pattern, kwargs) -> {sentence index: result of `Pattern.matches`}
+
+    def _scan(self, pat: Pattern):
+        """Run the pattern's regex over the buffer once
+
+        :return: (dict of sentence index -> list of candidate `re.Match`, set of indices of
+            sentences which must be searched on their own)
+        """
+        if (result := self._scans.get(pat)) is None:
+            result = self._scans[pat] = self._scan_buffer(pat)
+        return result
+
+    def _scan_buffer(self, pat: Pattern):
+        hits = {}
+        if len(self.isolated) == len(self.sentences):  # e.g., no sentence is a slice of the buffer
+            return hits, self.isolated
+        regex = pat.pattern
+        if not (getattr(regex, 'packable', False) or is_packable(regex.pattern, regex.flags)):
+            return hits, set(range(len(self.sentences)))
+        dirty = set(self.isolated)
+        if not pat.may_match(self.buffer, self._context):
+            return hits, dirty
+        try:
+            for m in pat._search_regex('finditer', self.buffer, self._context):
+                start, end = m.span()
+                idx = bisect_right(self._starts, start) - 1
+                if idx >= 0 and end <= self._ends[idx]:
+                    hits.setdefault(idx, []).append(m)
+                    continue
+                # crosses the bounds of a sentence: the sentences it touches must be searched on their own
+                if idx >= 0 and start < self._ends[idx]:
+                    dirty.add(idx)
+                idx += 1
+                while idx < len(self._starts) and self._starts[idx] < end:
+                    dirty.add(idx)
+                    idx += 1
+        except TimeoutError:
+            pat._log_timeout(self.buffer)
+            return {}, set(range(len(self.sentences)))
+        return hits, dirty
+
+    def _search(self, pat: Pattern, kwargs) -> dict:
+        hits, dirty = self._scan(pat)
+        results = {}
+        for idx in sorted(hits.keys() | dirty):
+            sentence = self.sentences[idx]
+            if idx in dirty:
+                m = pat.matches(sentence.text, offset=sentence.start, context=sentence.context, **kwargs)
+            else:
+                m = pat._first_result(sentence.text, hits[idx][0], offset=sentence.start,
+                                      base=self._starts[idx], context=sentence.context, **kwargs)
+            if m:
+                results[idx] = m
+        return results
+
+    def _get_results(self, pat: Pattern, kwargs) -> dict:
+        key = (pat, tuple(sorted(kwargs.items())))
+        if (results := self._results.get(key)) is None:
+            results = self._search(pat, kwargs)
+            self._results[key] = results
+        return results
+
+    def sentence_match(self, pat: Pattern, sentence, **kwargs):
+        """Result of `Pattern.matches` for a sentence (searching the whole buffer on first use)"""
+        return self._get_results(pat, kwargs).get(sentence.batch_index, False)
+
+    def sentence_finditer(self, pat: Pattern, sentence, **kwargs):
+        """Results of `Pattern.finditer` for a sentence (searching the whole buffer on first use)"""
+        hits, dirty = self._scan(pat)
+        idx = sentence.batch_index
+        if idx in dirty:
+            return pat.finditer(sentence.text, offset=sentence.start, context=sentence.context, **kwargs)
+        elif idx in hits:
+            return pat._iter_results(sentence.text, hits[idx], offset=sentence.start,
+                                     base=self._starts[idx], context=sentence.context, **kwargs)
+        return iter(())
+
+
+class DocumentScan(PackedSearch):
+
+    def __init__(self, text, sentences):
+        """
+        Search the sentences of a document with one pass of each regex over the whole text
+            (see `PackedSearch`), so that the cost of a search depends on the number of hits
+            rather than the number of sentences.
+
+        :param text: text which was split into sentences (e.g., `Document.new_text`)
+        :param sentences: list of `Sentence` with offsets into text (e.g., `Sentences.sentences`)
+        """
+        starts = [sentence.start for sentence in sentences]
+        ends = [sentence.end for sentence in sentences]
+        isolated = set()
+        prev_end = 0
+        for i, sentence in enumerate(sentences):
+            if sentence.start < prev_end:  # overlapping/unordered: hits cannot be mapped back
+                isolated = range(len(sentences))
+                break
+            prev_end = sentence.end
+            if not self._is_slice(text, sentence) or (
+                    sentence.start > 0 and WORD_CHAR.match(text, sentence.start - 1)
+                    or sentence.end < len(text) and WORD_CHAR.match(text, sentence.end)):
+                isolated.add(i)
+        self._attach(sentences, text, starts, ends, isolated)
+
+    def first_match(self, pat: Pattern, **kwargs):
+        """First sentence with a result of `Pattern.matches`
+
+        :return: (index of sentence, result) or (None, False)
+        """
+        for idx, m in self._get_results(pat, kwargs).items():  # in order of sentence
+            return idx, m
+        return None, False
+
+    @staticmethod
+    def _is_slice(text, sentence) -> bool:
+        """Is the sentence exactly its span of text (rather than, e.g., with normalised whitespace)?"""
+        if sentence._buffer is text:  # view (see `Sentence.view`)
+            return True
+        return text[sentence.start:sentence.end] == sentence.text
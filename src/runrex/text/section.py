@@ -1,6 +1,7 @@
 from typing import Iterable
 
 from runrex.algo import MatchCask, Pattern
+from runrex.algo.patternset import flatten_patterns
 from runrex.text.sentence import Sentence
 
 
@@ -15,11 +16,22 @@ class Section:
             passing around the same match object (default)
         """
         self.sentences = list(sentences)
-        self.text = '\n'.join(sent.text for sent in sentences)
+        self._text = None
         self.matches = mc or MatchCask()
         if add_matches:
             for sent in self.sentences:
-                self.matches.add_all(sent.matches.matches)
+                self.matches.add_all(sent.matches)
+
+    @property
+    def text(self) -> str:
+        """Text of the sentences, one per line (built when first used)"""
+        if self._text is None:
+            self._text = '\n'.join(sent.text for sent in self.sentences)
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        self._text = value
 
     @property
     def match_start(self):
@@ -68,7 +80,7 @@ class Section:
         if get_count:
             has_all = False  # ensure this is properly set
         cnt = 0
-        for pat in pats:
+        for pat in flatten_patterns(pats):
             match = self.has_pattern(pat, ignore_negation=ignore_negation)
             if get_count:
                 if match:
@@ -82,10 +94,10 @@ class Section:
         return has_all
 
     def __bool__(self):
-        return len(self.sentences) > 0 and bool(self.text.strip())
+        return any(sent.text and not sent.text.isspace() for sent in self.sentences)
 
     def __add__(self, other):
-        return Section(self.sentences + other.sentences, self.matches.copy().add_all(other.matches.matches))
+        return Section(self.sentences + other.sentences, self.matches.copy().add_all(other.matches))
 
     def __str__(self):
         return self.text
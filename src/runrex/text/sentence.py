@@ -1,57 +1,192 @@
 from typing import Tuple
 
-from runrex.algo import MatchCask, Pattern, Negation
+from runrex.algo import Match, MatchCask, Pattern, Negation
+from runrex.algo.context import ContextSpans
+from runrex.algo.patternset import PatternSet, flatten_patterns, iter_matches, iter_all_matches
 
 
 class Sentence:
+    __slots__ = ('_text', '_buffer', 'matches', 'start', 'end', '_last_found', '_any_found', '_context',
+                 'batch', 'batch_index', 'memo')
 
     def __init__(self, text, mc: MatchCask = None, start=0, end=None):
-        self.text = text
+        self._text = text
+        self._buffer = None  # if a view: text is self._buffer[self.start:self.end]
         self.matches = mc or MatchCask()
         self.start = start
-        self.end = end if end else len(self.text)
+        self.end = end if end else len(text)
         self.strip()  # remove extra start/ending characters
-        self._last_search_found_pattern = []
+        self._last_found = False  # result of the most recent search
+        self._any_found = False  # has any search found a pattern since `reset_found_pattern`?
+        self._context = None
+        self.batch = None  # `DocumentBatch`/`DocumentScan` which searches this sentence along with others
+        self.batch_index = None
+        self.memo = None  # dict of results by (pattern, method, options), if searches are remembered (see `Document`)
+
+    @classmethod
+    def view(cls, buffer, start, end, mc: MatchCask = None):
+        """Sentence at buffer[start:end] (e.g., the document text), only copied out when its text is first used"""
+        sentence = cls('', mc, start, end)
+        sentence._buffer = buffer
+        sentence._text = None
+        sentence.start, sentence.end = start, end
+        sentence.strip()
+        return sentence
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self._buffer[self.start:self.end]
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        self._text = value
+        self._buffer = None
+
+    @property
+    def context(self) -> ContextSpans:
+        """Matches of negation/requires regexes in this sentence, shared by all patterns"""
+        if self._context is None or self._context.text is not self.text:
+            self._context = ContextSpans(self.text)
+        return self._context
+
+    @property
+    def folded(self) -> str:
+        """Case-folded copy of the text (same offsets), shared by all patterns"""
+        return self.context.folded
 
     def reset_found_pattern(self):
-        self._last_search_found_pattern = []
+        self._last_found = False
+        self._any_found = False
 
     @property
     def last_found(self):
-        return self._last_search_found_pattern[-1]
+        return self._last_found
 
     @property
     def any_found(self):
-        return any(self._last_search_found_pattern)
+        return self._any_found
 
     def strip(self):
         """
         Remove begin and end characters, but keep track of new offsets
         :return:
         """
-        ltext = self.text.lstrip()
-        start_incr = len(self.text) - len(ltext)
-        self.start += start_incr
-        rtext = ltext.rstrip()
-        self.end -= len(self.text) - len(rtext) - start_incr
-        self.text = rtext
+        if self._text is None:  # view: only move the bounds
+            buffer = self._buffer
+            while self.start < self.end and buffer[self.start].isspace():
+                self.start += 1
+            while self.end > self.start and buffer[self.end - 1].isspace():
+                self.end -= 1
+            return
+        text = self._text
+        i, j = 0, len(text)
+        while i < j and text[i].isspace():
+            i += 1
+        while j > i and text[j - 1].isspace():
+            j -= 1
+        if i or j < len(text):  # copy only if there is something to remove
+            self.start += i
+            self.end -= len(text) - j
+            self._text = text[i:j]
 
     def _update_last_search(self, val: bool):
-        self._last_search_found_pattern.append(val)
+        self._last_found = val
+        self._any_found = self._any_found or bool(val)
+
+    def _matches(self, pat: Pattern, **kwargs):
+        """Result of `Pattern.matches` on this sentence (looked up in the memo or batch, if any)"""
+        if self.memo is not None:
+            key = (pat, 'matches', tuple(sorted(kwargs.items())))
+            if key in self.memo:
+                return self._recall(pat, self.memo[key])
+            m = self.memo[key] = self._search_matches(pat, **kwargs)
+            return m
+        return self._search_matches(pat, **kwargs)
+
+    def _search_matches(self, pat: Pattern, **kwargs):
+        if self.batch is not None:
+            return self.batch.sentence_match(pat, self, **kwargs)
+        return pat.matches(self.text, offset=self.start, context=self.context, **kwargs)
+
+    def _iter_matches(self, pats, **kwargs):
+        if self.memo is not None:
+            return self._iter_memo(pats, 'matches', kwargs)
+        return self._search_iter_matches(pats, **kwargs)
+
+    def _search_iter_matches(self, pats, **kwargs):
+        if self.batch is not None:
+            return ((pat, self.batch.sentence_match(pat, self, **kwargs)) for pat in flatten_patterns(pats))
+        return iter_matches(pats, self.text, offset=self.start, context=self.context, **kwargs)
+
+    def _iter_all_matches(self, pats, **kwargs):
+        if self.memo is not None:
+            return self._iter_memo(pats, 'finditer', kwargs)
+        return self._search_iter_all_matches(pats, **kwargs)
+
+    def _search_iter_all_matches(self, pats, **kwargs):
+        if self.batch is not None:
+            return ((pat, m) for pat in flatten_patterns(pats)
+                    for m in self.batch.sentence_finditer(pat, self, **kwargs))
+        return iter_all_matches(pats, self.text, offset=self.start, context=self.context, **kwargs)
+
+    def _iter_memo(self, pats, method, kwargs):
+        """Yield (pattern, result) as `_search_iter_matches`/`_search_iter_all_matches`, searching
+            only those patterns (or `PatternSet`s) not already in the memo"""
+        options = tuple(sorted(kwargs.items()))
+        for pat in pats:
+            patterns = pat.patterns if isinstance(pat, PatternSet) else [pat]
+            keys = [(p, method, options) for p in patterns]
+            if all(key in self.memo for key in keys):
+                for p, key in zip(patterns, keys):
+                    if method == 'matches':
+                        yield p, self._recall(p, self.memo[key])
+                    else:
+                        for m in self._recall(p, self.memo[key]):
+                            yield p, m
+            elif method == 'matches':
+                for (p, m), key in zip(self._search_iter_matches([pat], **kwargs), keys):
+                    self.memo[key] = m
+                    yield p, m
+            else:
+                results = {p: [] for p in patterns}
+                for p, m in self._search_iter_all_matches([pat], **kwargs):
+                    results[p].append(m)
+                for p, key in zip(patterns, keys):
+                    self.memo[key] = tuple(results[p])
+                    for m in results[p]:
+                        yield p, m
+
+    @staticmethod
+    def _recall(pat: Pattern, result):
+        """Result from the memo, counted as if the pattern had been searched"""
+        pat.match_count += sum(isinstance(m, Match) for m in (result if isinstance(result, tuple) else [result]))
+        return result
 
     def has_pattern(self, pat: Pattern, ignore_negation=False):
-        m = pat.matches(self.text, ignore_negation=ignore_negation, offset=self.start)
+        m = self._matches(pat, ignore_negation=ignore_negation)
+        return self._record_match(m)
+
+    def _record_match(self, m):
         self._update_last_search(bool(m))
         if m:
             self.matches.add(m)
         return m
 
     def has_patterns(self, *pats, has_all=False, ignore_negation=False):
-        for pat in pats:
-            if has_all and not self.has_pattern(pat, ignore_negation=ignore_negation):
+        """
+
+        :param pats: `Pattern` or `PatternSet` (the latter scans the sentence only once)
+        :param has_all:
+        :param ignore_negation:
+        :return:
+        """
+        for _, m in self._iter_matches(pats, ignore_negation=ignore_negation):
+            if has_all and not self._record_match(m):
                 self._update_last_search(False)
                 return False
-            elif not has_all and self.has_pattern(pat, ignore_negation=ignore_negation):
+            elif not has_all and self._record_match(m):
                 self._update_last_search(True)
                 return True
         self._update_last_search(has_all)
@@ -68,7 +203,7 @@ class Sentence:
         :return:
         """
         # incorporate offset information
-        m = pat.matches(self.text, offset=self.start, return_negation=return_negation)
+        m = self._matches(pat, return_negation=return_negation)
         self._update_last_search(bool(m))
         if m:
             self.matches.add(m)
@@ -85,17 +220,16 @@ class Sentence:
         """
 
         :param return_negation: if True return Negation instance rather than ignoring negation
-        :param pats:
+        :param pats: `Pattern` or `PatternSet` (the latter scans the sentence only once)
         :param index: group index (if using particular regex match group)
         :return:
         """
         found = False
-        for pat in pats:
-            for m in pat.finditer(self.text, offset=self.start, return_negation=return_negation):
-                found = True
-                self.matches.add(m)
-                if return_negation:
-                    yield m.group(index), m.start(index), m.end(index), isinstance(m, Negation)
-                else:
-                    yield m.group(index), m.start(index), m.end(index)
+        for _, m in self._iter_all_matches(pats, return_negation=return_negation):
+            found = True
+            self.matches.add(m)
+            if return_negation:
+                yield m.group(index), m.start(index), m.end(index), isinstance(m, Negation)
+            else:
+                yield m.group(index), m.start(index), m.end(index)
         self._update_last_search(found)
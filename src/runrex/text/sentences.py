@@ -1,23 +1,55 @@
+import re
 from typing import Iterator
 
 from runrex.algo import Pattern
+from runrex.algo.patternset import flatten_patterns
+from runrex.text.scan import DocumentScan
 from runrex.text.sentence import Sentence
 from runrex.text.ssplit import default_ssplit
+from runrex.text.ssplit_cache import SSPLIT_CACHE
+
+NON_SPACE = re.compile(r'\S')
 
 
 class Sentences:
 
     def __init__(self, text, matches=None, ssplit=default_ssplit):
-        self.sentences = [Sentence(s, matches, sidx, eidx) for s, sidx, eidx in ssplit(text) if s.strip()]
+        """
+        :param ssplit: sentence splitter; if it has a `spans` function (yielding (start, end) such
+            that each sentence is exactly text[start:end]), sentences are views over text
+            (see `Sentence.view`); sentences are loaded from `SSPLIT_CACHE` when enabled
+        """
+        if SSPLIT_CACHE.enabled:
+            self.sentences = [
+                Sentence.view(text, sidx, eidx, matches) if s is None else Sentence(s, matches, sidx, eidx)
+                for s, sidx, eidx in SSPLIT_CACHE.split(text, ssplit)
+                if (NON_SPACE.search(text, sidx, eidx) if s is None else s and not s.isspace())
+            ]
+        elif spans := getattr(ssplit, 'spans', None):
+            self.sentences = [Sentence.view(text, sidx, eidx, matches) for sidx, eidx in spans(text)
+                              if NON_SPACE.search(text, sidx, eidx)]
+        else:
+            self.sentences = [Sentence(s, matches, sidx, eidx) for s, sidx, eidx in ssplit(text)
+                              if s and not s.isspace()]
 
     def has_pattern(self, pat, ignore_negation=False):
+        if self.sentences and isinstance(scan := self.sentences[0].batch, DocumentScan) \
+                and scan.sentences is self.sentences:
+            # look up the first sentence with a result, rather than each sentence in turn
+            idx, m = scan.first_match(pat, ignore_negation=ignore_negation)
+            for sentence in self.sentences[:idx]:
+                sentence._update_last_search(False)
+            if m:
+                self.sentences[idx]._record_match(m)
+                return self.sentences[idx].text
+            return False
         for sentence in self.sentences:
             if sentence.has_pattern(pat, ignore_negation=ignore_negation):
                 return sentence.text
         return False
 
     def has_patterns(self, *pats, has_all=False, ignore_negation=False):
-        for pat in pats:
+        for pat in flatten_patterns(pats):
             if has_all and not self.has_pattern(pat, ignore_negation=ignore_negation):
                 return False
             elif not has_all and self.has_pattern(pat, ignore_negation=ignore_negation):
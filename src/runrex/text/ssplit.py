@@ -1,4 +1,5 @@
 import re
+from importlib import metadata
 from typing import Tuple
 from loguru import logger
 
@@ -9,12 +10,22 @@ except ImportError:
     syntok_segmenter = False
 
 
-def keep_offsets_ssplit(text: str, delim='\n') -> Tuple[str, int, int]:
+def keep_offsets_spans(text: str, delim='\n') -> Tuple[int, int]:
+    """(start, end) of each sentence in `keep_offsets_ssplit`, without copying the text"""
     start = 0
     for m in re.finditer(delim, text):
-        yield text[start:m.end()], start, m.end()
+        yield start, m.end()
         start = m.end()
-    yield text[start:], start, len(text)
+    yield start, len(text)
+
+
+def keep_offsets_ssplit(text: str, delim='\n') -> Tuple[str, int, int]:
+    for start, end in keep_offsets_spans(text, delim):
+        yield text[start:end], start, end
+
+
+# sentences are exactly text[start:end]: `Sentences` can use views over the text
+keep_offsets_ssplit.spans = keep_offsets_spans
 
 
 def delim_ssplit(text: str, *, delim='\n') -> Tuple[str, int, int]:
@@ -41,14 +52,17 @@ def syntok_ssplit(text: str, ignore_newlines=True) -> Tuple[str, int, int]:
             start = end
 
 
+REGEX_SSPLIT_BOUNDARY = re.compile(r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!|\*)\s')
+REGEX_SSPLIT_SUBSPLIT = re.compile(r'[*•-]')
+
+
 def regex_ssplit(text: str, *, delim='\n') -> Tuple[str, int, int]:
     text = ' '.join(text.split(delim))  # join broken lines
-    sub_pat = re.compile(r'[*•-]')
     start = 0
-    for m in re.finditer(r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!|\*)\s', text):
-        yield from _subsplit(text[start: m.start()], start, sub_pat)
+    for m in REGEX_SSPLIT_BOUNDARY.finditer(text):
+        yield from _subsplit(text[start: m.start()], start, REGEX_SSPLIT_SUBSPLIT)
         start = m.start()
-    yield from _subsplit(text[start:], start, sub_pat)
+    yield from _subsplit(text[start:], start, REGEX_SSPLIT_SUBSPLIT)
 
 
 def _subsplit(sentence: str, start: int, pattern) -> Tuple[str, int, int]:
@@ -59,7 +73,81 @@ def _subsplit(sentence: str, start: int, pattern) -> Tuple[str, int, int]:
     yield sentence[curr_start:], start + curr_start, start + len(sentence)
 
 
+# abbreviations after which a period does not end a sentence (compared in lowercase)
+ABBREVIATIONS = frozenset({
+    'dr', 'mr', 'mrs', 'ms', 'prof', 'st', 'jr', 'sr', 'vs', 'etc', 'approx', 'appt', 'apr', 'aug', 'dec', 'feb',
+    'jan', 'jul', 'jun', 'mar', 'nov', 'oct', 'sep', 'sept', 'no', 'nos', 'fig', 'hx', 'dx', 'rx', 'sx', 'tx',
+    'pt', 'pts', 'yr', 'yrs', 'wk', 'wks', 'mo', 'mos', 'hr', 'hrs', 'min', 'mins', 'sec', 'max', 'mg', 'mcg',
+    'ml', 'cm', 'mm', 'kg', 'lb', 'lbs', 'oz', 'tab', 'tabs', 'cap', 'caps', 'inj', 'susp', 'soln', 'disp',
+    'bid', 'tid', 'qid', 'qd', 'qhs', 'prn', 'po', 'ca', 'cf', 'al', 'inc', 'co', 'corp', 'dept', 'univ',
+})
+# candidate boundaries: end-of-sentence punctuation (with closing quotes/brackets) followed by
+#   whitespace, blank lines, and line breaks before a list item or heading (e.g., 'PLAN:')
+FAST_SSPLIT_BOUNDARY = re.compile(
+    r'(?P<punct>[.?!]+[\'")\]]*)(?P<space>[ \t]*\n\s*|[ \t]+|$)'
+    r'|\n[ \t]*\n\s*'
+    r'|\n[ \t]*(?=(?:[-*•]|\d{1,2}[.)])[ \t]|[A-Z][A-Z /&]{2,30}:)'
+)
+_WORD_BEFORE = re.compile(r'(?:^|(?<=[^\w.]))([\w.]+?)\Z')
+
+
+def _is_sentence_end(text, m) -> bool:
+    """Does the punctuation in match `m` end a sentence?"""
+    end = m.end()
+    if end < len(text) and text[end].islower():  # e.g., 'approx. three'
+        return False
+    if text[m.start('punct')] != '.' or '\n' in m.group('space'):
+        return True
+    word = _WORD_BEFORE.search(text, max(0, m.start() - 20), m.start())
+    if word is None:
+        return True
+    line_start = text.rfind('\n', 0, word.start()) + 1
+    if word.group(1).isdigit() and not text[line_start:word.start()].strip():  # numbered list item
+        return False
+    word = word.group(1)
+    if len(word) == 1 and word.isalpha():  # initial
+        return False
+    if '.' in word:  # e.g., 'e.g', 'p.o'
+        return False
+    return word.lower() not in ABBREVIATIONS
+
+
+def fast_ssplit_spans(text: str) -> Tuple[int, int]:
+    """(start, end) of each sentence in `fast_ssplit`, without copying the text"""
+    start = 0
+    for m in FAST_SSPLIT_BOUNDARY.finditer(text):
+        if m.group('punct') is not None and not _is_sentence_end(text, m):
+            continue
+        end = m.end()
+        if end > start:
+            yield start, end
+            start = end
+    if start < len(text):
+        yield start, len(text)
+
+
+def fast_ssplit(text: str) -> Tuple[str, int, int]:
+    """Split text into sentences with precompiled regexes, keeping exact offsets into text
+
+    Each sentence is text[start:end] (including trailing whitespace), so offsets are always
+        faithful to text. Sentences end at end-of-sentence punctuation (except after common
+        clinical and other abbreviations or initials, or before a lowercase word), at blank lines,
+        and before lines beginning with a list item or a heading (e.g., 'PLAN:'). Single line
+        breaks within a sentence are ignored.
+    """
+    for start, end in fast_ssplit_spans(text):
+        yield text[start:end], start, end
+
+
+# sentences are exactly text[start:end]: `Sentences` can use views over the text
+fast_ssplit.spans = fast_ssplit_spans
+
+
 if syntok_segmenter:
+    try:  # sentence boundaries cached by `runrex.text.ssplit_cache` depend on the syntok version
+        syntok_ssplit.cache_key = f'syntok {metadata.version("syntok")}'
+    except metadata.PackageNotFoundError:
+        pass
     default_ssplit = syntok_ssplit
 else:
     default_ssplit = delim_ssplit
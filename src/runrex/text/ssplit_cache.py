@@ -0,0 +1,214 @@
+"""
+Opt-in, persistent (on-disk) cache of sentence boundaries.
+
+When the same corpus is processed many times (e.g., while developing patterns), each document's
+    sentences are loaded from the cache rather than split again. Entries are keyed by a hash of
+    the text and the identity of the splitter (see `splitter_id`): a change to the splitter's
+    module, arguments, or `cache_key` attribute (e.g., the syntok version) invalidates its entries.
+
+Each entry is a small binary file which can be memory-mapped: a header, (start, end) offsets as
+    int64, and, for splitters whose sentences are not exact slices of the text (e.g., `delim_ssplit`
+    normalises whitespace), the UTF-8 encoded sentences with their byte offsets.
+
+Enable with `SSPLIT_CACHE.enable(directory, max_bytes)` (or the `ssplit_cache` option in
+    `runrex.main.process`). Least recently used entries are removed when over `max_bytes`.
+"""
+import functools
+import hashlib
+import inspect
+import mmap
+import os
+import pathlib
+import struct
+import sys
+import tempfile
+from array import array
+
+from loguru import logger
+
+MAGIC = b'RSC1'
+HEADER = struct.Struct('<4sBxxxQ')  # magic, has_text, count
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+@functools.lru_cache(maxsize=None)
+def _module_hash(module_name) -> str:
+    try:
+        source = inspect.getsource(sys.modules[module_name])
+    except (KeyError, OSError, TypeError):
+        return ''
+    return hashlib.blake2b(source.encode('utf8'), digest_size=8).hexdigest()
+
+
+def splitter_id(ssplit) -> str:
+    """Identity of a sentence splitter: name, source of its module, arguments (for `functools.partial`),
+        and its `cache_key` attribute (if any)"""
+    parts = []
+    while isinstance(ssplit, functools.partial):
+        parts.append(f'{ssplit.args!r}{sorted(ssplit.keywords.items())!r}')
+        ssplit = ssplit.func
+    module = getattr(ssplit, '__module__', '')
+    parts.append(f'{module}.{getattr(ssplit, "__qualname__", repr(ssplit))}')
+    parts.append(_module_hash(module))
+    parts.append(str(getattr(ssplit, 'cache_key', '')))
+    return hashlib.blake2b('|'.join(parts).encode('utf8'), digest_size=8).hexdigest()
+
+
+def _encode(sentences, exact) -> bytes:
+    """
+    :param sentences: list of (sentence, start, end)
+    :param exact: sentences are exact slices of the text, so are not stored
+    """
+    offsets = array('q')
+    for _, start, end in sentences:
+        offsets.append(start)
+        offsets.append(end)
+    parts = [HEADER.pack(MAGIC, not exact, len(sentences)), offsets.tobytes()]
+    if not exact:
+        encoded = [sentence.encode('utf8') for sentence, _, _ in sentences]
+        positions = array('q', [0])
+        for data in encoded:
+            positions.append(positions[-1] + len(data))
+        parts.append(positions.tobytes())
+        parts.extend(encoded)
+    return b''.join(parts)
+
+
+def _decode(buffer) -> list:
+    """
+    Values are copied out of buffer (e.g., an `mmap`), so that it can be closed.
+
+    :return: list of (sentence or None if exact slice of the text, start, end)
+    :raises ValueError: if buffer is not a complete entry (e.g., truncated)
+    """
+    if len(buffer) < HEADER.size:
+        raise ValueError('Incomplete sentence cache entry')
+    magic, has_text, count = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError('Not a sentence cache entry')
+    pos = HEADER.size
+    offsets = _read_int64s(buffer, pos, 2 * count)
+    pos += 16 * count
+    if not has_text:
+        if pos != len(buffer):
+            raise ValueError('Sentence cache entry has the wrong size')
+        return [(None, offsets[2 * i], offsets[2 * i + 1]) for i in range(count)]
+    positions = _read_int64s(buffer, pos, count + 1)
+    pos += 8 * (count + 1)
+    if positions[0] != 0 or any(positions[i] > positions[i + 1] for i in range(count)) \
+            or pos + positions[-1] != len(buffer):
+        raise ValueError('Sentence cache entry has the wrong size')
+    return [
+        (buffer[pos + positions[i]:pos + positions[i + 1]].decode('utf8'), offsets[2 * i], offsets[2 * i + 1])
+        for i in range(count)
+    ]
+
+
+def _read_int64s(buffer, pos, count) -> array:
+    """Copy of `count` int64 values at buffer[pos:]"""
+    end = pos + 8 * count
+    if end > len(buffer):
+        raise ValueError('Incomplete sentence cache entry')
+    values = array('q')
+    values.frombytes(buffer[pos:end])
+    return values
+
+
+class SentenceCache:
+
+    def __init__(self):
+        self.enabled = False
+        self.directory = None
+        self.max_bytes = DEFAULT_MAX_BYTES
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+
+    def enable(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        :param directory: where to store entries (created if needed)
+        :param max_bytes: maximum total size of entries
+        """
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = sum(path.stat().st_size for path in self._iter_entries())
+        self.enabled = True
+        self._evict()
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        """Remove all entries"""
+        for path in self._iter_entries():
+            path.unlink()
+        self._size = 0
+
+    def info(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'bytes': self._size, 'max_bytes': self.max_bytes}
+
+    def _iter_entries(self):
+        return self.directory.glob('*/*.rsc')
+
+    def _path(self, text, ssplit) -> pathlib.Path:
+        digest = hashlib.blake2b(text.encode('utf8', 'surrogatepass'), digest_size=16).hexdigest()
+        return self.directory / splitter_id(ssplit) / f'{digest}.rsc'
+
+    def split(self, text, ssplit) -> list:
+        """Sentences of text (loaded from the cache, or split and stored)
+
+        :return: list of (sentence, start, end), where sentence is None if it is
+            text[start:end] (see `Sentence.view`)
+        """
+        path = self._path(text, ssplit)
+        try:
+            with open(path, 'rb') as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                sentences = _decode(buffer)
+            os.utime(path)  # most recently used
+            self.hits += 1
+            return sentences
+        except (OSError, ValueError, TypeError, IndexError, struct.error):  # e.g., corrupt or truncated
+            pass
+        self.misses += 1
+        if spans := getattr(ssplit, 'spans', None):
+            sentences = [(None, start, end) for start, end in spans(text)]
+        else:
+            sentences = list(ssplit(text))
+        self._store(path, _encode(sentences, exact=spans is not None))
+        return sentences
+
+    def _store(self, path, data):
+        try:
+            path.parent.mkdir(exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(data)
+            os.replace(tmp, path)  # concurrent processes never see a partial entry
+        except OSError as e:
+            logger.warning(f'Unable to write sentence cache entry {path}: {e}')
+            return
+        self._size += len(data)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        """Remove least recently used entries until under `max_bytes` (to 90%, to avoid evicting on every store)"""
+        if self._size <= self.max_bytes:
+            return
+        entries = sorted((path.stat().st_mtime, path.stat().st_size, path) for path in self._iter_entries())
+        self._size = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if self._size <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            self._size -= size
+
+
+SSPLIT_CACHE = SentenceCache()
@@ -0,0 +1,326 @@
+"""
+Documents too large to hold in memory (e.g., concatenated encounter exports of tens of megabytes).
+
+A `StreamingDocument` reads its source in chunks and splits sentences as it goes, so that memory is
+    bounded by the chunk size rather than by the size of the document. Each pass over the document
+    (iteration, or a search) reads the source again; sentences are not kept.
+
+Text is cleaned (see `runrex.text.preprocess`) in blocks of whole lines: as the default rules do not
+    cross a line break, the cleaned text is the same as a `Document`'s `new_text`. For a splitter
+    with exact offsets (`spans`, e.g., `fast_ssplit`), the last (possibly unfinished) sentence of
+    each block is split again along with the next block, so that sentences and their offsets are
+    those of `Document`; only a line or sentence longer than the chunk size is cut. Other splitters
+    (e.g., `syntok_ssplit`), whose offsets are not positions in the text, are run on pieces of the
+    text ending at a blank line: memory is then bounded by the longest paragraph rather than the
+    chunk size, and a splitter which does not end sentences at blank lines (e.g., `regex_ssplit`)
+    may give different sentences there. Prefer a splitter with `spans` (e.g., `fast_ssplit`).
+
+A `StreamingDocument` has the search methods of `Document` (with the same names and arguments),
+    so that algorithms need not distinguish the two; but they always search by sentence (e.g.,
+    `get_pattern`/`get_patterns`, and `has_pattern(by_sentence=False)`, which search the whole
+    text of a `Document`), so a match cannot cross a sentence boundary.
+"""
+import codecs
+import io
+import re
+from collections import deque
+from typing import Iterator, Optional
+
+from runrex.algo import MatchCask
+from runrex.algo.patternset import flatten_patterns
+from runrex.text.preprocess import DEFAULT_PREPROCESSOR, Preprocessor
+from runrex.text.section import Section
+from runrex.text.sentence import Sentence
+from runrex.text.ssplit import default_ssplit
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024  # characters
+NON_SPACE = re.compile(r'\S')
+
+
+class StreamingDocument:
+
+    def __init__(self, name, file=None, fh=None, text=None, encoding='utf8', ssplit=default_ssplit,
+                 chunk_size=DEFAULT_CHUNK_SIZE, preprocessor: Preprocessor = None):
+        """
+
+        :param name:
+        :param file: path to read (opened again for each pass)
+        :param fh: open file in text or binary mode, or `mmap.mmap`; returned to its
+            current position for each pass (if it cannot seek, only one pass is possible)
+        :param text: already in memory (e.g., to bound the work of splitting sentences)
+        :param encoding: of `file` or binary `fh`
+        :param ssplit: sentence splitter
+        :param chunk_size: number of characters read at once; also the longest line or sentence
+            (for a splitter with `spans`) held before it is cut
+        :param preprocessor: cleans each block of lines before it is split into sentences;
+            default: remove the history section and join headers to their content
+        """
+        if file is None and fh is None and not text:
+            raise ValueError(f'Missing text for {name}, file: {file}')
+        if chunk_size < 1:
+            raise ValueError(f'Chunk size must be positive: {chunk_size}')
+        self.name = name
+        self.file = file
+        self.fh = fh
+        self.text = text
+        self.encoding = encoding
+        self.matches = MatchCask()
+        self._ssplit = ssplit or default_ssplit
+        self.chunk_size = chunk_size
+        self.preprocessor = preprocessor or DEFAULT_PREPROCESSOR
+        self._fh_start = self._tell(fh)
+        self._passes = 0
+
+    @staticmethod
+    def _tell(fh):
+        try:
+            return fh.tell()
+        except (AttributeError, OSError):
+            return None
+
+    def _iter_chunks(self) -> Iterator[str]:
+        """Text of the source, `chunk_size` characters at a time"""
+        self._passes += 1
+        if self.file is not None:
+            with open(self.file, encoding=self.encoding) as fh:
+                yield from self._read(fh)
+        elif self.fh is not None:
+            if self._passes > 1:
+                if self._fh_start is None:
+                    raise ValueError(f'Unable to read {self.name} again: file cannot seek')
+                self.fh.seek(self._fh_start)
+            yield from self._read(self.fh)
+        else:
+            for i in range(0, len(self.text), self.chunk_size):
+                yield self.text[i:i + self.chunk_size]
+
+    def _read(self, fh) -> Iterator[str]:
+        decoder = None  # for bytes: decode, translating newlines as in text mode
+        while data := fh.read(self.chunk_size):
+            if isinstance(data, str):
+                yield data
+                continue
+            if decoder is None:
+                decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder(self.encoding)(), translate=True)
+            yield decoder.decode(data)
+        if decoder is not None:
+            yield decoder.decode(b'', final=True)
+
+    def _iter_blocks(self) -> Iterator[str]:
+        """Cleaned text in blocks of whole lines (a line is only cut if longer than `chunk_size`)"""
+        rest = ''
+        for chunk in self._iter_chunks():
+            rest += chunk
+            cut = rest.rfind('\n') + 1
+            if not cut and len(rest) >= self.chunk_size:
+                cut = len(rest)
+            if cut:
+                yield self.preprocessor(rest[:cut])
+                rest = rest[cut:]
+        if rest:
+            yield self.preprocessor(rest)
+
+    def _iter_pieces(self) -> Iterator[tuple]:
+        """Yield (cleaned text, offset in the cleaned document, (start, end) of sentences in text or None)
+
+        The sentences in each piece are final: for a splitter with `spans`, the last sentence
+            of a block is held back to be split with the next; other splitters are only given
+            text ending at a blank line (so pieces are as long as the longest paragraph).
+        """
+        spans = getattr(self._ssplit, 'spans', None)
+        pending = ''
+        base = 0  # offset of pending in the cleaned document
+        for block in self._iter_blocks():
+            pending += block
+            if spans:
+                bounds = list(spans(pending))
+                keep = bounds[-1][0] if bounds else len(pending)
+                if len(pending) - keep >= self.chunk_size:  # sentence too long to hold: cut here
+                    keep = len(pending)
+                if keep:
+                    yield pending, base, bounds if keep == len(pending) else bounds[:-1]
+            else:  # offsets may not be positions in pending: only cut at a paragraph break
+                keep = pending.rfind('\n\n', max(len(pending) - len(block) - 1, 0)) + 2
+                if keep >= 2:
+                    yield pending[:keep], base, None
+                else:
+                    keep = 0
+            pending = pending[keep:]
+            base += keep
+        if pending:
+            yield pending, base, list(spans(pending)) if spans else None
+
+    def __iter__(self) -> Iterator[Sentence]:
+        """Sentences with offsets in the cleaned document (as `Document.sentences`), read as needed"""
+        for text, base, bounds in self._iter_pieces():
+            if bounds is None:
+                for s, start, end in self._ssplit(text):
+                    if s and not s.isspace():
+                        yield Sentence(s, self.matches, base + start, base + end)
+            else:
+                for start, end in bounds:
+                    if NON_SPACE.search(text, start, end):
+                        yield Sentence(text[start:end], self.matches, base + start, base + end)
+
+    @property
+    def sentences(self) -> 'StreamingSentences':
+        """Search sentences as `Document.sentences` (without `len` or indexing)"""
+        return StreamingSentences(self)
+
+    def has_pattern(self, pat, ignore_negation=False, by_sentence=True):
+        """Text of the first sentence with the pattern (reading no further), or False
+
+        Sentences are always searched: `by_sentence=False` (searching the whole text in
+            `Document.has_pattern`) only changes the result to a bool.
+        """
+        for sentence in self:
+            if sentence.has_pattern(pat, ignore_negation=ignore_negation):
+                return sentence.text if by_sentence else True
+        return False
+
+    def has_patterns(self, *pats, has_all=False, ignore_negation=False, by_sentence=True):
+        """As `Document.has_patterns`, searching sentences (whatever `by_sentence`) and reading
+            the document at most once"""
+        remaining = list(flatten_patterns(pats))
+        if has_all and not remaining:
+            return True
+        for sentence in self:
+            if not has_all:
+                if sentence.has_patterns(*remaining, ignore_negation=ignore_negation):
+                    return True
+                continue
+            remaining = [pat for pat in remaining if not sentence.has_pattern(pat, ignore_negation=ignore_negation)]
+            if not remaining:
+                return True
+        return False
+
+    def get_pattern(self, pat, index=0, get_indices=False):
+        """Group of the first match in any sentence (as `Document.sentences.get_pattern`)
+
+        Unlike `Document.get_pattern`, which searches the original text as a whole, sentences
+            of the cleaned text are searched (so a match cannot cross a sentence boundary, and
+            offsets are in the cleaned text).
+
+        :param pat:
+        :param index:
+        :param get_indices: if True, return (group, start, end)
+        :return:
+        """
+        for sentence in self:
+            if m := sentence.get_pattern(pat, index=index, get_indices=get_indices):
+                return m  # tuple if requested indices
+
+    def get_patterns(self, *pats, index=0, names=None):
+        """Group of the first pattern (in the order given) found in any sentence, searching the
+            document once
+
+        As `Document.get_patterns`, but searching sentences of the cleaned text rather than the
+            original text as a whole (see `get_pattern`).
+
+        :param pats: `Pattern` or `PatternSet`
+        :param index:
+        :param names: if included, return name of matched pattern
+            list same length as number of patterns (after expanding any `PatternSet`)
+        :return:
+        """
+        pats = list(flatten_patterns(pats))
+        best = len(pats)  # index of the earliest pattern found so far
+        found = None
+        for sentence in self:
+            for i, pat in enumerate(pats[:best]):
+                if m := sentence._matches(pat):
+                    best, found = i, m
+                    break
+            if best == 0:
+                break
+        if found is None:
+            return None
+        self.matches.add(found)
+        if not isinstance(index, (list, tuple)):
+            index = (index,)
+        res = found.group(*index)
+        if names:
+            return res, names[best]
+        return res
+
+    def iter_sentence_by_pattern(self, *pats, ignore_negation=None, has_all=False) -> Iterator[Sentence]:
+        for sentence in self:
+            if sentence.has_patterns(*pats, ignore_negation=ignore_negation, has_all=has_all):
+                yield sentence
+
+    @staticmethod
+    def _is_selected(sentence, pats, negation=None, has_all=False) -> bool:
+        if not sentence.has_patterns(*pats, has_all=has_all):
+            return False
+        return not (negation and sentence.has_patterns(*negation))
+
+    def select_sentences_with_patterns(self, *pats, negation=None, has_all=False,
+                                       neighboring_sentences=0) -> Iterator[Section]:
+        """As `Document.select_sentences_with_patterns`, keeping only the sentences which may
+            neighbour a selected sentence (each section is yielded once the sentences after it are read)"""
+        reach = max(neighboring_sentences - 1, 0)
+        window = deque(maxlen=2 * reach + 1)  # (index, sentence) of the most recent sentences
+        pending = deque()  # indices of selected sentences waiting for the sentences after them
+        for i, sentence in enumerate(self):
+            window.append((i, sentence))
+            if self._is_selected(sentence, pats, negation=negation, has_all=has_all):
+                pending.append(i)
+            while pending and pending[0] + reach <= i:
+                yield self._section(window, pending.popleft(), reach)
+        while pending:
+            yield self._section(window, pending.popleft(), reach)
+
+    def _section(self, window, index, reach) -> Section:
+        return Section([sentence for i, sentence in window if abs(i - index) <= reach], self.matches)
+
+    def select_all_sentences_with_patterns(self, *pats, negation=None, has_all=False, get_range=False,
+                                           neighboring_sentences=0) -> Optional[Section]:
+        """As `Document.select_all_sentences_with_patterns`, reading the document once and keeping
+            only the sentences returned"""
+        reach = max(neighboring_sentences - 1, 0)
+        recent = deque(maxlen=reach + 1)  # (index, sentence): the sentences a selected sentence may add
+        kept = {}  # index -> sentence
+        last = None  # index of the last selected sentence
+        for i, sentence in enumerate(self):
+            recent.append((i, sentence))
+            if self._is_selected(sentence, pats, negation=negation, has_all=has_all):
+                kept.update(recent)
+                last = i
+            elif last is not None and (get_range or i - last <= reach):
+                kept[i] = sentence
+        if not kept:
+            return None
+        return Section([kept[i] for i in sorted(kept) if i <= last + reach], self.matches)
+
+    def clear_memo(self):
+        """Nothing to forget: sentences (and their search results) are not kept"""
+
+    def __repr__(self):
+        return f'StreamingDocument({self.name!r})'
+
+
+class StreamingSentences:
+
+    def __init__(self, document: StreamingDocument):
+        """
+        Sentences of a `StreamingDocument`, searched as `Sentences` (each search reads the document again).
+
+        :param document:
+        """
+        self.document = document
+
+    def has_pattern(self, pat, ignore_negation=False):
+        return self.document.has_pattern(pat, ignore_negation=ignore_negation)
+
+    def has_patterns(self, *pats, has_all=False, ignore_negation=False):
+        return self.document.has_patterns(*pats, has_all=has_all, ignore_negation=ignore_negation)
+
+    def get_pattern(self, pat, index=0, get_indices=False):
+        return self.document.get_pattern(pat, index=index, get_indices=get_indices)
+
+    def get_patterns(self, *pats, index=0, return_negation=False):
+        for sentence in self.document:
+            yield from sentence.get_patterns(*pats, index=index, return_negation=return_negation)
+
+    def __iter__(self) -> Iterator[Sentence]:
+        return iter(self.document)
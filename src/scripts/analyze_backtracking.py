@@ -0,0 +1,13 @@
+"""
+Find `Pattern`s prone to catastrophic backtracking, and time each risky regex against adversarial strings.
+"""
+
+from runrex.cli.analyze_backtracking import analyze_backtracking_cli
+
+
+def main():
+    analyze_backtracking_cli()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,13 @@
+"""
+Compare sentence splitters: throughput, and agreement of sentence boundaries with a reference splitter.
+"""
+
+from runrex.cli.benchmark_ssplit import benchmark_ssplit_cli
+
+
+def main():
+    benchmark_ssplit_cli()
+
+
+if __name__ == '__main__':
+    main()
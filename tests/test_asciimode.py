@@ -0,0 +1,67 @@
+import random
+import re
+
+import pytest
+
+from runrex.algo import Pattern
+from runrex.algo.asciimode import ascii_equivalent
+from runrex.algo.casefold import FoldedRegex
+from runrex.terms import boilerplate, possible, negation, hypothetical, historical
+
+WORDS = ['Back', 'PAIN', 'pain', 'No', 'possibly', 'POSSIBLE', 'Due to', 'Appt', 'R/O', 'if', '12', ':', '-',
+         'doctor', 'worried', 'sKin', 'x_y']
+
+
+@pytest.mark.parametrize('pattern, expected', [
+    (r'\bback\W?pain\b', True),
+    (r'[a-z\d]+(?=x)', True),
+    (r'\s+', False),  # unicode \s matches \x1c-\x1f
+    (r'[^\S]', False),
+    ('K', False),  # Kelvin sign matches 'k' when ignoring case
+    (r'caf\xe9', False),
+    (r'(?a)x', False),
+])
+def test_ascii_equivalent(pattern, expected):
+    assert ascii_equivalent(pattern, re.IGNORECASE) is expected
+
+
+@pytest.mark.parametrize('pattern', [
+    boilerplate, possible, negation, hypothetical, historical, r'\w+\W?pain', r'\bk\w*', r'[a-z]+_',
+])
+@pytest.mark.parametrize('casefold', [False, True])
+def test_equivalent(pattern, casefold):
+    fast = Pattern(pattern, casefold=casefold)
+    unicode = Pattern(pattern, casefold=casefold, ascii_mode=False)
+    assert fast._get_ascii_pattern() is not None
+    rand = random.Random(0)
+    for _ in range(200):
+        text = ' '.join(rand.choice(WORDS) for _ in range(8))
+        expected = [(m.group(), m.start(), m.end(), m.groups()) for m in unicode.finditer(text, offset=3)]
+        assert [(m.group(), m.start(), m.end(), m.groups()) for m in fast.finditer(text, offset=3)] == expected
+
+
+def test_unicode_fallback():
+    pat = Pattern(r'caf\w+')
+    assert pat.matches('a cafe').group() == 'cafe'
+    assert pat.matches('un café').group() == 'café'
+    assert pat._get_ascii_pattern().flags & re.ASCII
+
+
+def test_casefold_ascii():
+    pat = Pattern(r'chest\W+pain', casefold=True)
+    ascii_regex = pat._get_ascii_pattern()
+    assert isinstance(ascii_regex, FoldedRegex)
+    assert ascii_regex.flags & re.ASCII and not ascii_regex.flags & re.IGNORECASE
+    assert pat.matches('CHEST - Pain').group() == 'CHEST - Pain'
+
+
+def test_not_applicable():
+    assert Pattern(r'\s+pain')._get_ascii_pattern() is None
+    assert Pattern('pain', ascii_mode=False).matches('pain')
+
+
+def test_regex_backend():
+    pytest.importorskip('regex')
+    pat = Pattern(r'\bpain\b', backend='regex')
+    assert pat.matches('back pain').group() == 'pain'
+    assert pat.matches('back ÿpain') is False
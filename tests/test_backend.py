@@ -0,0 +1,48 @@
+import pytest
+
+from runrex.algo import Pattern
+from runrex.algo.backend import get_backend, available_backends
+from runrex.algo.registry import set_default_backend
+
+
+@pytest.fixture
+def reset_backend():
+    yield
+    set_default_backend('re')
+
+
+def test_default_backend():
+    assert 're' in available_backends()
+    pat = Pattern('backend (default|test)')
+    assert pat.matches('a backend test').group() == 'backend test'
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_backend('unknown')
+
+
+def test_regex_backend_timeout(reset_backend):
+    pytest.importorskip('regex')
+    pat = Pattern('(a|aa)+$', backend='regex', timeout=0.05)
+    assert pat.matches('a' * 40 + '!') is False  # timed out
+    assert pat.matches('aaaa').group() == 'aaaa'
+    assert list(pat.finditer('a' * 40 + '!')) == []
+    assert pat.sub('', 'a' * 40 + '!') == 'a' * 40 + '!'
+    assert pat.next('a' * 40 + '!') == 'a' * 40 + '!'
+
+
+def test_default_backend_with_timeout(reset_backend):
+    pytest.importorskip('regex')
+    pat = Pattern('(b|bb)+$', negates=['not'])
+    assert pat.matches('bb').group() == 'bb'  # compiled with `re`
+    set_default_backend('regex', timeout=0.05)
+    assert pat.matches('b' * 40 + '!') is False  # recompiled with `regex`: timed out
+    assert pat.matches('not bb') is False
+
+
+def test_re2_backend_fallback(reset_backend):
+    pytest.importorskip('re2')
+    set_default_backend('re2')
+    assert Pattern('backend re2 test').matches('BACKEND re2 test').match == 'BACKEND re2 test'
+    assert Pattern('(?<=a)backend').matches('abackend').match == 'backend'  # lookbehind: uses re
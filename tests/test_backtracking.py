@@ -0,0 +1,52 @@
+import re
+
+import pytest
+
+from runrex.anlz.backtracking import analyze_regex, growth_curve, NESTED, ALTERNATION, ADJACENT
+from runrex.cli.analyze_backtracking import analyze_backtracking
+
+
+@pytest.mark.parametrize('pattern, kind', [
+    (r'(\w+\W?)+x', NESTED),
+    (r'history\W?of\W?(\w+\W?)+pain', NESTED),
+    (r'(\w+|\d+)*x', ALTERNATION),
+    (r'\w*\W?\w*\W?\w*!', ADJACENT),
+])
+def test_risky_regex(pattern, kind):
+    findings = analyze_regex(pattern, re.IGNORECASE)
+    assert [f.kind for f in findings] == [kind]
+
+
+@pytest.mark.parametrize('pattern', [
+    r'(\w+\s)+', r'\d+\s*\w+', r'(ab+)+c', r'(?:a|b)*', r'(\w+\W?){1,3}', r'hist\w*',
+])
+def test_safe_regex(pattern):
+    assert analyze_regex(pattern, re.IGNORECASE) == []
+
+
+def test_adjacent_degree():
+    findings = analyze_regex(r'\w*\W?\w*\W?\w*!')
+    assert findings[0].degree == 3
+
+
+def test_growth_curve():
+    pattern = r'(\w+\W?)+x'
+    finding = analyze_regex(pattern)[0]
+    suffix, curve = growth_curve(pattern, 0, finding, max_seconds=0.01)
+    assert not re.search(pattern, finding.prefix + finding.pump * curve[0][0] + suffix)
+    sizes = [size for size, _ in curve]
+    assert sizes == sorted(sizes)
+
+
+def test_analyze_backtracking(tmp_path, monkeypatch):
+    (tmp_path / 'risky_patterns.py').write_text(
+        'from runrex.algo import Pattern\n'
+        "SAFE = Pattern('safe pattern')\n"
+        "RISKY = [Pattern('history of (\\\\w+ )+ pain', negates=['not'])]\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    outpath = tmp_path / 'report.md'
+    flagged = analyze_backtracking(['risky_patterns'], outpath, benchmark=False)
+    assert len(flagged) == 1
+    assert flagged[0][2] == ['risky_patterns.RISKY[0] pattern']
+    assert NESTED in outpath.read_text()
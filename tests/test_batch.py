@@ -0,0 +1,90 @@
+import pytest
+
+from runrex.algo import Pattern
+from runrex.text import Document
+from runrex.text.batch import DocumentBatch, is_packable, iter_batches
+from runrex.text.ssplit import delim_ssplit
+
+TEXTS = [
+    'Patient has a history of back pain.\nNo chest pain today.',
+    'Denies back pain.\nChest pain and back pain noted.\nPain',
+    'pain\nback\npain back pain',
+    'Nothing relevant here.',
+]
+
+
+def get_batch():
+    return DocumentBatch([(f'doc{i}', text) for i, text in enumerate(TEXTS)], ssplit=delim_ssplit)
+
+
+def per_sentence(pat, method, **kwargs):
+    results = []
+    for i, text in enumerate(TEXTS):
+        doc = Document(f'doc{i}', text=text, ssplit=delim_ssplit)
+        for sentence in doc:
+            if method == 'matches':
+                found = [pat.matches(sentence.text, offset=sentence.start, **kwargs)]
+            else:
+                found = list(pat.finditer(sentence.text, offset=sentence.start, **kwargs))
+            for m in found:
+                if m:
+                    results.append((doc.name, sentence.text, m.group(), m.start(), m.end(), type(m)))
+    return results
+
+
+def batched(pat, method, **kwargs):
+    batch = get_batch()
+    return [
+        (doc.name, sentence.text, m.group(), m.start(), m.end(), type(m))
+        for doc, sentence, m in getattr(batch, method)(pat, **kwargs)
+    ]
+
+
+PATTERNS = [
+    Pattern(r'back pain'),
+    Pattern(r'(back|chest) pain', negates=['no', 'denies']),
+    Pattern(r'pain', requires_pre=['back']),
+    Pattern(r'pain\W+back'),  # crosses sentences
+    Pattern(r'\bpain\b'),
+    Pattern(r'^pain'),  # not packable
+    Pattern(r'(?<=back.)pain'),  # not packable
+]
+
+
+@pytest.mark.parametrize('pat', PATTERNS)
+@pytest.mark.parametrize('method', ['matches', 'finditer'])
+@pytest.mark.parametrize('return_negation', [False, True])
+def test_batch_equivalent(pat, method, return_negation):
+    assert batched(pat, method, return_negation=return_negation) == per_sentence(
+        pat, method, return_negation=return_negation)
+
+
+@pytest.mark.parametrize('pattern, expected', [
+    (r'back pain', True),
+    (r'\bpain\b', True),
+    (r'^pain', False),
+    (r'pain$', False),
+    (r'(?<!no )pain', False),
+    (r'(a)\1', False),
+    (r'\w*', False),
+])
+def test_is_packable(pattern, expected):
+    assert is_packable(pattern) is expected
+
+
+def test_sentence_uses_batch():
+    batch = get_batch()
+    pat = Pattern('chest pain', negates=[r'\bno\b'])
+    found = [sentence.text for doc in batch for sentence in doc if sentence.has_pattern(pat)]
+    assert found == ['Chest pain and back pain noted.']
+    assert len(batch._results) == 1
+
+
+def test_iter_batches():
+    batches = list(iter_batches(TEXTS, 3))
+    assert [len(batch) for batch in batches] == [3, 1]
+
+
+def test_bad_separator():
+    with pytest.raises(ValueError):
+        DocumentBatch(TEXTS, separator='x')
@@ -0,0 +1,67 @@
+import pytest
+
+from runrex.algo import Pattern, Negation
+from runrex.algo.cache import PATTERN_CACHE
+from runrex.text import Sentence
+
+
+@pytest.fixture
+def cache():
+    PATTERN_CACHE.enable(maxsize=3)
+    yield PATTERN_CACHE
+    PATTERN_CACHE.disable()
+    PATTERN_CACHE.clear()
+
+
+def test_matches_rebased(cache):
+    pat = Pattern('cached pain')
+    first = pat.matches('has cached pain', offset=10)
+    second = pat.matches('has cached pain', offset=100)
+    assert (first.start(), first.end()) == (14, 25)
+    assert (second.start(), second.end()) == (104, 115)
+    assert second.group() == 'cached pain'
+    assert cache.info()['hits'] == 1
+    assert cache.info()['misses'] == 1
+    assert pat.match_count == 2
+
+
+def test_finditer_rebased(cache):
+    pat = Pattern('repeat')
+    text = 'repeat and repeat'
+    assert [m.start() for m in pat.finditer(text, offset=5)] == [5, 16]
+    assert [m.start() for m in pat.finditer(text, offset=50)] == [50, 61]
+    assert cache.hits == 1
+
+
+def test_negation_rebased(cache):
+    pat = Pattern('cached pain', negates=['no'])
+    pat.matches('no cached pain', return_negation=True)
+    m = pat.matches('no cached pain', offset=20, return_negation=True)
+    assert isinstance(m, Negation)
+    assert m.start() == 23
+    assert m.neg_start() == 0
+    assert not pat.matches('no cached pain')
+    assert cache.misses == 2
+
+
+def test_sentences_share_cache(cache):
+    pat = Pattern('boilerplate')
+    for start in (0, 40):
+        sentence = Sentence('boilerplate text', start=start)
+        assert sentence.get_pattern(pat, get_indices=True) == ('boilerplate', start, start + 11)
+    assert cache.hits == 1
+
+
+def test_lru_bounded(cache):
+    pat = Pattern('lru')
+    for i in range(5):
+        pat.matches(f'lru {i}')
+    assert len(cache) == 3
+    pat.matches('lru 0')
+    assert cache.hits == 0
+
+
+def test_disabled():
+    PATTERN_CACHE.clear()
+    Pattern('not cached').matches('not cached')
+    assert len(PATTERN_CACHE) == 0
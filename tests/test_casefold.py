@@ -0,0 +1,78 @@
+import random
+import re
+
+import pytest
+
+from runrex.algo import Pattern
+from runrex.algo.casefold import FoldedRegex, fold_regex
+from runrex.terms import boilerplate, possible, negation, hypothetical, historical
+from runrex.text import Document, Sentence
+
+WORDS = ['Back', 'PAIN', 'pain', 'İstanbul', 'Kelvin', 'STRASSE', 'straße', 'ſ', 'Σ', 'ς', 'σ', 'x-ray', 'No',
+         'possibly', 'POSSIBLE', 'Due to', 'Appt', 'R/O', 'if', 'É', 'é', '12', ':', 'doctor', 'worried']
+
+
+@pytest.mark.parametrize('pattern, expected', [
+    (r'\b(Back|CHEST) pain\b', r'\b(back|chest) pain\b'),
+    (r'[A-Z]+\d', r'[a-z]+\d'),
+    (r'[^a-zA-Z0-9]', r'[^0-9a-z]'),
+    (r'(?P<Name>Foo)(?P=Name)', r'(?P<Name>foo)(?P=Name)'),
+    (r'[!-~]', r'[!-@\[-~]'),
+    (r'\W\S\É', r'\W\S\é'),
+    (r'(?i)x', None),  # inline flags
+    (r'\x41', None),  # character codes
+])
+def test_fold_regex(pattern, expected):
+    assert fold_regex(pattern, re.IGNORECASE) == expected
+
+
+def test_fold_regex_requires_ignorecase():
+    assert fold_regex('abc', 0) is None
+    assert fold_regex('abc', re.IGNORECASE | re.ASCII) is None
+
+
+@pytest.mark.parametrize('pattern', [
+    boilerplate, possible, negation, hypothetical, historical,
+    r'(back|chest)\W+pain', r'[a-zé]+', r'[^A-Z\s]+', r'(?P<w>\w)(?P=w)', r'stra(ss|ß)e', r'[k-s]+', 'σ', 'i',
+])
+def test_equivalent(pattern):
+    folded = Pattern(pattern, casefold=True)
+    original = Pattern(pattern)
+    assert isinstance(folded.pattern, FoldedRegex)
+    rand = random.Random(0)
+    for _ in range(200):
+        text = ' '.join(rand.choice(WORDS) for _ in range(8))
+        expected = [(m.group(), m.start(), m.end(), m.groups()) for m in original.finditer(text, offset=3)]
+        found = [(m.group(), m.start(), m.end(), m.groups()) for m in folded.finditer(text, offset=3)]
+        assert found == expected, text
+
+
+def test_matches_original_text():
+    pat = Pattern(r'(?P<part>back|chest) pain', casefold=True, negates=['no'])
+    m = pat.matches('Has BACK Pain', offset=10)
+    assert m.group() == 'BACK Pain'
+    assert m.group('part') == 'BACK'
+    assert (m.start(), m.end()) == (14, 23)
+    assert not pat.matches('No back pain')
+    assert pat.compiled_text == r'(?P<part>back|chest)\W?pain'
+    assert pat.sub('', 'a Back Pain b') == 'a  b'
+
+
+def test_not_rewritten():
+    assert not isinstance(Pattern('(?i)abc', casefold=True).pattern, FoldedRegex)
+    assert not isinstance(Pattern('abc', casefold=True, flags=0).pattern, FoldedRegex)
+
+
+def test_sentence_shares_folded_text():
+    sentence = Sentence('Chest PAIN and Back pain')
+    pats = [Pattern('chest pain', casefold=True), Pattern('back pain', casefold=True)]
+    assert sentence.has_patterns(*pats, has_all=True)
+    assert sentence.folded == 'chest pain and back pain'
+    assert sentence.context.folded is sentence.folded
+
+
+def test_document():
+    doc = Document('doc', text='Nothing.\nCHEST pain noted.')
+    assert doc.get_pattern(Pattern('chest pain', casefold=True)) == 'CHEST pain'
+    assert doc.has_pattern(Pattern('chest pain', casefold=True), by_sentence=False)
+    assert doc.folded == 'nothing.\nchest pain noted.'
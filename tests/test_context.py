@@ -0,0 +1,67 @@
+import re
+
+import pytest
+
+from runrex.algo import Pattern
+from runrex.algo.context import ContextSpans
+from runrex.text import Sentence
+
+
+def test_context_first_within():
+    context = ContextSpans('no pain, no fever, but cough')
+    negation = re.compile(r'\bno\b')
+    assert context.first_within(negation, 0, 8).span() == (0, 2)
+    assert context.first_within(negation, 1, 8) is None
+    assert context.first_within(negation, 1).span() == (9, 11)
+    assert context.first_within(negation, 10) is None
+    assert context.found(negation)
+    assert not context.found(re.compile('headache'))
+
+
+@pytest.mark.parametrize('negation, text', [
+    ('denies.*', 'denies pain'),
+    (r'no\W*\w*', 'no pain'),
+    (r'no\W*\w*', 'nothing, no pain'),
+])
+def test_greedy_context(negation, text):
+    assert not Pattern('pain', negates_pre=[negation]).matches(text)
+    assert Pattern('pain', negates_post=[negation]).matches(text)
+
+
+def test_context_first_within_crossing():
+    context = ContextSpans('denies pain today')
+    regex = re.compile('denies.*')
+    assert context.first_within(regex, 0, 7).span() == (0, 7)
+    assert context.first_within(regex, 1, 7) is None
+
+
+@pytest.mark.parametrize('pat, text, negated', [
+    (Pattern('pain', negates_pre=[r'\bno\W*$']), 'no pain today', True),
+    (Pattern('pain', negates_pre=[r'\bno\W*$']), 'no cough, pain today', False),
+    (Pattern('pain', negates_pre=[r'^\W*no\b']), 'no pain today', True),
+    (Pattern('pain', negates_post=[r'^\W*free']), 'pain free.', True),
+    (Pattern('pain', negates_post=[r'^\W*free']), 'pain, then free.', False),
+    (Pattern('pain', negates_post=[r'\Afree|free\Z']), 'pain free', True),
+    (Pattern('pain', negates_pre=[r'no(?= pain)']), 'no pain today', False),  # lookahead stops at the region
+    (Pattern('pain', negates=[r'free$']), 'pain free', True),
+])
+def test_anchored_context(pat, text, negated):
+    assert bool(pat.matches(text)) is not negated
+    assert bool(list(pat.finditer(text))) is not negated
+    assert bool(pat.matches(text, return_negation=True)) is True
+
+
+def test_anchored_context_positions():
+    m = Pattern('pain', negates_post=[r'^\W*(free)']).matches('pain free.', return_negation=True)
+    assert (m.neg_group(), m.neg_group(1), m.neg_start(1)) == (' free', 'free', 5)
+
+
+def test_context_shared_across_patterns():
+    sentence = Sentence('no pain, no fever, but cough')
+    results = list(sentence.get_patterns(
+        Pattern('pain', negates_pre=[r'\bno\b']),
+        Pattern('fever', negates_pre=[r'\bno\b']),
+        Pattern('cough', negates_pre=[r'\bno\b'], negates_window=10),
+    ))
+    assert results == [('cough', 23, 28)]
+    assert len(sentence.context) == 1  # negation only run once
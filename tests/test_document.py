@@ -0,0 +1,83 @@
+from runrex.algo import Pattern
+from runrex.text import Document
+from runrex.text.ssplit import delim_ssplit, keep_offsets_ssplit
+
+
+class CountingSsplit:
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text):
+        self.calls += 1
+        yield from delim_ssplit(text)
+
+
+def test_document_level_search_does_not_split():
+    ssplit = CountingSsplit()
+    doc = Document('doc', text='Back pain.\nHISTORY: old pain PLAN: rest', ssplit=ssplit)
+    assert doc.get_pattern(Pattern('back pain')) == 'Back pain'
+    assert doc.has_pattern(Pattern('old pain'), by_sentence=False)
+    assert ssplit.calls == 0
+
+
+def test_sentences_split_once():
+    ssplit = CountingSsplit()
+    doc = Document('doc', text='Back pain.\nHISTORY: old pain PLAN: rest', ssplit=ssplit)
+    assert doc.has_pattern(Pattern('back pain'))
+    assert not doc.has_pattern(Pattern('old pain'))  # history section is removed
+    assert [sentence.text for sentence in doc] == ['Back pain.', 'PLAN: rest']
+    assert doc.sentences is doc.sentences
+    assert ssplit.calls == 1
+
+
+def test_section_text_is_lazy():
+    doc = Document('doc', text='Back pain.\nNothing else.', ssplit=delim_ssplit)
+    section = next(doc.select_sentences_with_patterns(Pattern('back pain')))
+    assert section._text is None
+    assert section
+    assert section.text == 'Back pain.'
+
+
+class CountingPattern(Pattern):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+
+    def matches(self, text, *args, **kwargs):
+        self.calls += 1
+        return super().matches(text, *args, **kwargs)
+
+
+def neighbor_doc():
+    text = 'Back pain.\nNo fever.\nChest pain.\nBack pain no more.\nRest.'
+    return Document('doc', text=text, ssplit=keep_offsets_ssplit)
+
+
+def test_select_sentences_with_neighbors():
+    doc = neighbor_doc()
+    sections = doc.select_sentences_with_patterns(Pattern('back pain'), negation=[Pattern('no more')],
+                                                  neighboring_sentences=2)
+    assert [section.text for section in sections] == ['Back pain.\nNo fever.']
+
+
+def test_select_all_sentences_without_duplicates():
+    doc = neighbor_doc()
+    section = doc.select_all_sentences_with_patterns(Pattern('pain'), neighboring_sentences=2)
+    assert [sentence.text for sentence in section.sentences] == [
+        'Back pain.', 'No fever.', 'Chest pain.', 'Back pain no more.', 'Rest.',
+    ]
+    section = doc.select_all_sentences_with_patterns(Pattern('back'), Pattern('pain'), has_all=True)
+    assert [sentence.text for sentence in section.sentences] == ['Back pain.', 'Back pain no more.']
+    section = doc.select_all_sentences_with_patterns(Pattern('fever'), Pattern('rest'), get_range=True)
+    assert len(section.sentences) == 4
+
+
+def test_hit_index_shares_searches():
+    doc = neighbor_doc()
+    pat = CountingPattern('pain')
+    list(doc.select_sentences_with_patterns(pat, neighboring_sentences=1))
+    doc.select_all_sentences_with_patterns(pat, negation=[pat])
+    assert pat.calls == len(doc.sentences)
+    assert doc.hit_index.indices(doc.hit_index.select(pat, negation=[Pattern('no')])) == [0, 2]
@@ -0,0 +1,34 @@
+import re
+
+import pytest
+
+from runrex.algo.literals import required_literals, fold_text, LiteralScanner
+
+
+@pytest.mark.parametrize(('pattern', 'exp'), [
+    (r'(burden|debt)', {'burden', 'debt'}),
+    (r'debt\W?collect(or|ion)', {'collector', 'collection'}),
+    (r'\bPAIN\b', {'pain'}),
+    (r'colou?r', {'color', 'colour'}),
+    (r'(?:\d+ (?:year|yr)s? ago)', {' year ago', ' years ago', ' yr ago', ' yrs ago'}),
+    (r'\w+', None),
+    (r'a|bc', None),  # too short
+    (r'(this|\w+)', None),
+])
+def test_required_literals(pattern, exp):
+    literals = required_literals(pattern, re.IGNORECASE)
+    if exp is None:
+        assert literals is None
+    else:
+        assert literals == exp
+
+
+def test_fold_text_matches_ignorecase():
+    assert fold_text('PAİN ſick') == 'pain sick'
+    assert re.search('sick', 'ſick', re.IGNORECASE)
+
+
+def test_literal_scanner_overlapping():
+    scanner = LiteralScanner(['collect', 'lection', 'lect', 'ion'])
+    assert scanner.scan('Collection') == {'collect', 'lection', 'lect', 'ion'}
+    assert scanner.scan('nothing') == set()
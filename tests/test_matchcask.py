@@ -0,0 +1,102 @@
+import pytest
+
+from runrex.algo import MatchCask, Negation, Pattern, TermSet
+from runrex.algo.match import SpanMatch
+from runrex.text import Document, Section, Sentence
+from runrex.text.batch import DocumentBatch
+from runrex.text.ssplit import keep_offsets_ssplit
+
+
+def describe(m):
+    groups = m.matchobj.groups()
+    result = (type(m), m.group(), groups, [(m.start(i), m.end(i)) for i in range(len(groups) + 1)])
+    if isinstance(m, Negation):
+        result += (m.neg_group(), m.neg_start())
+    else:
+        result += (m.groups(),)
+    return result
+
+
+def test_records_equivalent():
+    text = 'No back pain. Chest pain and back ache.'
+    found = list(Pattern(r'(?P<part>back|chest) (pain|ache)(x)?', negates=['no']).finditer(
+        text, offset=100, return_negation=True))
+    found += list(TermSet(['chest pain']).finditer(text))
+    mc = MatchCask().add_all(found)
+    assert [describe(m) for m in mc] == [describe(m) for m in found]
+    assert mc[0].matchobj.groupdict() == {'part': 'back'}
+    assert mc[-1].matchobj.string == 'Chest pain'  # only the text of the match is kept
+    assert (mc.start, mc.end) == (min(m.start() for m in found), max(m.end() for m in found)) == (14, 138)
+    assert describe(mc.last) == describe(found[-1])
+
+
+def test_bounds_after_copy_and_add():
+    first, second = MatchCask(), MatchCask()
+    first.add(Pattern('pain').matches('back pain', offset=50))
+    second.add(Pattern('back').matches('back pain', offset=10))
+    combined = first.copy().add_all(second)
+    assert (combined.start, combined.end) == (10, 59)
+    assert (first.start, first.end) == (55, 59)
+    assert [m.group() for m in combined] == ['pain', 'back']
+
+
+def test_section_add_keeps_matches():
+    a, b = Sentence('back pain', start=0), Sentence('chest pain', start=10)
+    a.has_pattern(Pattern('back'))
+    b.has_pattern(Pattern('chest'))
+    section = Section([a], a.matches) + Section([b], b.matches)
+    assert [m.group() for m in section.matches] == ['back', 'chest']
+
+
+def test_document_shares_cask():
+    doc = Document('doc', text='Back pain.\nChest pain.', ssplit=keep_offsets_ssplit)
+    doc.has_pattern(Pattern('chest'))
+    assert all(sentence.matches is doc.matches for sentence in doc)
+    assert doc.matches.last_text == 'Chest'
+
+
+def test_keeps_records():
+    pat = Pattern('back')
+    mc = MatchCask()
+    for text in ['back pain', 'back ache', 'back pain']:
+        mc.add(pat.matches(text))
+    assert all(isinstance(m.matchobj, SpanMatch) for m in mc)  # not the `re.Match`
+    assert mc._strings == ['back']
+    assert [m.group() for m in mc] == ['back', 'back', 'back']
+
+
+def test_negation_term_kept_as_record():
+    text = 'no back pain'
+    neg = Pattern(r'back (pain)', negates=[r'(no)\b']).matches(text, offset=20, return_negation=True)
+    mc = MatchCask()
+    mc.add(neg)
+    copied = mc.copy()
+    for m in (mc.last, copied.last):
+        assert isinstance(m.negationobj, SpanMatch) and isinstance(m.matchobj, SpanMatch)
+        assert (m.neg_group(), m.neg_group(1), m.neg_start(), m.group(1), m.start()) == ('no', 'no', 0, 'pain', 23)
+    assert mc._strings == ['no', 'back pain']
+
+
+def test_match_api():
+    pat = Pattern(r'(?P<part>(back|chest)) (pain)?(x)?')
+    text = 'No chest pain today.'
+    raw = pat.matches(text).matchobj
+    m = MatchCask().add_all([pat.matches(text)]).last.matchobj
+    assert m.re is raw.re
+    assert (m.lastindex, m.lastgroup) == (raw.lastindex, raw.lastgroup) == (3, None)
+    assert m.expand(r'\g<part>: \3\n') == raw.expand(r'\g<part>: \3\n') == 'chest: pain\n'
+    assert (m.pos, m.endpos, m.string) == (3, 13, 'chest pain')  # narrower than `re.Match`: only the match
+    assert m[1] == m.group('part') == 'chest'
+    term = MatchCask().add_all(list(TermSet(['chest pain']).finditer(text))).last.matchobj  # without a regex
+    assert (term.re, term.lastindex, term.expand(r'[\g<0>]')) == (None, None, '[chest pain]')
+
+
+@pytest.mark.parametrize('scan', ['document', 'batch'])
+def test_does_not_keep_searched_text(scan):
+    text = 'Back pain. ' * 50 + 'Chest pain today.'
+    doc = Document('doc', text=text, ssplit=keep_offsets_ssplit, scan_document=scan == 'document')
+    if scan == 'batch':
+        DocumentBatch([doc, Document('other', text=text, ssplit=keep_offsets_ssplit)])
+    assert doc.has_pattern(Pattern('chest'))
+    assert doc.matches._strings == ['Chest']
+    assert doc.matches.last.matchobj.string == 'Chest'
@@ -0,0 +1,51 @@
+from runrex.algo import Pattern, PatternSet
+from runrex.text import Document
+from runrex.text.ssplit import keep_offsets_ssplit
+
+TEXT = 'Back pain noted.\nNo chest pain.\nRest.'
+
+
+class CountingPattern(Pattern):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+
+    def matches(self, text, *args, **kwargs):
+        self.calls += 1
+        return super().matches(text, *args, **kwargs)
+
+    def finditer(self, text, *args, **kwargs):
+        self.calls += 1
+        yield from super().finditer(text, *args, **kwargs)
+
+
+def run_algorithms(doc, back, chest):
+    results = []
+    for _ in range(3):  # e.g., several algorithms using the same patterns
+        results.append(doc.has_pattern(back))
+        results.append([sentence.get_pattern(chest, return_negation=True) is not None for sentence in doc])
+        results.append([list(sentence.get_patterns(back, chest)) for sentence in doc])
+        results.append([sentence.last_found for sentence in doc])
+    return results, [(m.start(), m.end()) for m in doc.matches.matches], back.match_count
+
+
+def test_memo_equivalent():
+    expected = run_algorithms(Document('doc', text=TEXT, ssplit=keep_offsets_ssplit),
+                              Pattern('back pain'), Pattern('chest pain', negates=['no']))
+    back, chest = CountingPattern('back pain'), CountingPattern('chest pain', negates=['no'])
+    doc = Document('doc', text=TEXT, ssplit=keep_offsets_ssplit, memo=True)
+    assert run_algorithms(doc, back, chest) == expected
+    assert back.calls == 2 * len(doc.sentences) - 2  # `has_pattern` stops at the first sentence
+    assert chest.calls == 2 * len(doc.sentences)
+
+
+def test_memo_patternset():
+    back, chest = CountingPattern('back pain'), CountingPattern('chest pain')
+    doc = Document('doc', text=TEXT, ssplit=keep_offsets_ssplit, memo=True)
+    for _ in range(2):
+        assert [sentence.has_patterns(PatternSet(back, chest), has_all=True) for sentence in doc] == [False] * 3
+        assert [len(list(sentence.get_patterns(PatternSet(back, chest)))) for sentence in doc] == [1, 1, 0]
+    assert len(doc.sentences[0].memo) == 4
+    doc.clear_memo()
+    assert not doc.sentences[0].memo
@@ -0,0 +1,57 @@
+import random
+import re
+
+import pytest
+
+from runrex.algo import Pattern
+from runrex.algo.optimize import optimize_regex
+from runrex.terms import boilerplate, possible, negation, hypothetical, historical
+
+WORDS = ['a', 'ab', 'abc', 'b', 'c', 'possibly', 'possible', 'poss', 'appt', 'appointment', 'if', 'due to',
+         'doctor', 'worried', 'worry', 'r/o', 'not', 'no evidence', 'normal', 'x', 'foobar', 'foo', 'bar',
+         'xaab', 'xaa', 'xa', '12 mg', '3 ml']
+
+
+@pytest.mark.parametrize('pattern, expected', [
+    ('(a|ab)', '(a(?:|b))'),
+    ('(ab|a)', '(a(?:b)?)'),
+    ('(ab|c|ad)', '(a(?:b|d)|c)'),
+    (r'(\bif\b|\bhow\b)', r'(\b(?:if|how)\b)'),
+    ('(pamphlet|warning|pamphlet)', '(pamphlet|warning)'),
+    ('foo|foobar|bar', 'foo(?:|bar)|bar'),
+    ('(x(a)|y(b)|x(c))', '(x(a)|y(b)|x(c))'),  # would renumber groups
+    ('(?i)(ab|ac)', '(?i)(ab|ac)'),  # inline flags are not supported
+    ('(?<=ab|cd)x', '(?<=ab|cd)x'),
+    ('(xa*ab|xa*)', '(x(?:a*ab|a*))'),  # only literals and anchors are hoisted
+    (r'(\d+ (?:mg|ml)|\d+ mcg)', r'(\d+ (?:m(?:g|l))|\d+ mcg)'),  # branches may start with a repeat
+])
+def test_optimize_regex(pattern, expected):
+    assert optimize_regex(pattern, re.IGNORECASE) == expected
+
+
+def test_ignorecase_merges():
+    assert optimize_regex('(Ab|ac)', re.IGNORECASE) == '(A(?:b|c))'
+    assert optimize_regex('(Ab|ac)') == '(Ab|ac)'
+
+
+@pytest.mark.parametrize('pattern', [
+    boilerplate, possible, negation, hypothetical, historical,
+    '(a|ab)c?', '(ab|a)b', 'foo|foobar|bar', r'(a|ab|abc)(b|bc)?\b', r'(\ba\b|\bab\b|abc)', '(?P<x>a|ab|a)',
+    '(xa*ab|xa*)', r'xa*\w|xa*.', r'\d+ mg|\d+ ml', r'(\d+ (?:mg|ml)|\d+ mcg)',
+])
+def test_equivalent(pattern):
+    optimized = optimize_regex(pattern, re.IGNORECASE)
+    original, rewritten = re.compile(pattern, re.I), re.compile(optimized, re.I)
+    rand = random.Random(0)
+    for _ in range(200):
+        text = ' '.join(rand.choice(WORDS) for _ in range(rand.randint(1, 10)))
+        assert [(m.span(), m.groups()) for m in original.finditer(text)] == \
+               [(m.span(), m.groups()) for m in rewritten.finditer(text)], text
+
+
+def test_pattern_optimize():
+    pat = Pattern('(pain|pamphlet) here', negates=['(no|not)'], optimize=True)
+    assert pat.text == r'(pain|pamphlet)\W?here'
+    assert pat.compiled_text == r'(pa(?:in|mphlet))\W?here'
+    assert pat.matches('pamphlet here').group() == 'pamphlet here'
+    assert not pat.matches('not pain here')
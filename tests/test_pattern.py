@@ -107,3 +107,55 @@ def test_pattern_finditer_sentences_return_negation(pat: Pattern, text: str, n_m
     matches = list(sentences.get_patterns(pat, return_negation=True))
     assert len(matches) == n_matches
     assert len([is_neg for _, _, _, is_neg in matches if is_neg]) == n_negation
+
+
+@pytest.mark.parametrize(('pat', 'text', 'exp'), [
+    (Pattern('(burden|debt)'), 'No BURDEN here', True),
+    (Pattern('(burden|debt)'), 'nothing here', False),
+    (Pattern('Burden', flags=0), 'no burden here', False),
+    (Pattern('Burden', flags=0), 'no Burden here', True),
+    (Pattern(r'\w+ \d+'), 'nothing here', True),  # no literal: always searched
+])
+def test_pattern_may_match(pat: Pattern, text: str, exp):
+    assert pat.may_match(text) is exp
+    if not exp:
+        assert pat.matches(text) is False
+
+
+@pytest.mark.parametrize(('pat', 'text', 'exp'), [
+    (Pattern('pain', negates_pre=[r'\bno\b']), 'no fever, no chills, only severe pain', False),
+    (Pattern('pain', negates_pre=[r'\bno\b'], negates_window=20), 'no fever, no chills, only severe pain', True),
+    (Pattern('pain', negates_pre=[r'\bno\b'], negates_window=20), 'no fever, no pain', False),
+    (Pattern('pain', negates_post=[r'\bnot\b'], negates_window=2, window_unit='token'),
+     'pain is not present', False),
+    (Pattern('pain', negates_post=[r'\bnot\b'], negates_window=1, window_unit='token'),
+     'pain is not present', True),
+    (Pattern('pain', requires=['severe'], requires_window=1, window_unit='token'), 'severe pain', True),
+    (Pattern('pain', requires=['severe'], requires_window=1, window_unit='token'), 'severe back pain', False),
+])
+def test_pattern_context_window(pat: Pattern, text: str, exp):
+    assert bool(pat.matches(text)) is exp
+    assert bool(list(pat.finditer(text))) is exp
+
+
+def test_pattern_finditer_negation_with_offset():
+    sentence = Sentence('a test is not done', start=100)
+    assert list(sentence.get_patterns(Pattern('test', negates_post=['not']))) == []
+    assert list(sentence.get_patterns(Pattern('test', negates_pre=['not']))) == [('test', 102, 106)]
+
+
+def test_negation_offset():
+    # previously ('back pain', 3, 12): positions of a `Negation` were relative to the sentence
+    sentence = Sentence('no back pain', start=10)
+    result = sentence.get_pattern(Pattern('back pain', negates=['no']), get_indices=True, return_negation=True)
+    assert result == ('back pain', 13, 22)
+    assert (sentence.matches.start, sentence.matches.end) == (13, 22)
+    m = Pattern('back pain', negates=['no']).matches('no back pain', offset=10, return_negation=True)
+    assert (m.start(), m.end(), m.neg_start()) == (13, 22, 0)  # negation term: position in the searched text
+
+
+def test_finditer_context_position_with_offset():
+    # previously, context was checked at the position plus offset: 'pain' was negated by a later 'no'
+    pat = Pattern('pain', negates_pre=['no'])
+    assert [(m.start(), m.end()) for m in pat.finditer('pain no', offset=10)] == [(10, 14)]
+    assert list(Sentence('pain no', start=10).get_patterns(pat)) == [('pain', 10, 14)]
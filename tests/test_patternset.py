@@ -0,0 +1,66 @@
+import pytest
+
+from runrex.algo import Pattern, PatternSet, Negation
+from runrex.text import Sentence
+
+PATTERNS = [
+    Pattern('(burden|debt)', negates=['not?']),
+    Pattern('debt collect(or|ion)'),
+    Pattern(r'\bpain\b', requires=['severe', 'acute']),
+    Pattern('(?P<named>pain)'),  # cannot be combined
+    Pattern(r'\d+ (day|week)s?'),
+]
+
+TEXTS = [
+    'No burden, but severe pain for 3 weeks.',
+    'debt collection agency called; this is not a debt',
+    'acute pain 2 days, then pain again after 10 weeks',
+    'nothing to see here',
+]
+
+
+def _spans(results):
+    return [(type(m).__name__, m.start(), m.end()) if m else m for m in results]
+
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_patternset_matches_same_as_pattern(text):
+    exp = [pat.matches(text, offset=5, return_negation=True) for pat in PATTERNS]
+    act = PatternSet(*PATTERNS).matches(text, offset=5, return_negation=True)
+    assert _spans(act) == _spans(exp)
+
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_patternset_finditer_same_as_pattern(text):
+    exp = [(pat, m) for pat in PATTERNS for m in pat.finditer(text, return_negation=True)]
+    act = list(PatternSet(*PATTERNS).finditer(text, return_negation=True))
+    assert [pat for pat, _ in act] == [pat for pat, _ in exp]
+    assert _spans(m for _, m in act) == _spans(m for _, m in exp)
+    assert [m.group() for _, m in act] == [m.group() for _, m in exp]
+
+
+def test_patternset_scan():
+    pset = PatternSet(*PATTERNS)
+    assert pset.scan('nothing to see here') == [False, False, False, False, False]
+    assert pset.scan('DEBT is 3 days old') == [True, False, False, False, True]
+
+
+def test_patternset_overlapping_matches():
+    pset = PatternSet(Pattern('pain meds'), Pattern('meds'))
+    assert [m.group() for _, m in pset.finditer('pain meds')] == ['pain meds', 'meds']
+
+
+def test_sentence_has_patterns_with_patternset():
+    pset = PatternSet(Pattern('burden', negates=['not?']), Pattern('debt'))
+    sentence = Sentence('not a burden: debt')
+    assert sentence.has_patterns(pset)
+    assert not sentence.has_patterns(pset, has_all=True)
+    assert sentence.matches.last.group() == 'debt'
+
+
+def test_sentence_get_patterns_with_patternset():
+    pset = PatternSet(Pattern('burden', negates=['not?']), Pattern('debt'))
+    results = list(Sentence('not a burden: debt').get_patterns(pset, return_negation=True))
+    assert results == [('burden', 6, 12, True), ('debt', 14, 18, False)]
+    assert isinstance(Sentence('not a burden').get_pattern(pset[0], return_negation=True), str)
+    assert isinstance(pset[0].matches('not a burden', return_negation=True), Negation)
@@ -0,0 +1,51 @@
+import re
+
+import pytest
+
+from runrex.text import Document
+from runrex.text.preprocess import Preprocessor
+
+
+def original(text):
+    return re.sub(r': *\n', r': ', re.sub(r'HISTORY:.*?(?=[A-Z]+:)', '\n', text))
+
+
+@pytest.mark.parametrize('text', [
+    'Back pain.\nHISTORY: old pain PLAN: rest',
+    'PLAN:  HISTORY: old pain FOO: x',
+    'HISTORY: a HISTORY: b PLAN:\nASSESSMENT:\nok',
+    'HISTORY: no header here\nPLAN: rest',
+    'A: HISTORY: x ABC:HISTORY: y B:',
+    'Nothing to clean.',
+])
+def test_equivalent(text):
+    result = Preprocessor().process(text)
+    assert result.text == original(text)
+    assert Document.clean_text(text) == original(text)
+    pieces, pos = [], 0
+    for edit in result.edits:
+        pieces += [text[pos:edit.start], edit.replacement]
+        pos = edit.end
+    assert ''.join(pieces) + text[pos:] == result.text
+
+
+def test_long_capitals_are_linear():
+    text = 'HISTORY: ' + 'ABCDEFGH' * 50_000 + ' PLAN: rest'
+    assert Preprocessor()(text) == '\nPLAN: rest'
+
+
+def test_options():
+    text = 'HISTORY: old pain PLAN:\nrest'
+    assert Preprocessor(remove_history=False)(text) == 'HISTORY: old pain PLAN: rest'
+    assert Preprocessor(join_headers=False)(text) == '\nPLAN:\nrest'
+    assert Preprocessor(max_history=5)(text) == 'HISTORY: old pain PLAN: rest'
+    assert Preprocessor(history_header='PMH:')('PMH: asthma PLAN: rest') == '\nPLAN: rest'
+
+
+def test_document_offsets():
+    doc = Document('doc', text='Back pain.\nHISTORY: old pain PLAN:\nrest')
+    assert doc.new_text == 'Back pain.\n\nPLAN: rest'
+    assert [edit.rule for edit in doc.preprocessed.edits] == ['history', 'header']
+    pos = doc.new_text.index('rest')
+    assert doc.text[doc.preprocessed.original_offset(pos):].startswith('rest')
+    assert doc.preprocessed.original_offset(3) == 3
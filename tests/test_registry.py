@@ -0,0 +1,34 @@
+from runrex.algo import Pattern
+from runrex.algo.registry import compile_regex, precompile_all
+from runrex.terms import negation
+
+
+def test_regexes_are_shared():
+    assert compile_regex('shared', 2) is compile_regex('shared', 2)
+    assert compile_regex('shared', 2) is not compile_regex('shared', 0)
+    p1 = Pattern('registry test one', negates=[negation])
+    p2 = Pattern('registry test two', negates=[negation])
+    assert p1.negates[0][0] is p2.negates[0][0]
+
+
+def test_regexes_compiled_lazily():
+    pat = Pattern('registry lazy test', negates=['registry lazy negation'], ascii_mode=False)
+    assert not pat.pattern.is_compiled
+    assert not pat.negates[0][0].is_compiled
+    assert pat.matches('a registry lazy test')
+    assert pat.pattern.is_compiled
+
+
+def test_precompile():
+    pat = Pattern('registry precompile test')
+    assert precompile_all() >= 1
+    assert pat.pattern.is_compiled
+    assert Pattern('registry precompile method', requires_all=['other']).precompile().requires_all[0].is_compiled
+
+
+def test_retain_groups():
+    pat = Pattern('(?P<a>x)(?P<b>y)', retain_groups=['a'])
+    assert pat.text == '(?P<a>x)(?:y)'
+    m = pat.matches('xy')
+    assert m.group('a') == 'x'
+    assert m.groups() == ('x',)
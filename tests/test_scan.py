@@ -0,0 +1,99 @@
+import pytest
+
+from runrex.algo import Pattern, PatternSet
+from runrex.text import Document
+from runrex.text.scan import DocumentScan
+from runrex.text.ssplit import delim_ssplit, fast_ssplit, keep_offsets_ssplit
+
+TEXT = ('Patient has a history of back pain. No chest pain today.\n'
+        'Denies back pain.\nChest pain and back pain noted.\nPain back pain\n'
+        'Back pain-free.Back pain again')
+
+PATTERNS = [
+    Pattern(r'back pain'),
+    Pattern(r'(back|chest) pain', negates=['no', 'denies']),
+    Pattern(r'pain', requires_pre=['back']),
+    Pattern(r'pain\W+back'),  # crosses sentences
+    Pattern(r'\bpain\b'),
+    Pattern(r'^pain'),  # not packable
+    Pattern(r'(?<=back.)pain'),  # not packable
+    Pattern(r'back pain', casefold=True),
+]
+
+
+def results(doc, pat, return_negation):
+    found = []
+    for sentence in doc:
+        m = sentence.get_pattern(pat, get_indices=True, return_negation=return_negation)
+        found.append((sentence.text, m, list(sentence.get_patterns(pat, return_negation=return_negation))))
+    return found, doc.has_pattern(pat), [(type(m), m.start(), m.end()) for m in doc.matches]
+
+
+@pytest.mark.parametrize('pat', PATTERNS)
+@pytest.mark.parametrize('ssplit', [keep_offsets_ssplit, fast_ssplit, delim_ssplit])
+@pytest.mark.parametrize('return_negation', [False, True])
+def test_scan_equivalent(pat, ssplit, return_negation):
+    expected = results(Document('doc', text=TEXT, ssplit=ssplit), pat, return_negation)
+    assert results(Document('doc', text=TEXT, ssplit=ssplit, scan_document=True), pat, return_negation) == expected
+
+
+def test_patternset_and_selection():
+    pats = PatternSet(Pattern('chest pain'), Pattern('back pain'))
+    docs = [Document('doc', text=TEXT, ssplit=fast_ssplit, scan_document=scan) for scan in (False, True)]
+    expected, actual = ([list(doc.sentences.get_patterns(pats)), doc.sentences.has_patterns(pats, has_all=True),
+                         doc.select_all_sentences_with_patterns(pats, neighboring_sentences=2).text]
+                        for doc in docs)
+    assert actual == expected
+
+
+class CountingPattern(Pattern):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+        self.searched = []
+
+    def matches(self, text, *args, **kwargs):
+        self.calls += 1
+        return super().matches(text, *args, **kwargs)
+
+    def _search_regex(self, method, text, context=None):
+        self.searched.append(text)
+        return super()._search_regex(method, text, context)
+
+
+def test_scan_searches_once():
+    doc = Document('doc', text=TEXT, ssplit=fast_ssplit, scan_document=True)
+    pat = CountingPattern('back pain', negates=['no', 'denies'])
+    assert doc.has_pattern(pat) == 'Patient has a history of back pain.'
+    assert [sentence.has_pattern(pat) for sentence in doc].count(False) == 3
+    assert pat.calls == 0
+
+
+def chunk_ssplit(text, size=12):
+    for i in range(0, len(text), size):
+        yield text[i:i + size], i, min(i + size, len(text))
+
+
+def test_isolated_sentences():
+    doc = Document('doc', text=TEXT, ssplit=chunk_ssplit)
+    scan = DocumentScan(doc.new_text, doc.sentences.sentences)
+    assert scan.isolated == set(range(3, 13))  # split within words
+    pat = Pattern(r'\bpain')
+    expected = [sentence.get_pattern(pat, get_indices=True)
+                for sentence in Document('doc', text=TEXT, ssplit=chunk_ssplit)]
+    assert [sentence.get_pattern(pat, get_indices=True) for sentence in doc] == expected
+
+
+def normalised_ssplit(text):  # sentences are not slices of the text
+    for sentence, start, end in fast_ssplit(text):
+        yield ' '.join(sentence.split()), start, end
+
+
+def test_all_isolated_skips_scan():
+    doc = Document('doc', text=TEXT.replace(' pain', '  pain'), ssplit=normalised_ssplit, scan_document=True)
+    assert doc.sentences.sentences[0].batch.isolated == set(range(len(doc.sentences.sentences)))
+    pat = CountingPattern('back pain', negates=['no', 'denies'])
+    assert [sentence.has_pattern(pat) for sentence in doc].count(False) == 3
+    assert pat.calls == len(doc.sentences.sentences)
+    assert doc.new_text not in pat.searched
@@ -1,5 +1,6 @@
 import pytest
 
+from runrex.algo import Pattern
 from runrex.text import Sentence
 
 
@@ -12,3 +13,24 @@ def test_sentence_strip(sentence, exp_start_idx, exp_end_idx):
     assert s.start == exp_start_idx
     assert s.end == exp_end_idx
     assert s.text == sentence.strip()
+
+
+def test_sentence_view():
+    buffer = 'First.\n  What is this?\t\n'
+    s = Sentence.view(buffer, 7, len(buffer))
+    assert (s.start, s.end) == (9, 22)
+    assert s._text is None  # not copied until used
+    assert s.text == 'What is this?'
+    assert s.has_pattern(Pattern('what is'))
+    assert s.matches.start == 9
+
+
+def test_search_state():
+    s = Sentence('back pain')
+    assert s.has_pattern(Pattern('back'))
+    assert not s.has_pattern(Pattern('chest'))
+    assert not s.last_found
+    assert s.any_found
+    s.reset_found_pattern()
+    assert not s.any_found
+    assert not hasattr(s, '__dict__')
@@ -1,6 +1,6 @@
 import pytest
 
-from runrex.text import Sentences
+from runrex.text import Sentence, Sentences
 from runrex.text.ssplit import keep_offsets_ssplit, syntok_ssplit
 
 
@@ -43,3 +43,11 @@ def test_syntok_sentence_segmentation(text, n_sent, exp_indices):
     for sent, (exp_start, exp_end) in zip(sents, exp_indices):
         assert sent.start == exp_start
         assert sent.end == exp_end
+
+
+def test_keep_offsets_views():
+    text = 'A sentence.\n Another sentence\n\n \nis here.'
+    sents = Sentences(text, None, ssplit=keep_offsets_ssplit)
+    expected = [Sentence(s, None, start, end) for s, start, end in keep_offsets_ssplit(text) if s.strip()]
+    assert [(sent.text, sent.start, sent.end) for sent in sents] == [(s.text, s.start, s.end) for s in expected]
+    assert all(text[sent.start:sent.end] == sent.text for sent in sents)
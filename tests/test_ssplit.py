@@ -0,0 +1,49 @@
+import pytest
+
+from runrex.cli.benchmark_ssplit import benchmark_ssplit, benchmark_ssplit_cli, get_splitters, sentence_boundaries, \
+    SAMPLE_TEXT
+from runrex.text import Sentences
+from runrex.text.ssplit import fast_ssplit
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('Seen by Dr. Smith today. No pain.', ['Seen by Dr. Smith today.', 'No pain.']),
+    ('Pain for approx. three wks. Better now!', ['Pain for approx. three wks. Better now!']),
+    ('Ibuprofen p.o. b.i.d. Return in 2 wks.', ['Ibuprofen p.o. b.i.d. Return in 2 wks.']),
+    ('Will follow up\n\nPLAN: rest', ['Will follow up', 'PLAN: rest']),
+    ('Back pain\nfor years.', ['Back pain\nfor years.']),
+    ('Plan\n- ice\n1. MRI\nASSESSMENT: ok', ['Plan', '- ice', '1. MRI', 'ASSESSMENT: ok']),
+    ('He said "stop." Then left.', ['He said "stop."', 'Then left.']),
+])
+def test_fast_ssplit(text, expected):
+    results = list(fast_ssplit(text))
+    assert [sentence.strip() for sentence, _, _ in results] == expected
+    assert all(text[start:end] == sentence for sentence, start, end in results)
+    assert ''.join(sentence for sentence, _, _ in results) == text
+
+
+def test_fast_ssplit_views():
+    sentences = Sentences(SAMPLE_TEXT, ssplit=fast_ssplit)
+    assert sentences[0]._text is None
+    assert all(SAMPLE_TEXT[sentence.start:sentence.end] == sentence.text for sentence in sentences)
+
+
+def test_sentence_boundaries():
+    assert sentence_boundaries(['A b.', 'C  d .', 'e']) == {3, 6}
+    assert sentence_boundaries(['A b.', ' ']) == set()
+
+
+def test_benchmark_ssplit():
+    splitters = get_splitters(['fast_ssplit', 'delim_ssplit'])
+    rows = benchmark_ssplit([SAMPLE_TEXT], splitters, reference='fast_ssplit')
+    assert [row['name'] for row in rows] == ['fast_ssplit', 'delim_ssplit']
+    assert rows[0]['f1'] == 1.0
+    assert rows[1]['sentences'] == len(SAMPLE_TEXT.splitlines()) + 1
+
+
+def test_benchmark_ssplit_unavailable_reference(monkeypatch, capsys):
+    monkeypatch.setattr('runrex.text.ssplit.syntok_segmenter', None)
+    monkeypatch.setattr('sys.argv', ['benchmark_ssplit', '-r', 'syntok_ssplit'])
+    with pytest.raises(SystemExit):
+        benchmark_ssplit_cli()
+    assert 'syntok_ssplit' in capsys.readouterr().err
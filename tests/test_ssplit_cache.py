@@ -0,0 +1,79 @@
+import functools
+
+import pytest
+
+from runrex.text import Document, Sentences
+from runrex.text.ssplit import delim_ssplit, fast_ssplit
+from runrex.text.ssplit_cache import SSPLIT_CACHE, splitter_id
+
+TEXT = 'Back pain.\n  No chest pain.   \n\nPLAN: rest.'
+
+
+@pytest.fixture
+def cache(tmp_path):
+    SSPLIT_CACHE.enable(tmp_path)
+    yield SSPLIT_CACHE
+    SSPLIT_CACHE.disable()
+
+
+def as_tuples(sentences):
+    return [(sentence.text, sentence.start, sentence.end) for sentence in sentences]
+
+
+@pytest.mark.parametrize('ssplit', [delim_ssplit, fast_ssplit])
+def test_same_sentences(cache, ssplit):
+    cache.disable()
+    expected = as_tuples(Sentences(TEXT, ssplit=ssplit))
+    cache.enabled = True
+    first = as_tuples(Sentences(TEXT, ssplit=ssplit))
+    second = as_tuples(Sentences(TEXT, ssplit=ssplit))
+    assert first == second == expected
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+def test_document(cache):
+    Document('a', text=TEXT, ssplit=fast_ssplit).sentences
+    doc = Document('b', text=TEXT, ssplit=fast_ssplit)
+    assert [sentence.text for sentence in doc] == ['Back pain.', 'No chest pain.', 'PLAN: rest.']
+    assert cache.hits == 1
+
+
+def test_splitter_identity():
+    assert splitter_id(delim_ssplit) != splitter_id(fast_ssplit)
+    assert splitter_id(functools.partial(delim_ssplit, delim='\n')) != splitter_id(delim_ssplit)
+    assert splitter_id(delim_ssplit) == splitter_id(delim_ssplit)
+
+
+def test_invalidated_by_splitter(cache):
+    Sentences(TEXT, ssplit=delim_ssplit)
+    Sentences(TEXT, ssplit=functools.partial(delim_ssplit, delim='\n\n'))
+    assert cache.misses == 2
+
+
+def test_size_limit(cache, tmp_path):
+    cache.enable(tmp_path, max_bytes=500)
+    for i in range(20):
+        Sentences(f'{TEXT} {i}', ssplit=delim_ssplit)
+    assert 0 < cache.info()['bytes'] <= 500
+    assert len(list(tmp_path.glob('*/*.rsc'))) < 20
+
+
+def test_corrupt_entry(cache, tmp_path):
+    Sentences(TEXT, ssplit=delim_ssplit)
+    for path in tmp_path.glob('*/*.rsc'):
+        path.write_bytes(b'garbage')
+    assert [sentence.text for sentence in Sentences(TEXT, ssplit=delim_ssplit)][0] == 'Back pain.'
+    assert (cache.misses, cache.hits) == (2, 0)
+    Sentences(TEXT, ssplit=delim_ssplit)
+    assert cache.hits == 1
+
+
+@pytest.mark.parametrize('ssplit', [delim_ssplit, fast_ssplit])
+def test_truncated_entry(cache, tmp_path, ssplit):
+    expected = as_tuples(Sentences(TEXT, ssplit=ssplit))
+    path, = tmp_path.glob('*/*.rsc')
+    data = path.read_bytes()
+    for size in range(1, len(data)):
+        path.write_bytes(data[:size])
+        assert as_tuples(Sentences(TEXT, ssplit=ssplit)) == expected, size
+    assert cache.hits == 0
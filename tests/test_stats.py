@@ -0,0 +1,69 @@
+import csv
+import json
+
+import pytest
+
+from runrex.algo import Pattern, PatternSet
+from runrex.algo.stats import STATS
+
+
+@pytest.fixture
+def stats():
+    STATS.enable()
+    yield STATS
+    STATS.disable()
+    STATS.reset()
+
+
+def test_disabled_collects_nothing():
+    STATS.reset()
+    Pattern('stats disabled').matches('stats disabled')
+    assert not STATS.stats
+
+
+def test_matches_stats(stats):
+    pat = Pattern('stats test', negates_pre=['not'], requires_all=['required'])
+    text = 'stats test required'
+    assert pat.matches(text)
+    assert not pat.matches('not stats test required')
+    assert not pat.matches('stats test')
+    assert not pat.matches('nothing to see here')
+    result = stats.get(pat)
+    assert result.calls == 3
+    assert result.skipped == 1
+    assert result.candidates == 3
+    assert result.matches == 1
+    assert result.rejected_negation == 1
+    assert result.rejected_requires == 1
+    assert result.chars_scanned == len(text) + len('not stats test required') + len('stats test')
+    assert result.total_time >= result.max_time > 0
+
+
+def test_finditer_stats(stats):
+    pat = Pattern('stats iter', negates_post=['no'], negates_window=3)
+    results = list(pat.finditer('stats iter, stats iter no, stats iter'))
+    assert len(results) == 2
+    result = stats.get(pat)
+    assert result.calls == 1
+    assert result.candidates == 3
+    assert result.matches == 2
+    assert result.rejected_negation == 1
+
+
+def test_patternset_stats(stats):
+    pset = PatternSet(Pattern('alpha'), Pattern('beta'))
+    pset.matches('alpha')
+    assert stats.get(pset[0]).calls == 1
+    assert stats.get(pset[1]).skipped == 1
+
+
+@pytest.mark.parametrize('kind', ['json', 'csv'])
+def test_write_report(stats, tmp_path, kind):
+    pat = Pattern('stats report')
+    pat.matches('stats report')
+    path = tmp_path / f'stats.{kind}'
+    stats.write(path)
+    with open(path, encoding='utf8') as fh:
+        rows = json.load(fh) if kind == 'json' else list(csv.DictReader(fh))
+    assert rows[0]['pattern'] == pat.text
+    assert int(rows[0]['calls']) == 1
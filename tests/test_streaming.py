@@ -0,0 +1,152 @@
+import io
+import mmap
+
+import pytest
+
+from runrex.algo import Pattern
+from runrex.io.corpus import get_next_from_corpus
+from runrex.text import Document, StreamingDocument
+from runrex.text.batch import DocumentBatch
+from runrex.text.ssplit import fast_ssplit, keep_offsets_ssplit, regex_ssplit
+
+TEXT = ('Back pain. No chest pain today.\nHISTORY: old fever PLAN:\nrest and fluids.\n\n'
+        'Seen by Dr. Smith approx. three days ago.\nASSESSMENT: fever été.\n') * 20
+
+
+def as_tuples(sentences):
+    return [(sentence.text, sentence.start, sentence.end) for sentence in sentences]
+
+
+@pytest.mark.parametrize('ssplit', [fast_ssplit, keep_offsets_ssplit])
+@pytest.mark.parametrize('chunk_size', [60, 200, 100_000])
+def test_same_sentences(ssplit, chunk_size):
+    expected = as_tuples(Document('a', text=TEXT, ssplit=ssplit))
+    assert as_tuples(StreamingDocument('a', text=TEXT, ssplit=ssplit, chunk_size=chunk_size)) == expected
+
+
+def test_splitter_without_spans():
+    def ssplit(text):  # split at each line, without `spans`
+        return keep_offsets_ssplit(text)
+
+    expected = as_tuples(Document('a', text=TEXT, ssplit=ssplit))
+    assert as_tuples(StreamingDocument('a', text=TEXT, ssplit=ssplit, chunk_size=60)) == expected
+
+
+@pytest.mark.parametrize('mode', ['path', 'text', 'binary', 'mmap'])
+def test_sources(tmp_path, mode):
+    path = tmp_path / 'doc.txt'
+    path.write_bytes(TEXT.replace('\n', '\r\n').encode('utf8'))
+    expected = as_tuples(Document('a', file=path, ssplit=fast_ssplit))
+    with open(path, 'rb') as binary, open(path, encoding='utf8') as fh:
+        source = {
+            'path': {'file': path},
+            'text': {'fh': fh},
+            'binary': {'fh': binary},
+            'mmap': {'fh': mmap.mmap(binary.fileno(), 0, access=mmap.ACCESS_READ)},
+        }[mode]
+        doc = StreamingDocument('a', ssplit=fast_ssplit, chunk_size=100, **source)
+        assert as_tuples(doc) == expected
+        assert as_tuples(doc) == expected  # read again
+
+
+def test_read_once():
+    class Unseekable(io.StringIO):
+        def tell(self):
+            raise OSError
+
+    doc = StreamingDocument('a', fh=Unseekable(TEXT), ssplit=fast_ssplit)
+    assert len(list(doc)) == len(Document('a', text=TEXT, ssplit=fast_ssplit).sentences)
+    with pytest.raises(ValueError):
+        list(doc)
+
+
+def test_long_sentence_is_cut():
+    text = 'word ' * 1000
+    doc = StreamingDocument('a', text=text, ssplit=fast_ssplit, chunk_size=100)
+    sentences = list(doc)
+    assert len(sentences) > 1
+    assert all(len(sentence.text) < 300 for sentence in sentences)
+    assert ' '.join(sentence.text for sentence in sentences) == text.strip()
+
+
+def test_searches():
+    pain = Pattern(r'chest pain', negates=[r'\bno\b'])
+    fever = Pattern(r'fever')
+    smith = Pattern(r'Dr\. (Smith)')
+    doc = Document('a', text=TEXT, ssplit=fast_ssplit)
+    streaming = StreamingDocument('a', text=TEXT, ssplit=fast_ssplit, chunk_size=60)
+    assert streaming.has_pattern(fever) == doc.has_pattern(fever) == 'ASSESSMENT: fever été.'
+    assert streaming.has_pattern(pain) is doc.has_pattern(pain) is False
+    assert streaming.has_patterns(pain, fever) and streaming.has_patterns(smith, fever, has_all=True)
+    assert not streaming.has_patterns(pain, fever, has_all=True)
+    assert streaming.get_pattern(smith, index=1, get_indices=True) \
+        == doc.sentences.get_pattern(smith, index=1, get_indices=True)
+    names = ['pain', 'fever', 'smith']
+    assert streaming.get_patterns(pain, fever, smith, names=names) == ('fever', 'fever')
+    assert streaming.get_patterns(smith, fever, index=1) \
+        == doc.get_patterns(smith, fever, index=1) == 'Smith'
+    assert streaming.matches.start == doc.sentences.get_pattern(smith, get_indices=True)[1]  # global offsets
+
+
+def test_searches_by_sentence():
+    text = 'HISTORY: back pain PLAN: back pain seen.\nAgain seen.\n'
+    streaming = StreamingDocument('a', text=text, ssplit=fast_ssplit)
+    assert streaming.get_pattern(Pattern('back pain'), get_indices=True) == ('back pain', 7, 16)
+    assert streaming.get_patterns(Pattern(r'seen\W+again')) is None  # across sentences
+
+
+def sections(sections):
+    return [as_tuples(section.sentences) for section in sections or []]
+
+
+@pytest.mark.parametrize('neighboring_sentences', [0, 2, 3])
+@pytest.mark.parametrize('get_range', [False, True])
+def test_same_api_as_document(neighboring_sentences, get_range):
+    pain = Pattern(r'chest pain', negates=[r'\bno\b'])
+    fever, smith = Pattern(r'fever'), Pattern(r'Dr\. (Smith)')
+    text = TEXT[:len(TEXT) // 4]
+    doc = Document('a', text=text, ssplit=fast_ssplit)
+    streaming = StreamingDocument('a', text=text, ssplit=fast_ssplit, chunk_size=60)
+
+    def selections(d):
+        return sections([d.select_all_sentences_with_patterns(
+            fever, smith, negation=[pain], get_range=get_range, neighboring_sentences=neighboring_sentences)]) \
+            + sections(d.select_sentences_with_patterns(fever, neighboring_sentences=neighboring_sentences))
+
+    assert selections(streaming) == selections(doc)
+    assert as_tuples(streaming.iter_sentence_by_pattern(smith, fever)) \
+        == as_tuples(doc.iter_sentence_by_pattern(smith, fever))
+    assert streaming.select_all_sentences_with_patterns(pain) is doc.select_all_sentences_with_patterns(pain) is None
+    assert streaming.has_pattern(fever, by_sentence=False) is doc.has_pattern(fever, by_sentence=False) is True
+    assert streaming.has_patterns(pain, fever, by_sentence=False)
+    assert streaming.sentences.has_pattern(fever) == doc.sentences.has_pattern(fever)
+    assert list(streaming.sentences.get_patterns(smith, index=1)) == list(doc.sentences.get_patterns(smith, index=1))
+    assert as_tuples(streaming.sentences) == as_tuples(doc.sentences)
+
+
+def test_splitter_without_spans_keeps_paragraphs():
+    text = ('Back pain seen today in clinic. Will follow\nup in two weeks.\n\n' * 3).strip()
+    streaming = StreamingDocument('a', text=text, ssplit=regex_ssplit, chunk_size=40)
+    expected = [sentence.text for part in text.split('\n\n')
+                for sentence in Document('a', text=part, ssplit=regex_ssplit)]
+    assert [sentence.text for sentence in streaming] == expected
+    assert streaming.has_pattern(Pattern('follow up'))
+
+
+def test_corpus(tmp_path):
+    (tmp_path / 'big.txt').write_text(TEXT)
+    (tmp_path / 'small.txt').write_text('Back pain.')
+    docs = {doc.name: doc for doc in get_next_from_corpus(directory=str(tmp_path), ssplit=fast_ssplit,
+                                                          batch_size=5, stream_size=1000)}
+    assert isinstance(docs['big'], StreamingDocument) and isinstance(docs['small'], Document)
+    assert as_tuples(docs['big']) == as_tuples(Document('big', text=TEXT, ssplit=fast_ssplit))
+    for doc in docs.values():  # as used by an algorithm
+        assert doc.get_pattern(Pattern('(back) pain'), index=1) == 'Back'
+        assert doc.select_all_sentences_with_patterns(Pattern('back pain')).text.startswith('Back pain.')
+
+
+def test_batch_keeps_streaming_document():
+    streaming = StreamingDocument('b', text=TEXT, ssplit=fast_ssplit)
+    batch = DocumentBatch([Document('a', text='Back pain.', ssplit=fast_ssplit), streaming])
+    assert batch[1] is streaming
+    assert [sentence.text for sentence in batch.sentences] == ['Back pain.']
@@ -0,0 +1,74 @@
+import re
+
+import pytest
+
+from runrex.algo import Pattern, PatternSet, TermSet, Negation
+from runrex.text import Document, Sentence
+from runrex.text.batch import DocumentBatch
+
+DRUGS = ['aspirin', 'acetylsalicylic acid', 'ibuprofen', 'naproxen sodium', 'naproxen', 'side effect']
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('took Aspirin daily', 'Aspirin'),
+    ('acetylsalicylic  acid', None),  # two characters between words
+    ('acetylsalicylic acid', 'acetylsalicylic acid'),
+    ('naproxen sodium 200mg', 'naproxen sodium'),  # longest
+    ('naproxen, sodium', 'naproxen'),
+    ('naproxen; taken', 'naproxen'),
+    ('side-effect', 'side-effect'),
+    ('aspirins', None),  # word boundaries
+    ('preibuprofen', None),
+])
+def test_matches(text, expected):
+    m = TermSet(DRUGS).matches(text)
+    assert (m.group() if m else None) == expected
+
+
+def test_same_as_regex():
+    text = 'Aspirin and naproxen sodium; no ibuprofen. Side effect of naproxen.'
+    terms = TermSet(DRUGS, negates=['no'], negates_window=3)
+    regex = Pattern(r'\b(aspirin|acetylsalicylic acid|ibuprofen|naproxen sodium|naproxen|side effect)\b',
+                    negates=['no'], negates_window=3)
+    expected = [(m.group(), m.start(), m.end(), type(m)) for m in regex.finditer(text, return_negation=True)]
+    found = [(m.group(), m.start(), m.end(), type(m)) for m in terms.finditer(text, return_negation=True)]
+    assert found == expected
+    assert Negation in {result[-1] for result in found}
+
+
+def test_case_sensitive():
+    terms = TermSet(['BP'], flags=0)
+    assert not terms.matches('bp 120/80')
+    assert terms.matches('BP 120/80', offset=10).start() == 10
+
+
+def test_requires():
+    terms = TermSet(['pain'], requires=['back'])
+    assert not terms.matches('chest pain')
+    assert terms.matches('back pain').group() == 'pain'
+
+
+def test_sentence_and_document():
+    terms = TermSet(DRUGS)
+    assert Sentence('started ibuprofen').has_patterns(terms)
+    doc = Document('doc', text='Nothing here.\nTaking naproxen.')
+    assert doc.get_patterns(PatternSet(Pattern('nothing else'), terms)) == 'naproxen'
+    assert str(terms) == 'TermSet(6 terms)'
+
+
+def test_batch():
+    batch = DocumentBatch(['aspirin\nnone', 'none\nmore aspirin'])
+    found = [(doc.name, m.start()) for doc, _, m in batch.finditer(TermSet(['aspirin']))]
+    assert [start for _, start in found] == [0, 10]
+
+
+def test_empty_term():
+    with pytest.raises(ValueError):
+        TermSet(['aspirin', '--'])
+
+
+def test_large_vocabulary():
+    terms = TermSet(f'term{i} word{i}' for i in range(50_000))
+    assert terms.matches('a term49999 word49999.').group() == 'term49999 word49999'
+    assert not terms.matches('term1 word2')
+    assert re.IGNORECASE & terms.pattern.flags